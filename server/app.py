@@ -1,19 +1,34 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import serial
 import serial.tools.list_ports
-import re
 import threading
 import time
 import uuid
 import json
-from chessClass import ChessGame
+import atexit
+import itertools
+from datetime import datetime, timedelta
+from chessClass import ChessGame, engine, init_db
+from broadcaster import Broadcaster
 from chessFileReader import ChessFileReader, create_reader
+from fenParser import parse_fen
+from gameCache import GameCache
+from ingestBuffer import OVERFLOW_BLOCK
+from persistenceWorker import PersistenceWorker
+from positionBatcher import PositionBatcher
+from positionLog import PositionLog
+from positionEncoder import FORMAT_COMPACT, FORMAT_FULL, FORMATS, encode_batch, encode_position
+from positionStabilizer import PositionStabilizer
+from serialIngest import INGEST_MODE_EVENT, INGEST_MODE_POLL, ChessSerial, read_available, wait_for_input
+from storageProfile import WalCheckpointer
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 socketio = SocketIO(app, cors_allowed_origins="*")  # Initialize SocketIO with CORS
+BROADCAST_QUEUE_SIZE = 1024  # Broadcasts waiting for the broadcaster thread; the oldest position event is dropped beyond this
+broadcaster = Broadcaster(socketio.emit, BROADCAST_QUEUE_SIZE)  # Emits broadcasts off the ingest and handler threads
 
 # Global state
 serial_connection = None
@@ -23,43 +38,179 @@ stop_thread = False
 connected_clients = {}  # Store connected WebSocket clients
 current_game_id = None  # Store the current game ID being broadcast
 
-# FEN regex pattern (basic validation)
-FEN_PATTERN = re.compile(r"^[1-8pnbrqkPNBRQK/]+ [wb] [KQkq-]+ [a-h1-8-]+ \d+ \d+$")
+# Socket.IO rooms: positions go only to a game's viewers, the lobby gets game list updates
+LOBBY_ROOM = 'lobby'  # Every client joins on connect; leave_lobby to opt out
+LOBBY_UPDATE_INTERVAL = 2.0  # Seconds between game_update events for one game
+game_viewers = {}  # game_id -> sids that joined the game's room
+lobby_updates = {}  # game_id -> time the last game_update for it was sent, or is due to be
+game_aliases = {}  # game_id -> short integer naming the game in compact position events
+alias_counter = itertools.count(1)
+POSITION_LOG_SIZE = 256  # Plies per game kept for viewers that resume
+position_log = PositionLog(POSITION_LOG_SIZE)
+
+# Ingest configuration
+ingest_mode = INGEST_MODE_EVENT  # 'event' blocks on the port, 'poll' checks in_waiting then sleeps
+read_timeout = 0.5  # Seconds to block waiting for input before re-checking stop_thread
+POLL_INTERVAL = 0.1  # Sleep between polls in 'poll' mode
+stable_frames = 2  # Consecutive identical frames before a position is accepted (1 disables debouncing)
+stable_window = 0.15  # ...or seconds a position must stay unchanged
+position_stabilizer = None  # PositionStabilizer of the running reading thread
+batch_max_size = 32  # Most plies in one 'positions' event
+batch_max_delay = 0.0  # Seconds a ply may wait for more to batch with (0: one event per processing pass)
+position_batcher = None  # PositionBatcher of the running reading thread
+
+# Write-behind persistence of the games being played
+PERSIST_FLUSH_INTERVAL = 1.0  # Save a game once it has been unchanged this many seconds...
+PERSIST_MAX_LAG = 5.0  # ...but no later than this many seconds after its first unsaved change
+persistence_worker = PersistenceWorker(PERSIST_FLUSH_INTERVAL, PERSIST_MAX_LAG)
+WAL_CHECKPOINT_INTERVAL = 30.0  # Seconds between background WAL checkpoints
+wal_checkpointer = WalCheckpointer(engine, WAL_CHECKPOINT_INTERVAL)
+# atexit runs these last-registered first: save what is still pending, then checkpoint
+atexit.register(wal_checkpointer.stop)
+atexit.register(persistence_worker.stop)
+atexit.register(broadcaster.stop)
+
+# Games kept in memory for lookups by ID, least recently used evicted first
+GAME_CACHE_SIZE = 64  # Games
+GAME_CACHE_MAX_PLIES = 50000  # Plies across all cached games
+game_cache = GameCache(ChessGame.load_from_db, GAME_CACHE_SIZE, GAME_CACHE_MAX_PLIES)
+ChessGame.store_listener = game_cache.on_stored  # Saves and deletes write through to the cache
+
+# /games pagination
+GAMES_PAGE_SIZE = 50
+GAMES_PAGE_MAX = 200
+
+def parse_date_param(value, end_of_day=False):
+    """datetime for an ISO date or datetime query parameter; a bare date with end_of_day is the next midnight"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD or an ISO datetime")
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def track_game(game):
+    """Have the persistence worker save game in the background whenever it changes"""
+    game.dirty_listener = persistence_worker.notify
+    game_cache.put(game)
+    return game
+
+def find_game(game_id):
+    """The live instance of a stored game: the active game, else the cached one (loaded on a miss), or None"""
+    if active_game and active_game.game_id == game_id:
+        return active_game
+    return game_cache.get(game_id)
+
+def game_room(game_id, fmt=FORMAT_FULL):
+    """Socket.IO room of the clients following a game in position format fmt"""
+    return f"game:{game_id}" if fmt == FORMAT_FULL else f"game:{game_id}:{fmt}"
+
+def viewer_formats(game_id):
+    """The position formats some client following a game uses, in FORMATS order"""
+    formats = {client_format(sid) for sid in list(game_viewers.get(game_id, ()))}
+    return [fmt for fmt in FORMATS if fmt in formats]
+
+def emit_positions(game_id, plies):
+    """Send (index, move) plies of a game to its room: one 'position' event, or a 'positions' batch"""
+    seq = position_log.record(game_id, plies)
+    if len(plies) == 1:
+        index, move = plies[0]
+        emit_position(game_id, move, index, seq)
+    else:
+        for fmt in viewer_formats(game_id):
+            payload = encode_batch(game_id, plies, fmt, alias=game_alias(game_id),
+                                   seq=seq, prev_seq=seq - len(plies))
+            broadcaster.send('positions', payload, to=game_room(game_id, fmt))
+    last_index, last = plies[-1]
+    print(f"[POSITION EVENT] Emitted {len(plies)} position(s) for game {game_id} up to move {last_index}: "
+          f"{last.algebraic or 'unknown move'} | FEN: {last.fen[:15]}...")
+
+def game_alias(game_id):
+    """The game's alias for compact payloads, allocated on first use"""
+    alias = game_aliases.get(game_id)
+    if alias is None:
+        alias = game_aliases.setdefault(game_id, next(alias_counter))
+    return alias
+
+def emit_position(game_id, move, index, seq):
+    """Send ply index of a game, its change number seq, to its room, encoded for each format its viewers use"""
+    for fmt in viewer_formats(game_id):
+        payload = encode_position(game_id, move, index, fmt, alias=game_alias(game_id), seq=seq)
+        broadcaster.send('position', payload, to=game_room(game_id, fmt))
+
+def lobby_game(game_id, game, status='active'):
+    """A game as listed in the lobby (new_game, game_update and live_games_list)"""
+    return {
+        'id': game_id,
+        'title': game.event,
+        'players': {
+            'white': game.white,
+            'black': game.black
+        },
+        'status': status,
+        'lastUpdate': time.time() * 1000,  # milliseconds since epoch
+        'currentPosition': game.master_state[-1].fen,
+        'moveCount': len(game.master_state) - 1,  # Subtract 1 for initial state
+        'viewerCount': len(game_viewers.get(game_id, ()))
+    }
+
+def update_lobby(game_id, game):
+    """
+    Send the lobby a game_update for game, at most once per LOBBY_UPDATE_INTERVAL.
+
+    An update within the interval is held back until it ends, replacing any
+    held back before it, so the lobby always ends up with the latest state.
+    """
+    now = time.time()
+    payload = {
+        'type': 'game_update',
+        'game': lobby_game(game_id, game)
+    }
+    last = lobby_updates.get(game_id, 0)
+    if now < last + LOBBY_UPDATE_INTERVAL:
+        # An update held back until `last` is replaced, otherwise this one waits out the interval
+        due = last if last > now else last + LOBBY_UPDATE_INTERVAL
+        lobby_updates[game_id] = due
+        broadcaster.send_later(('game_update', game_id), due - now, 'game_update', payload, to=LOBBY_ROOM)
+        return
+    lobby_updates[game_id] = now
+    broadcaster.send('game_update', payload, to=LOBBY_ROOM)
 
 def read_serial_data():
-    global serial_connection, active_game, stop_thread, current_game_id
+    global serial_connection, active_game, stop_thread, current_game_id, position_stabilizer, position_batcher
     
+    mode = ingest_mode
+    timeout = read_timeout
+    stabilizer = PositionStabilizer(stable_frames, stable_window)
+    position_stabilizer = stabilizer
+    batcher = PositionBatcher(batch_max_size, batch_max_delay)
+    position_batcher = batcher
     last_malformed_line_logged = None  # Keep track of the last logged malformed line (as string)
     
     while not stop_thread and serial_connection and serial_connection.is_open:
         raw_lines_read = [] # Store raw bytes read
-        data_to_process = [] # Store valid FEN strings
-        read_limit_hit = False
+        data_to_process = [] # Store validated positions (fenParser.ParsedPosition)
         
         try:
-            # --- Phase 1: Read all available lines as raw bytes --- 
-            if serial_connection.in_waiting > 0:
-                read_count = 0
+            # --- Phase 0: Wait for input (event mode only) ---
+            if mode == INGEST_MODE_EVENT:
+                # Wake up in time to release a position waiting out the stabilizer window or a batch
+                waits = [t for t in (stabilizer.time_until_ready(), batcher.time_until_due()) if t is not None]
+                wait_for_input(serial_connection, min([timeout] + waits))
 
-                while serial_connection.in_waiting > 0:
-                    try:
-                        # Read raw bytes, keep newline
-                        raw_line = serial_connection.readline()
-                        if not raw_line: # Break if readline returns empty (e.g., timeout)
-                            break 
-                        raw_lines_read.append(raw_line)
-                        read_count += 1
-                    except serial.SerialException as ser_e:
-                        print(f"Serial error during read: {ser_e}")
-                        # Attempt to clear buffer on serial error
-                        try: serial_connection.reset_input_buffer() 
-                        except: pass
-                        last_malformed_line_logged = None
-                        raw_lines_read = [] # Discard potentially corrupted data
-                        break # Exit inner read loop
-                    except Exception as read_e:
-                        print(f"Unexpected error during readline: {read_e}")
-                        break # Exit inner read loop
+            # --- Phase 1: Read all available lines as raw bytes in one batch --- 
+            try:
+                raw_lines_read = read_available(serial_connection)
+            except serial.SerialException as ser_e:
+                print(f"Serial error during read: {ser_e}")
+                # Attempt to clear buffer on serial error
+                try: serial_connection.reset_input_buffer() 
+                except: pass
+                last_malformed_line_logged = None
+                raw_lines_read = [] # Discard potentially corrupted data
 
             # --- Phase 2: Decode and Validate collected raw lines --- 
             processed_any_line = False # Did we attempt to process anything?
@@ -71,23 +222,15 @@ def read_serial_data():
                         line = raw_line.decode('utf-8', errors='replace').strip()
                         
                         if line:  # Skip empty lines after stripping
-                            # More thorough FEN validation
-                            if FEN_PATTERN.match(line):
-                                position_part = line.split(' ')[0]
-                                rows = position_part.split('/')
-                                
-                                if len(rows) == 8:
-                                    data_to_process.append(line)
-                                    last_malformed_line_logged = None # Valid data resets the error logging
-                                else:
-                                    # Log only if it's a NEW malformed line
-                                    if line != last_malformed_line_logged:
-                                        print(f"Malformed FEN (wrong number of rows): {line}")
-                                        last_malformed_line_logged = line
+                            # Single-pass FEN validation (fields, rank count and squares per rank)
+                            position, error = parse_fen(line)
+                            if position:
+                                data_to_process.append(position)
+                                last_malformed_line_logged = None # Valid data resets the error logging
                             else:
-                                # Log only if it's a NEW invalid line
+                                # Log only if it's a NEW malformed line
                                 if line != last_malformed_line_logged:
-                                    print(f"Invalid FEN format: {line}")
+                                    print(f"Malformed FEN ({error}): {line}")
                                     last_malformed_line_logged = line
                         else:
                              last_malformed_line_logged = None # Treat empty lines as resetting error state
@@ -103,27 +246,33 @@ def read_serial_data():
                         last_malformed_line_logged = None # Reset on unexpected error
             
             # Reset error tracking if we processed lines and didn't end on an error
-            if processed_any_line and data_to_process and data_to_process[-1] == line:
+            if processed_any_line and data_to_process and data_to_process[-1].fen == line:
                  last_malformed_line_logged = None
                  
-            # --- Phase 3: Flush buffer if read limit was hit --- 
-            if read_limit_hit:
-                print("Flushing input buffer after hitting read limit.")
-                try: 
-                    # Clear any remaining data
-                    serial_connection.reset_input_buffer() 
-                except: pass
-                last_malformed_line_logged = None # Reset after flush
-                
-            # --- Phase 4: Process valid data --- 
-            if data_to_process and active_game:
-                print(f"Processing {len(data_to_process)} valid FEN positions")
-                for fen in data_to_process:
-                    active_game.add_to_queue(fen)
+            # --- Phase 2b: Debounce flicker and coalesce repeated frames --- 
+            # Lines of a moves file are recorded positions; serial frames are debounced one by one
+            stable_positions = stabilizer.feed_batch(data_to_process,
+                                                     buffered=isinstance(serial_connection, ChessFileReader))
+            stable_positions.extend(stabilizer.poll())
+
+            # --- Phase 3: Queue stable positions and process them --- 
+            if stable_positions and active_game:
+                print(f"Processing {len(stable_positions)} stable FEN positions ({len(data_to_process)} frames read)")
+                queue = active_game.processing_queue
+                dropped_before = queue.dropped
                 
                 # Store the initial state
                 initial_state_len = len(active_game.master_state)
                 
+                for position in stable_positions:
+                    if queue.full() and queue.policy == OVERFLOW_BLOCK:
+                        # This thread is also the consumer, so make room instead of waiting
+                        active_game.process_queue()
+                    active_game.add_to_queue(position)
+                
+                if queue.dropped > dropped_before:
+                    print(f"Ingest queue overflow ({queue.policy}): dropped {queue.dropped - dropped_before} positions")
+                
                 # Process the queued positions
                 active_game.process_queue()
                 
@@ -135,26 +284,18 @@ def read_serial_data():
                         # If it's the very first position (index 0), don't emit it as a move
                         start_index = 1
                         
-                    for i in range(start_index, len(active_game.master_state)):
-                        move = active_game.master_state[i]
-                        # Emit the position update to connected clients
-                        emit_data = {
-                            'type': 'position',
-                            'gameId': current_game_id,
-                            'fen': move.fen,
-                            'moveNumber': i,
-                            'player': move.player,
-                            'algebraic': move.algebraic,
-                            'isLegal': move.is_legal,
-                            'piece_moved': move.piece_moved, # Already added
-                            'from_square': move.from_square if hasattr(move, 'from_square') else None, # Add from_square if available
-                            'to_square': move.to_square if hasattr(move, 'to_square') else None     # Add to_square if available
-                        }
-                        socketio.emit('position', emit_data)
-                        print(f"[POSITION EVENT] Emitted position update from read_serial_data for move {i}: {move.algebraic or 'unknown move'} | FEN: {move.fen[:15]}...")
-
-            # --- Phase 5: Small sleep --- 
-            time.sleep(0.1) # Prevent CPU hogging
+                    new_plies = [(i, active_game.master_state[i]) for i in range(start_index, len(active_game.master_state))]
+                    for game_id, plies in batcher.add(current_game_id, new_plies):
+                        emit_positions(game_id, plies)
+                    update_lobby(current_game_id, active_game)
+
+            # Send the plies whose batch is due (all of this pass's with no batch delay)
+            for game_id, plies in batcher.poll():
+                emit_positions(game_id, plies)
+
+            # --- Phase 4: Small sleep (poll mode only) --- 
+            if mode == INGEST_MODE_POLL:
+                time.sleep(POLL_INTERVAL) # Prevent CPU hogging
             
         except serial.SerialException as outer_ser_e:
             print(f"Serial connection error: {outer_ser_e}. Stopping thread.")
@@ -162,7 +303,7 @@ def read_serial_data():
             stop_thread = True # Signal thread stop
             last_malformed_line_logged = None
             # Emit a disconnect event to clients
-            socketio.emit('hardware_status', {'status': 'disconnected', 'message': str(outer_ser_e)})
+            broadcaster.send('hardware_status', {'status': 'disconnected', 'message': str(outer_ser_e)})
         except Exception as e:
             print(f"Error in serial reading loop: {e}")
             # Attempt recovery
@@ -174,32 +315,136 @@ def read_serial_data():
                      # If connection closed unexpectedly, stop thread
                      stop_thread = True
                      # Emit a disconnect event to clients
-                     socketio.emit('hardware_status', {'status': 'error', 'message': str(e)})
+                     broadcaster.send('hardware_status', {'status': 'error', 'message': str(e)})
             except:
                  stop_thread = True # Stop if recovery fails
             time.sleep(1)  # Wait a bit longer before trying again
     
+    for game_id, plies in batcher.flush():
+        emit_positions(game_id, plies)
     print("Serial reading thread stopped")
-    socketio.emit('hardware_status', {'status': 'disconnected', 'message': 'Serial connection closed'})
+    broadcaster.send('hardware_status', {'status': 'disconnected', 'message': 'Serial connection closed'})
 
 # SocketIO event handlers
 @socketio.on('connect')
-def handle_connect():
-    """Handle client connection"""
+def handle_connect(auth=None):
+    """Handle client connection; the client picks its position format with auth or query `format`"""
     print(f"Client connected: {request.sid}")
-    connected_clients[request.sid] = {'connected': True}
+    fmt = auth.get('format') if isinstance(auth, dict) else None
+    fmt = fmt or request.args.get('format', FORMAT_FULL)
+    if fmt not in FORMATS:
+        fmt = FORMAT_FULL
+    connected_clients[request.sid] = {'connected': True, 'games': set(), 'format': fmt}
+    join_room(LOBBY_ROOM)
     # Send current status to the newly connected client
     emit('hardware_status', {
         'status': 'connected' if (serial_connection is True) or (serial_connection and serial_connection.is_open) else 'disconnected',
         'current_game': current_game_id
     })
+    emit('position_format', {'format': fmt})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print(f"Client disconnected: {request.sid}")
-    if request.sid in connected_clients:
-        del connected_clients[request.sid]
+    client = connected_clients.pop(request.sid, None)
+    for game_id in (client or {}).get('games', ()):
+        game_viewers.get(game_id, set()).discard(request.sid)
+
+def client_format(sid):
+    return connected_clients.get(sid, {}).get('format', FORMAT_FULL)
+
+def follow_game(game_id):
+    """Add the requesting client to the game's room for its position format"""
+    join_room(game_room(game_id, client_format(request.sid)))
+    game_viewers.setdefault(game_id, set()).add(request.sid)
+    connected_clients.setdefault(request.sid, {'connected': True, 'games': set()})['games'].add(game_id)
+
+@socketio.on('join_game')
+def handle_join_game(data):
+    """Subscribe to the position and game_ended events of one game"""
+    game_id = (data or {}).get('gameId')
+    if not game_id:
+        emit('error', {'message': 'Game ID is required'})
+        return
+    follow_game(game_id)
+    emit('joined_game', {'gameId': game_id, 'alias': game_alias(game_id), 'viewerCount': len(game_viewers[game_id])})
+
+@socketio.on('leave_game')
+def handle_leave_game(data):
+    """Stop receiving a game's events"""
+    game_id = (data or {}).get('gameId')
+    if not game_id:
+        emit('error', {'message': 'Game ID is required'})
+        return
+    leave_room(game_room(game_id, client_format(request.sid)))
+    game_viewers.get(game_id, set()).discard(request.sid)
+    connected_clients.get(request.sid, {}).get('games', set()).discard(game_id)
+    emit('left_game', {'gameId': game_id})
+
+@socketio.on('resume')
+def handle_resume(data):
+    """
+    Follow a game and catch up from the last change the client has (lastSeq,
+    the seq of its last position event, in the log's epoch).
+
+    The changed plies are sent as one 'positions' event if they are still in
+    the position log, otherwise the whole game is sent as a 'snapshot'.
+    Either way a 'resumed' event with the game's latest seq and the epoch
+    follows; plies that arrive in the room meanwhile may repeat ones already sent.
+    """
+    game_id = (data or {}).get('gameId')
+    game = find_game(game_id) if game_id else None
+    if not game:
+        emit('error', {'message': f'Game {game_id} not found'})
+        return
+    try:
+        last_seq = int(data.get('lastSeq', 0))
+    except (TypeError, ValueError):
+        emit('error', {'message': 'lastSeq must be an integer'})
+        return
+
+    follow_game(game_id)  # Join first so no ply falls between the catch-up and the room
+    fmt = client_format(request.sid)
+    alias = game_alias(game_id)
+    # Read before the game, so a change made meanwhile gets a greater seq and is not skipped
+    latest_seq = position_log.current_seq(game_id)
+    # A new viewer (lastSeq 0) needs the whole game anyway, as does one resuming from before a restart
+    plies = None
+    if last_seq > 0 and data.get('epoch') == position_log.epoch:
+        plies = position_log.since(game_id, last_seq, latest_seq)
+    resumed = {'gameId': game_id, 'seq': latest_seq, 'epoch': position_log.epoch, 'snapshot': plies is None}
+    if plies is None:
+        master_state = list(game.master_state)
+        plies = [(i, master_state[i]) for i in range(1, len(master_state))]
+        snapshot = encode_batch(game_id, plies, fmt, alias=alias)
+        snapshot.update({'type': 'snapshot', 'seq': latest_seq, 'fen': master_state[-1].fen})
+        emit('snapshot', snapshot)
+    elif plies:
+        emit('positions', encode_batch(game_id, plies, fmt, alias=alias, seq=latest_seq, prev_seq=last_seq))
+    emit('resumed', resumed)
+
+@socketio.on('get_keyframe')
+def handle_get_keyframe(data):
+    """Send the latest ply of a game with its FEN, in the client's position format"""
+    game_id = (data or {}).get('gameId')
+    game = find_game(game_id) if game_id else None
+    if not game:
+        emit('error', {'message': f'Game {game_id} not found'})
+        return
+    index = len(game.master_state) - 1
+    emit('position', encode_position(game_id, game.master_state[index], index, client_format(request.sid),
+                                     keyframe=True, alias=game_alias(game_id)))
+
+@socketio.on('join_lobby')
+def handle_join_lobby():
+    """Receive new_game, game_update and game_ended for every game (the default on connect)"""
+    join_room(LOBBY_ROOM)
+
+@socketio.on('leave_lobby')
+def handle_leave_lobby():
+    """Stop receiving the lobby events, e.g. on a page that follows a single game"""
+    leave_room(LOBBY_ROOM)
 
 @socketio.on('start_game')
 def handle_start_game(data):
@@ -225,10 +470,10 @@ def handle_start_game(data):
         if active_game and active_game.game_id != game_id:
             # If we're switching games, save the current one
             if active_game:
-                active_game.save_to_db()
+                persistence_worker.notify(active_game, immediate=True)
                 
         # Load or create the game
-        game = ChessGame.load_from_db(game_id)
+        game = find_game(game_id)
         if not game:
             game = ChessGame(game_id)
             # Set game metadata from the request
@@ -240,7 +485,10 @@ def handle_start_game(data):
                 game.black = data['black']
             game.save_to_db()
             
-        active_game = game
+        active_game = track_game(game)
+        if position_stabilizer:
+            position_stabilizer.reset()  # Don't carry debounce state over from the previous game
+        follow_game(game_id)  # The client broadcasting the game also gets its positions
         
         # Let the client know the game has started
         emit('game_started', {
@@ -249,23 +497,11 @@ def handle_start_game(data):
             'message': 'Game broadcast started'
         })
         
-        # Broadcast to all clients that a new game has started
-        socketio.emit('new_game', {
+        # Tell the lobby that a new game has started
+        broadcaster.send('new_game', {
             'type': 'new_game',
-            'game': {
-                'id': game_id,
-                'title': active_game.event,
-                'players': {
-                    'white': active_game.white,
-                    'black': active_game.black
-                },
-                'status': 'active',
-                'lastUpdate': time.time() * 1000,  # milliseconds since epoch
-                'currentPosition': active_game.master_state[0].fen,
-                'moveCount': 0,
-                'viewerCount': len(connected_clients)
-            }
-        })
+            'game': lobby_game(game_id, active_game)
+        }, to=LOBBY_ROOM)
         
         print(f"Started new game broadcast: {game_id}")
         
@@ -286,15 +522,17 @@ def handle_end_game(data):
             return
             
         if active_game and active_game.game_id == game_id:
-            # Save the game state
-            active_game.save_to_db()
-            print(f"Game {game_id} saved to database")
+            # Save the game state in the background
+            persistence_worker.notify(active_game, immediate=True)
+            print(f"Game {game_id} queued for saving")
             
-            # Broadcast that the game has ended
-            socketio.emit('game_ended', {
+            # Tell the game's viewers and the lobby that the game has ended
+            broadcaster.send('game_ended', {
                 'type': 'game_ended',
                 'gameId': game_id
-            })
+            }, to=[game_room(game_id), LOBBY_ROOM])
+            lobby_updates.pop(game_id, None)
+            broadcaster.cancel(('game_update', game_id))  # A held back update would show it active again
             
             current_game_id = None
             emit('game_ended', {'message': f'Game {game_id} broadcast ended'})
@@ -308,7 +546,8 @@ def handle_end_game(data):
 @socketio.on('connect_hardware')
 def handle_connect_hardware(data):
     """Connect to hardware via serial port or moves.txt file"""
-    global serial_connection, serial_thread, active_game, stop_thread
+    global serial_connection, serial_thread, active_game, stop_thread, ingest_mode, read_timeout, stable_frames, stable_window
+    global batch_max_size, batch_max_delay
     
     try:
         if not data or 'port' not in data:
@@ -317,6 +556,18 @@ def handle_connect_hardware(data):
 
         port = data['port']
         baud_rate = data.get('baudRate', 115200)
+        if data.get('ingestMode') in (INGEST_MODE_EVENT, INGEST_MODE_POLL):
+            ingest_mode = data['ingestMode']
+        if 'readTimeout' in data:
+            read_timeout = float(data['readTimeout'])
+        if 'stableFrames' in data:
+            stable_frames = int(data['stableFrames'])
+        if 'stableWindow' in data:
+            stable_window = float(data['stableWindow'])
+        if 'batchMaxSize' in data:
+            batch_max_size = int(data['batchMaxSize'])
+        if 'batchMaxDelay' in data:
+            batch_max_delay = float(data['batchMaxDelay'])
         
         # Check if already connected
         if serial_connection and serial_connection.is_open:
@@ -336,7 +587,7 @@ def handle_connect_hardware(data):
             })
             
             # Also broadcast to all clients
-            socketio.emit('hardware_status', {
+            broadcaster.send('hardware_status', {
                 'status': 'connected',
                 'port': port
             })
@@ -365,7 +616,7 @@ def handle_connect_hardware(data):
             })
             
             # Also broadcast to all clients
-            socketio.emit('hardware_status', {
+            broadcaster.send('hardware_status', {
                 'status': 'connected',
                 'port': f'FILE:{file_path}'
             })
@@ -374,7 +625,7 @@ def handle_connect_hardware(data):
             return
             
         # Connect to serial port
-        serial_connection = serial.Serial(port, baud_rate, timeout=1)
+        serial_connection = ChessSerial(port, baud_rate, timeout=1)
         
         # Start reading thread
         stop_thread = False
@@ -389,7 +640,7 @@ def handle_connect_hardware(data):
         })
         
         # Also broadcast to all clients
-        socketio.emit('hardware_status', {
+        broadcaster.send('hardware_status', {
             'status': 'connected',
             'port': port
         })
@@ -418,7 +669,7 @@ def handle_disconnect_hardware():
             # Process remaining items in the queue and save
             if active_game:
                 active_game.process_queue()
-                active_game.save_to_db()
+                persistence_worker.notify(active_game, immediate=True)
                 
             emit('hardware_disconnected', {
                 'status': 'disconnected',
@@ -426,7 +677,7 @@ def handle_disconnect_hardware():
             })
             
             # Also broadcast to all clients
-            socketio.emit('hardware_status', {
+            broadcaster.send('hardware_status', {
                 'status': 'disconnected',
                 'port': 'MOCK'
             })
@@ -455,7 +706,7 @@ def handle_disconnect_hardware():
         # Process remaining items in the queue and save
         if active_game:
             active_game.process_queue()
-            active_game.save_to_db()
+            persistence_worker.notify(active_game, immediate=True)
             
         emit('hardware_disconnected', {
             'status': 'disconnected',
@@ -463,7 +714,7 @@ def handle_disconnect_hardware():
         })
         
         # Also broadcast to all clients
-        socketio.emit('hardware_status', {
+        broadcaster.send('hardware_status', {
             'status': 'disconnected',
             'port': connection_info
         })
@@ -479,19 +730,7 @@ def handle_get_live_games():
     try:
         if current_game_id and active_game:
             # We only support one active game at a time in this implementation
-            live_games = [{
-                'id': current_game_id,
-                'title': active_game.event,
-                'players': {
-                    'white': active_game.white,
-                    'black': active_game.black
-                },
-                'status': 'active',
-                'lastUpdate': time.time() * 1000,  # milliseconds since epoch
-                'currentPosition': active_game.master_state[-1].fen,
-                'moveCount': len(active_game.master_state) - 1,  # Subtract 1 for initial state
-                'viewerCount': len(connected_clients)
-            }]
+            live_games = [lobby_game(current_game_id, active_game)]
         else:
             live_games = []
             
@@ -513,31 +752,33 @@ def handle_get_game_state(data):
             emit('error', {'message': 'Game ID is required'})
             return
             
-        # Check if it's the active game
-        if active_game and active_game.game_id == game_id:
-            game = active_game
+        # Check if it's the active game or another game held in memory
+        game = active_game if active_game and active_game.game_id == game_id else game_cache.peek(game_id)
+        if game:
+            title, white, black = game.event, game.white, game.black
+            latest_position = game.master_state[-1].fen if game.master_state else None
+            move_count = len(game.master_state) - 1  # Subtract 1 for initial state
         else:
-            # Load from database
-            game = ChessGame.load_from_db(game_id)
-            
-        if not game:
-            emit('error', {'message': f'Game {game_id} not found'})
-            return
-            
-        # Get the latest position
-        latest_position = game.master_state[-1].fen if game.master_state else None
+            # Read the stored summary; the moves themselves are not needed
+            summary = ChessGame.load_summary(game_id)
+            if not summary:
+                emit('error', {'message': f'Game {game_id} not found'})
+                return
+            title, white, black = summary['event'], summary['white'], summary['black']
+            latest_position = summary['last_fen']
+            move_count = summary['ply_count'] or 0
         
         emit('game_state', {
             'gameId': game_id,
-            'title': game.event,
+            'title': title,
             'players': {
-                'white': game.white,
-                'black': game.black
+                'white': white,
+                'black': black
             },
             'status': 'active' if game_id == current_game_id else 'ended',
             'position': latest_position,
-            'moveCount': len(game.master_state) - 1,  # Subtract 1 for initial state
-            'viewerCount': len(connected_clients)
+            'moveCount': move_count,
+            'viewerCount': len(game_viewers.get(game_id, ()))
         })
         
     except Exception as e:
@@ -555,40 +796,24 @@ def handle_simulate_hardware_input(data):
         fen = data['fen']
         game_id = data['gameId']
         
-        # Load the specific game instance based on the provided gameId
-        target_game = ChessGame.load_from_db(game_id)
+        # Use the live instance of the game, loading it only if it is not in memory
+        target_game = find_game(game_id)
         
         if not target_game:
-            # Maybe check the global active_game as a fallback?
-            if game_id == current_game_id and active_game:
-                target_game = active_game
-            else:
-                 emit('error', {'message': f'Game with ID {game_id} not found or not active.'})
-                 return
+            emit('error', {'message': f'Game with ID {game_id} not found or not active.'})
+            return
                  
         # Update current_game_id if not set - this ensures the game shows up in live games list
         if current_game_id is None:
             current_game_id = game_id
-            # Broadcast new game event if this is a newly active game
-            socketio.emit('new_game', {
+            # Tell the lobby if this is a newly active game
+            broadcaster.send('new_game', {
                 'type': 'new_game',
-                'game': {
-                    'id': game_id,
-                    'title': target_game.event,
-                    'players': {
-                        'white': target_game.white,
-                        'black': target_game.black
-                    },
-                    'status': 'active',
-                    'lastUpdate': time.time() * 1000,  # milliseconds since epoch
-                    'currentPosition': target_game.master_state[0].fen,
-                    'moveCount': len(target_game.master_state) - 1,  # Subtract 1 for initial state
-                    'viewerCount': len(connected_clients)
-                }
-            })
+                'game': lobby_game(game_id, target_game)
+            }, to=LOBBY_ROOM)
             # Set as active game if not already
             if target_game != active_game:
-                active_game = target_game
+                active_game = track_game(target_game)
             
         print(f"Simulated hardware input for game {game_id}: {fen}")
         
@@ -604,17 +829,8 @@ def handle_simulate_hardware_input(data):
             move = target_game.master_state[-1] # Get the latest ChessMove object
             move_index = len(target_game.master_state) - 1
             
-            socketio.emit('position', {
-                'type': 'position',
-                'gameId': game_id,
-                'fen': move.fen,
-                'moveNumber': move_index,
-                'player': move.player,
-                'algebraic': move.algebraic,
-                'isLegal': move.is_legal,
-                'piece_moved': move.piece_moved # ADD piece_moved field
-            })
-            print(f"[POSITION EVENT] Emitted simulated position update from simulate_hardware_input for game {game_id}: {move.algebraic or 'unknown move'} ({move.piece_moved}) | FEN: {move.fen[:15]}...")
+            emit_positions(game_id, [(move_index, move)])
+            update_lobby(game_id, target_game)
             
             # Persist the change for the loaded game if it wasn't the global active one
             if target_game != active_game:
@@ -702,9 +918,9 @@ def create_game():
 
 @app.route('/games/<game_id>', methods=['GET'])
 def get_game(game_id):
-    """Get a game from database by ID"""
+    """Get a game by ID, from memory if it is cached"""
     try:
-        game = ChessGame.load_from_db(game_id)
+        game = find_game(game_id)
         
         if not game:
             return jsonify({
@@ -748,9 +964,33 @@ def get_game(game_id):
 
 @app.route('/games', methods=['GET'])
 def list_games():
-    """List all games in the database"""
+    """
+    List games in the database, newest first, one page at a time.
+
+    Query parameters: limit (1-200, default 50), after (the next_cursor of the
+    previous page), player (white or black), result, from and to (ISO dates or
+    datetimes on created_at; a bare `to` date includes that whole day).
+    """
     try:
-        games = ChessGame.list_games()
+        try:
+            limit = int(request.args.get('limit', GAMES_PAGE_SIZE))
+            if not 1 <= limit <= GAMES_PAGE_MAX:
+                raise ValueError(f"limit must be between 1 and {GAMES_PAGE_MAX}")
+            created_from = parse_date_param(request.args.get('from'))
+            created_to = parse_date_param(request.args.get('to'), end_of_day=True)
+            games, next_cursor = ChessGame.list_games_page(
+                limit=limit,
+                after=request.args.get('after'),
+                player=request.args.get('player'),
+                result=request.args.get('result'),
+                created_from=created_from,
+                created_to=created_to
+            )
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
         
         # Format the response
         game_list = []
@@ -760,12 +1000,16 @@ def list_games():
                 'white': game[1],
                 'black': game[2],
                 'date': game[3],
-                'result': game[4]
+                'result': game[4],
+                'created_at': game[5].isoformat(),
+                'move_count': game[6] or 0,
+                'status': game[7]
             })
             
         return jsonify({
             'status': 'success',
-            'games': game_list
+            'games': game_list,
+            'next_cursor': next_cursor
         }), 200
             
     except Exception as e:
@@ -797,6 +1041,32 @@ def list_ports():
             'message': str(e)
         }), 500
 
+@app.route('/ingest/stats', methods=['GET'])
+def ingest_stats():
+    """Report counters of the hardware ingest pipeline"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'stabilizer': position_stabilizer.stats() if position_stabilizer else None,
+            'batches': position_batcher.stats() if position_batcher else None,
+            'position_log': position_log.stats(),
+            'broadcaster': broadcaster.stats(),
+            'queue': active_game.processing_queue.stats() if active_game else None,
+            'successors': {
+                'hits': active_game.successor_hits,
+                'misses': active_game.successor_misses
+            } if active_game else None,
+            'persistence': persistence_worker.stats(),
+            'checkpoints': wal_checkpointer.stats(),
+            'game_cache': game_cache.stats()
+        }), 200
+            
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/serial/connect', methods=['POST'])
 def connect_serial():
     """Connect to a serial port"""
@@ -822,7 +1092,7 @@ def connect_serial():
             }), 400
             
         # Load or create game
-        game = ChessGame.load_from_db(game_id)
+        game = find_game(game_id)
         if not game:
             # Create new game if not found
             game = ChessGame(game_id)
@@ -836,10 +1106,10 @@ def connect_serial():
             }), 400
             
         # Set as active game
-        active_game = game
+        active_game = track_game(game)
         
         # Connect to serial port
-        serial_connection = serial.Serial(port, baud_rate, timeout=1)
+        serial_connection = ChessSerial(port, baud_rate, timeout=1)
         
         # Start reading thread
         stop_thread = False
@@ -982,7 +1252,7 @@ def update_game_result(game_id):
         print(f"[DEBUG] Updating game {game_id} result to: {result}")
         
         # Load the game
-        game = ChessGame.load_from_db(game_id)
+        game = find_game(game_id)
         if not game:
             print(f"[ERROR] Game with ID {game_id} not found")
             return jsonify({
@@ -1020,4 +1290,6 @@ def update_game_result(game_id):
 
 if __name__ == '__main__':
     print("Starting ChessLink WebSocket Server on port 8765...")
+    init_db()
+    wal_checkpointer.start()
     socketio.run(app, host='127.0.0.1', port=8765, debug=True, allow_unsafe_werkzeug=True) 
\ No newline at end of file
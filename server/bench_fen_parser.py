@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+FEN Parsing Benchmark
+
+Compares the per-frame parsing work of the previous ingest path (regex match,
+split into fields and ranks, then chess.Board for the new FEN plus two more
+for the previous FEN in ChessGame._process_fen) with fenParser.parse_fen,
+where the new frame is parsed once and the previous board is reused.
+
+Usage:
+    python bench_fen_parser.py [iterations]
+"""
+
+import re
+import sys
+import time
+import chess
+from fenParser import parse_fen
+
+GAME_MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7",
+              "Re1", "b5", "Bb3", "d6", "c3", "O-O", "h3", "Na5", "Bc2", "c5"]
+
+FEN_PATTERN = re.compile(r"^[1-8pnbrqkPNBRQK/]+ [wb] [KQkq-]+ [a-h1-8-]+ \d+ \d+$")
+
+
+def game_fens():
+    board = chess.Board()
+    fens = [board.fen()]
+    for san in GAME_MOVES:
+        board.push_san(san)
+        fens.append(board.fen())
+    return fens
+
+
+def legacy_path(fens):
+    """Regex + splits in read_serial_data, then the Board parses in _process_fen."""
+    previous = fens[0]
+    for line in fens[1:]:
+        if not FEN_PATTERN.match(line):
+            continue
+        rows = line.split(' ')[0].split('/')
+        if len(rows) != 8:
+            continue
+        board_before = chess.Board(previous)                  # get_latest_board()
+        board_after = chess.Board(line)
+        board_after_fen_only = board_after.board_fen()
+        last_board_fen = chess.Board(previous).board_fen()    # duplicate check
+        if last_board_fen != board_after_fen_only:
+            previous = line
+
+
+def single_pass_path(fens):
+    """parse_fen once per frame; the accepted board becomes the next board_before."""
+    board_before = chess.Board(fens[0])
+    previous_placement = board_before.board_fen()
+    for line in fens[1:]:
+        position, error = parse_fen(line)
+        if position is None:
+            continue
+        board_after = position.board
+        if position.placement != previous_placement:
+            board_before = board_after
+            previous_placement = position.placement
+
+
+def validate_only_legacy(fens):
+    for line in fens:
+        if FEN_PATTERN.match(line):
+            line.split(' ')[0].split('/')
+
+
+def validate_only_single_pass(fens):
+    for line in fens:
+        parse_fen(line)
+
+
+def timed(func, fens, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(fens)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(fens)) * 1e6  # microseconds per frame
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fens = game_fens()
+
+    print(f"Per-frame cost over {iterations} replays of a {len(fens)}-position game")
+    print(f"  validation only, regex + splits:   {timed(validate_only_legacy, fens, iterations):8.2f} us")
+    print(f"  validation only, parse_fen:        {timed(validate_only_single_pass, fens, iterations):8.2f} us")
+    print(f"  validate + parse, legacy path:     {timed(legacy_path, fens, iterations):8.2f} us")
+    print(f"  validate + parse, single pass:     {timed(single_pass_path, fens, iterations):8.2f} us")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+File Reader Benchmark
+
+Compares draining a moves.txt file line by line with the previous approach
+(re-reading the whole file with readlines() for every line) against the
+incremental tail reader in ChessFileReader.
+
+The legacy approach is O(N^2) in file size, so it is only run on the smaller
+sizes; the tail reader is also run on a 100k-line file.
+
+Usage:
+    python bench_file_reader.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import chess
+from chessFileReader import ChessFileReader
+
+GAME_MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7",
+              "Re1", "b5", "Bb3", "d6", "c3", "O-O"]
+
+
+def write_moves_file(path, line_count):
+    """Write `line_count` partial FENs by replaying GAME_MOVES over and over."""
+    board = chess.Board()
+    lines = [board.board_fen()]
+    while len(lines) < line_count:
+        for san in GAME_MOVES:
+            board.push_san(san)
+            lines.append(board.board_fen())
+        board = chess.Board()
+        lines.append(board.board_fen())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines[:line_count]) + "\n")
+
+
+def drain_legacy(path):
+    """The previous readline(): read the whole file, return one line."""
+    processed = 0
+    while True:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        if processed >= len(lines):
+            return processed
+        lines[processed].strip()
+        processed += 1
+
+
+def drain_tail(path):
+    """The incremental reader, raw lines only (no FEN completion)."""
+    reader = ChessFileReader(path)
+    reader.open()
+    count = 0
+    while reader.in_waiting > 0:
+        count += len(reader._pending_lines)
+        reader._pending_lines.clear()
+    reader.close()
+    return count
+
+
+def drain_tail_full(path):
+    """The incremental reader through the public readline(), including FEN completion."""
+    reader = ChessFileReader(path)
+    reader.open()
+    count = 0
+    while reader.in_waiting > 0:
+        reader.readline()
+        count += 1
+    reader.close()
+    return count
+
+
+def timed(func, path):
+    start = time.perf_counter()
+    count = func(path)
+    return count, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "moves.txt")
+    devnull = open(os.devnull, 'w')
+
+    print(f"{'lines':>8} {'legacy':>12} {'tail (raw)':>12} {'tail (readline)':>16}")
+    for line_count in (1000, 5000, 20000, 100000):
+        write_moves_file(path, line_count)
+
+        stdout = sys.stdout
+        sys.stdout = devnull  # Keep reader log lines out of the table
+        try:
+            legacy = timed(drain_legacy, path)[1] if line_count <= 5000 else None
+            raw = timed(drain_tail, path)[1]
+            full = timed(drain_tail_full, path)[1]
+        finally:
+            sys.stdout = stdout
+
+        legacy_text = f"{legacy:10.3f} s" if legacy is not None else f"{'(skipped)':>12}"
+        print(f"{line_count:>8} {legacy_text} {raw:10.3f} s {full:14.3f} s")
+
+    os.remove(path)
+    os.rmdir(tmp_dir)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Game Cache Benchmark
+
+Replays simulated hardware input against a stored game of `plies` plies, as
+handle_simulate_hardware_input does for a game that is not the active one:
+look the game up, process one FEN, save it. Compares loading the game from
+the database for every event (the previous path) with looking it up in a
+GameCache, against a temporary database, and reports the cache metrics.
+
+Usage:
+    python bench_game_cache.py [events] [plies]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import chess
+import chessClass
+from chessClass import ChessGame, Session
+from gameCache import GameCache
+from storageProfile import create_storage_engine
+
+
+def random_fens(ply_count, seed):
+    rng = random.Random(seed)
+    board = chess.Board()
+    fens = []
+    while len(fens) < ply_count:
+        if board.is_game_over():
+            board = chess.Board()
+        board.push(rng.choice(list(board.legal_moves)))
+        fens.append(board.fen())
+    return fens
+
+
+def seed(game_id, fens):
+    game = ChessGame(game_id)
+    game.PRECOMPUTE_SUCCESSORS = False
+    for fen in fens:
+        game.add_to_queue(fen)
+    game.process_queue()
+    game.save_to_db()
+
+
+def replay(lookup, game_id, fens):
+    """Per event: look the game up, process the FEN and save; returns seconds"""
+    start = time.perf_counter()
+    for fen in fens:
+        game = lookup(game_id)
+        game.PRECOMPUTE_SUCCESSORS = False
+        game.add_to_queue(fen)
+        game.process_queue()
+        game.save_to_db()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ply_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    fens = random_fens(ply_count + event_count, 7)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_storage_engine(f"sqlite:///{os.path.join(directory, 'games.db')}")
+        chessClass.Base.metadata.create_all(engine)
+        Session.remove()
+        Session.configure(bind=engine)
+
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull  # The save and load paths print per call
+        try:
+            seed("uncached", fens[:ply_count])
+            seed("cached", fens[:ply_count])
+            load_s = replay(ChessGame.load_from_db, "uncached", fens[ply_count:])
+            cache = GameCache(ChessGame.load_from_db)
+            ChessGame.store_listener = cache.on_stored
+            cache_s = replay(cache.get, "cached", fens[ply_count:])
+        finally:
+            ChessGame.store_listener = None
+            sys.stdout = stdout
+            devnull.close()
+            Session.remove()
+            engine.dispose()
+
+    stats = cache.stats()
+    print(f"{event_count} simulated inputs into a stored game of {ply_count} plies")
+    print(f"  load per event : {load_s * 1000 / event_count:7.2f} ms/event")
+    print(f"  game cache     : {cache_s * 1000 / event_count:7.2f} ms/event")
+    print(f"  speedup: {load_s / cache_s:.1f}x, cache hits {stats['hits']}, misses {stats['misses']}")
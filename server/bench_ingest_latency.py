@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Ingest Latency Benchmark
+
+Measures the latency from a FEN line arriving on the serial port to the matching
+'position' event being emitted for it (by the broadcaster thread, which
+app.read_serial_data queues it for), for both the legacy 'poll' ingest mode
+and the blocking 'event' mode.
+
+A pseudo-terminal stands in for the hardware, so this only runs on POSIX systems.
+
+Usage:
+    python bench_ingest_latency.py [moves_per_mode]
+"""
+
+import os
+import sys
+import threading
+import time
+import statistics
+import chess
+
+import app
+from chessClass import ChessGame
+from serialIngest import INGEST_MODE_EVENT, INGEST_MODE_POLL, ChessSerial
+
+GAME_MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7",
+              "Re1", "b5", "Bb3", "d6", "c3", "O-O"]
+
+
+def _fen_sequence(count):
+    """Generate `count` successive full FENs by replaying GAME_MOVES."""
+    fens = []
+    board = chess.Board()
+    while len(fens) < count:
+        for san in GAME_MOVES:
+            board.push_san(san)
+            fens.append(board.fen())
+            if len(fens) == count:
+                break
+        board = chess.Board()
+        fens.append(board.fen())  # Reset the board between replays
+    return fens[:count]
+
+
+def run_mode(mode, move_count, gap=0.15):
+    master_fd, slave_fd = os.openpty()
+    port = ChessSerial(os.ttyname(slave_fd), timeout=1)
+
+    emitted = threading.Event()
+    emit_times = []
+
+    def fake_emit(event, data=None, **kwargs):
+        if event == 'position':
+            emit_times.append(time.perf_counter())
+            emitted.set()
+
+    original_emit = app.broadcaster.emit
+    app.broadcaster.emit = fake_emit
+    app.serial_connection = port
+    app.active_game = ChessGame("bench-ingest")
+    app.current_game_id = "bench-ingest"
+    app.stop_thread = False
+    app.stable_frames = 1  # Each FEN is sent once; measure ingest without debouncing
+    app.ingest_mode = mode
+
+    reader = threading.Thread(target=app.read_serial_data, daemon=True)
+    reader.start()
+
+    latencies = []
+    try:
+        for fen in _fen_sequence(move_count):
+            emitted.clear()
+            # A gap that is not a multiple of the poll interval, so arrivals drift across it
+            time.sleep(gap)
+            sent_at = time.perf_counter()
+            os.write(master_fd, (fen + "\n").encode('utf-8'))
+            if emitted.wait(2.0):
+                latencies.append(emit_times[-1] - sent_at)
+    finally:
+        app.stop_thread = True
+        reader.join(2.0)
+        app.broadcaster.emit = original_emit
+        port.close()
+        os.close(master_fd)
+        os.close(slave_fd)
+
+    return latencies
+
+
+def report(mode, latencies):
+    if not latencies:
+        print(f"{mode:>6}: no position events received")
+        return
+    ms = sorted(l * 1000 for l in latencies)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{mode:>6}: n={len(ms)}  mean={statistics.mean(ms):7.2f} ms  "
+          f"median={statistics.median(ms):7.2f} ms  p95={p95:7.2f} ms  max={ms[-1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    # Silence the per-line logging of the ingest loop while measuring
+    devnull = open(os.devnull, 'w')
+    results = {}
+    for mode in (INGEST_MODE_POLL, INGEST_MODE_EVENT):
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            results[mode] = run_mode(mode, moves)
+        finally:
+            sys.stdout = stdout
+
+    print(f"Byte arrival -> 'position' emit latency ({moves} moves per mode)")
+    for mode, latencies in results.items():
+        report(mode, latencies)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Game Loading Benchmark
+
+Loads 1,000 stored games of 100 plies each with ChessGame.load_from_db
+(Core selects, rows straight into ChessMove) and with the previous ORM path
+(query ChessGameModel and ChessMoveModel instances, build a throwaway
+initial position, convert each model with ChessMove.from_model), against a
+temporary database, and checks that both produce the same timelines.
+
+Usage:
+    python bench_load_games.py [games] [plies]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+import chess
+from sqlalchemy import insert
+import chessClass
+from chessClass import ChessGame, ChessGameModel, ChessMove, ChessMoveModel, Session
+from storageProfile import create_storage_engine
+
+
+def seed(engine, game_count, ply_count):
+    """Insert game_count games of ply_count plies (plus the initial position) with bulk inserts."""
+    rng = random.Random(3)
+    started = datetime(2025, 1, 1)
+    game_ids = []
+    with engine.begin() as connection:
+        for g in range(game_count):
+            game_id = str(uuid.uuid4())
+            game_ids.append(game_id)
+            connection.execute(insert(ChessGameModel.__table__), [{
+                'game_id': game_id, 'event': f"Game {g}", 'site': "?", 'date': "2025.01.01",
+                'round': "1", 'white': "White", 'black': "Black", 'result': "*",
+                'created_at': started + timedelta(minutes=g),
+            }])
+            board = chess.Board()
+            rows = [{'move_id': str(uuid.uuid4()), 'game_id': game_id, 'fen': board.fen(), 'player': None,
+                     'timestamp': started, 'algebraic': None, 'uci': None, 'is_legal': True, 'move_index': 0}]
+            for i in range(1, ply_count + 1):
+                if board.is_game_over():
+                    board = chess.Board()
+                move = rng.choice(list(board.legal_moves))
+                player = "White" if board.turn == chess.WHITE else "Black"
+                san = board.san(move)
+                board.push(move)
+                rows.append({'move_id': str(uuid.uuid4()), 'game_id': game_id, 'fen': board.fen(),
+                             'player': player, 'timestamp': started + timedelta(seconds=i),
+                             'algebraic': san, 'uci': move.uci(), 'is_legal': True, 'move_index': i})
+            connection.execute(insert(ChessMoveModel.__table__), rows)
+    return game_ids
+
+
+def load_legacy(game_id):
+    """The previous load_from_db: ORM queries and model instances for every move."""
+    session = Session()
+    try:
+        game_model = session.query(ChessGameModel).filter_by(game_id=game_id).first()
+        if not game_model:
+            return None
+        game = ChessGame(game_id)
+        game.event = game_model.event
+        game.site = game_model.site
+        game.date = game_model.date
+        game.round = game_model.round
+        game.white = game_model.white
+        game.black = game_model.black
+        game.result = game_model.result
+        move_models = session.query(ChessMoveModel).filter_by(game_id=game_id).order_by(ChessMoveModel.move_index).all()
+        game.master_state = []
+        for move_model in move_models:
+            game.master_state.append(ChessMove.from_model(move_model))
+        game._reindex_from(0)
+        game._saved_index = {move.move_id: i for i, move in enumerate(game.master_state)}
+        game._dirty_from = None
+        return game
+    finally:
+        session.close()
+
+
+def timeline(game):
+    return [(m.move_id, m.fen, m.player, m.timestamp, m.algebraic, m.uci, m.is_legal) for m in game.master_state]
+
+
+def timed(loader, game_ids):
+    start = time.perf_counter()
+    games = [loader(game_id) for game_id in game_ids]
+    return time.perf_counter() - start, games
+
+
+if __name__ == "__main__":
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ply_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_storage_engine(f"sqlite:///{os.path.join(directory, 'games.db')}")
+        chessClass.Base.metadata.create_all(engine)
+        Session.remove()
+        Session.configure(bind=engine)
+        game_ids = seed(engine, game_count, ply_count)
+
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull  # load_from_db prints one line per game
+        try:
+            legacy_s, legacy_games = timed(load_legacy, game_ids)
+            core_s, core_games = timed(ChessGame.load_from_db, game_ids)
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+            Session.remove()
+            engine.dispose()
+
+    mismatches = sum(timeline(a) != timeline(b) or a.white != b.white or a.event != b.event
+                     for a, b in zip(legacy_games, core_games))
+    print(f"Loading {game_count} games x {ply_count} plies")
+    print(f"  legacy ORM path : {legacy_s:7.2f} s  ({legacy_s / game_count * 1000:6.2f} ms/game)")
+    print(f"  Core fast path  : {core_s:7.2f} s  ({core_s / game_count * 1000:6.2f} ms/game)")
+    print(f"  speedup: {legacy_s / core_s:.1f}x, mismatched games: {mismatches}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Move Matcher Benchmark
+
+Compares getMove.determine_move (bitboard diff, only the legal moves whose
+from and to squares changed are played out) with the previous implementation
+(copy the board and compare board_fen() strings for every legal move) over the
+position transitions of a few well-known games, and checks that both return
+exactly the same (move, san) for every transition.
+
+Usage:
+    python bench_move_matcher.py [iterations]
+"""
+
+import sys
+import time
+import chess
+from getMove import determine_move
+
+GAMES = {
+    "Opera Game (Morphy, 1858)":
+        "e4 e5 Nf3 d6 d4 Bg4 dxe5 Bxf3 Qxf3 dxe5 Bc4 Nf6 Qb3 Qe7 Nc3 c6 Bg5 b5 Nxb5 cxb5 "
+        "Bxb5+ Nbd7 O-O-O Rd8 Rxd7 Rxd7 Rd1 Qe6 Bxd7+ Nxd7 Qb8+ Nxb8 Rd8#",
+    "Immortal Game (Anderssen, 1851)":
+        "e4 e5 f4 exf4 Bc4 Qh4+ Kf1 b5 Bxb5 Nf6 Nf3 Qh6 d3 Nh5 Nh4 Qg5 Nf5 c6 g4 Nf6 Rg1 cxb5 "
+        "h4 Qg6 h5 Qg5 Qf3 Ng8 Bxf4 Qf6 Nc3 Bc5 Nd5 Qxb2 Bd6 Bxg1 e5 Qxa1+ Ke2 Na6 Nxg7+ Kd8 "
+        "Qf6+ Nxf6 Be7#",
+    "Evergreen Game (Anderssen, 1852)":
+        "e4 e5 Nf3 Nc6 Bc4 Bc5 b4 Bxb4 c3 Ba5 d4 exd4 O-O d3 Qb3 Qf6 e5 Qg6 Re1 Nge7 Ba3 b5 "
+        "Qxb5 Rb8 Qa4 Bb6 Nbd2 Bb7 Ne4 Qf5 Bxd3 Qh5 Nf6+ gxf6 exf6 Rg8 Rad1 Qxf3 Rxe7+ Nxe7 "
+        "Qxd7+ Kxd7 Bf5+ Ke8 Bd7+ Kf8 Bxe7#",
+    "Ruy Lopez (server/moves.txt)":
+        "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O h3 Na5 Bc2 c5 d4 Qc7 "
+        "Nbd2 cxd4 cxd4 Nc6 Nb3 a5 Be3 a4 Nbd2 Bd7 Rc1 Qb8",
+}
+
+
+def determine_move_legacy(board_before, board_after):
+    """The legal-move scan of the previous determine_move (the fallback paths are unchanged)."""
+    changed = [sq for sq in range(64) if board_before.piece_at(sq) != board_after.piece_at(sq)]
+    if len(changed) < 2 or len(changed) > 4:
+        return None, "(ambiguous or unsupported change)"
+    for move in board_before.legal_moves:
+        temp_board = board_before.copy()
+        temp_board.push(move)
+        if temp_board.board_fen() == board_after.board_fen():
+            try:
+                san = board_before.san(move)
+            except:
+                san = move.uci()
+            return move, san
+    return None, None  # Fallback inference, identical in both implementations
+
+
+def build_corpus():
+    """(board_before, board_after) for every ply, plus a two-ply jump per game as a miss case."""
+    transitions = []
+    for moves in GAMES.values():
+        board = chess.Board()
+        boards = [board.copy()]
+        for san in moves.split():
+            board.push_san(san)
+            boards.append(board.copy())
+        transitions.extend(zip(boards, boards[1:]))
+        transitions.extend(zip(boards, boards[2:]))
+    return transitions
+
+
+def timed(func, transitions, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for board_before, board_after in transitions:
+            func(board_before, board_after)
+    return (time.perf_counter() - start) / (iterations * len(transitions)) * 1e6
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    transitions = build_corpus()
+
+    mismatches = 0
+    for board_before, board_after in transitions:
+        legacy = determine_move_legacy(board_before, board_after)
+        if legacy == (None, None):
+            continue  # Falls through to the inference code, which is the same in both
+        current = determine_move(board_before, board_after)
+        if legacy != current:
+            mismatches += 1
+            print(f"MISMATCH {board_before.fen()} -> {board_after.board_fen()}: {legacy} vs {current}")
+
+    legacy_us = timed(determine_move_legacy, transitions, iterations)
+    current_us = timed(determine_move, transitions, iterations)
+    print(f"{len(transitions)} transitions from {len(GAMES)} games, {iterations} iterations")
+    print(f"  legacy (copy + board_fen per legal move): {legacy_us:8.1f} us/transition")
+    print(f"  bitboard diff matcher:                    {current_us:8.1f} us/transition")
+    print(f"  speedup: {legacy_us / current_us:.1f}x, mismatches: {mismatches}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Incremental Save Benchmark
+
+Plays a game move by move and saves it after every ply, the way the server
+does, comparing ChessGame.save_to_db (only new or edited plies are written)
+with the previous implementation (delete every chess_moves row of the game
+and re-insert the whole timeline). Reports the cost of one save as the game
+grows. Runs against a temporary SQLite file, not chess_games.db.
+
+Usage:
+    python bench_save_incremental.py [plies]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+import chess
+from sqlalchemy import create_engine
+import chessClass
+from chessClass import ChessGame, ChessGameModel, ChessMoveModel, Session
+
+
+def game_fens(ply_count):
+    """FENs of a random game, restarted from the initial position when it ends."""
+    rng = random.Random(7)
+    board = chess.Board()
+    fens = []
+    while len(fens) < ply_count:
+        if board.is_game_over() or board.can_claim_draw():
+            board = chess.Board()
+        board.push(rng.choice(list(board.legal_moves)))
+        fens.append(board.fen())
+    return fens
+
+
+def save_legacy(game):
+    """The previous save_to_db: delete all moves of the game and add every ply again."""
+    session = Session()
+    try:
+        existing_game = session.query(ChessGameModel).filter_by(game_id=game.game_id).first()
+        if existing_game:
+            existing_game.result = game.result
+            session.query(ChessMoveModel).filter_by(game_id=game.game_id).delete()
+        else:
+            session.add(ChessGameModel(game_id=game.game_id, event=game.event, site=game.site,
+                                       date=game.date, round=game.round, white=game.white,
+                                       black=game.black, result=game.result,
+                                       created_at=datetime.now()))
+        for i, move in enumerate(game.master_state):
+            session.add(move.to_model(game.game_id, i))
+        session.commit()
+    finally:
+        session.close()
+
+
+def run(save, game_id, fens, checkpoints):
+    """Save after every ply; return {ply: mean save time in ms over the window ending at ply}."""
+    game = ChessGame(game_id)
+    game.PRECOMPUTE_SUCCESSORS = False
+    results = {}
+    window = []
+    for ply, fen in enumerate(fens, start=1):
+        game.add_to_queue(fen)
+        game.process_queue()
+        start = time.perf_counter()
+        save(game)
+        window.append(time.perf_counter() - start)
+        if ply in checkpoints:
+            results[ply] = sum(window) / len(window) * 1000
+            window = []
+    return results
+
+
+if __name__ == "__main__":
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    checkpoints = set(range(50, plies + 1, 50))
+    fens = game_fens(plies)
+
+    handle, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_engine(f"sqlite:///{db_path}")
+    chessClass.Base.metadata.create_all(engine)
+    Session.remove()
+    Session.configure(bind=engine)
+
+    # The save path prints one line per save; keep the report readable
+    devnull = open(os.devnull, "w")
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+        legacy = run(save_legacy, "bench-legacy", fens, checkpoints)
+        incremental = run(ChessGame.save_to_db, "bench-incremental", fens, checkpoints)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+        Session.remove()
+        engine.dispose()
+        os.remove(db_path)
+
+    print("Save after every ply, mean ms per save over the preceding 50 plies")
+    print(f"{'plies':>6} {'legacy':>10} {'incremental':>12}")
+    for ply in sorted(checkpoints):
+        print(f"{ply:>6} {legacy[ply]:>10.2f} {incremental[ply]:>12.2f}")
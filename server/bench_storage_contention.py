@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Storage Contention Benchmark
+
+Runs a writer that plays a game and saves it after every ply (as the
+persistence worker does) while reader threads keep listing and loading games
+(as the REST endpoints do), against a temporary database seeded with finished
+games. Compares a default SQLAlchemy engine (rollback journal, full
+synchronous) with storageProfile.create_storage_engine (WAL, NORMAL
+synchronous, cache, mmap and busy timeout), and reports the writer's save
+latency, the readers' throughput and any "database is locked" errors.
+
+Usage:
+    python bench_storage_contention.py [plies] [readers]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import chess
+from sqlalchemy import create_engine
+import chessClass
+from chessClass import ChessGame, Session
+from storageProfile import create_storage_engine
+
+SEED_GAMES = 100
+SEED_PLIES = 60
+
+
+def random_fens(ply_count, seed):
+    rng = random.Random(seed)
+    board = chess.Board()
+    fens = []
+    while len(fens) < ply_count:
+        if board.is_game_over():
+            board = chess.Board()
+        board.push(rng.choice(list(board.legal_moves)))
+        fens.append(board.fen())
+    return fens
+
+
+def play(game, fens):
+    game.PRECOMPUTE_SUCCESSORS = False
+    for fen in fens:
+        game.add_to_queue(fen)
+    game.process_queue()
+
+
+def seed(game_ids):
+    for i, game_id in enumerate(game_ids):
+        game = ChessGame(game_id)
+        play(game, random_fens(SEED_PLIES, i))
+        game.save_to_db()
+
+
+def run(engine, plies, reader_count):
+    Session.remove()
+    Session.configure(bind=engine)
+    chessClass.Base.metadata.create_all(engine)
+    game_ids = [f"seed-{i}" for i in range(SEED_GAMES)]
+    seed(game_ids)
+
+    done = threading.Event()
+    reads = [0] * reader_count
+    errors = []
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not done.is_set():
+            try:
+                ChessGame.list_games()
+                if ChessGame.load_from_db(rng.choice(game_ids)) is None:
+                    errors.append("load")
+                reads[slot] += 1
+            except Exception as e:
+                errors.append(str(e))
+
+    threads = [threading.Thread(target=reader, args=(slot,), daemon=True) for slot in range(reader_count)]
+    for thread in threads:
+        thread.start()
+
+    game = ChessGame("bench-writer")
+    game.PRECOMPUTE_SUCCESSORS = False
+    save_ms = []
+    failed_saves = 0
+    start = time.perf_counter()
+    for fen in random_fens(plies, 1000):
+        play(game, [fen])
+        began = time.perf_counter()
+        if not game.save_to_db():
+            failed_saves += 1
+        save_ms.append((time.perf_counter() - began) * 1000)
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+    Session.remove()
+    engine.dispose()
+
+    save_ms.sort()
+    return {
+        'save_p50': statistics.median(save_ms),
+        'save_p95': save_ms[int(len(save_ms) * 0.95) - 1],
+        'save_max': save_ms[-1],
+        'failed_saves': failed_saves,
+        'reads_per_s': sum(reads) / elapsed,
+        'read_errors': len(errors),
+    }
+
+
+if __name__ == "__main__":
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    reader_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull  # The save and load paths print per call
+        try:
+            results['default'] = run(create_engine(f"sqlite:///{os.path.join(directory, 'default.db')}"),
+                                     plies, reader_count)
+            results['profile'] = run(create_storage_engine(f"sqlite:///{os.path.join(directory, 'profile.db')}"),
+                                     plies, reader_count)
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+
+    print(f"{plies} saves with {reader_count} concurrent readers ({SEED_GAMES} seeded games)")
+    print(f"{'engine':>8} {'save p50':>10} {'save p95':>10} {'save max':>10} {'failed':>7} {'reads/s':>9} {'read err':>9}")
+    for name, r in results.items():
+        print(f"{name:>8} {r['save_p50']:>8.2f}ms {r['save_p95']:>8.2f}ms {r['save_max']:>8.2f}ms "
+              f"{r['failed_saves']:>7} {r['reads_per_s']:>9.1f} {r['read_errors']:>9}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Move Timeline Memory Benchmark
+
+Measures the memory held by ChessGame.master_state timelines, comparing the
+__slots__-based ChessMove with the previous __dict__-based version (a UUID
+string, a datetime and a chess.Move object per ply), for one long game and
+for many games resident at once.
+
+Usage:
+    python bench_timeline_memory.py
+"""
+
+import gc
+import tracemalloc
+import uuid
+from datetime import datetime
+import chess
+from chessClass import ChessMove
+
+GAME_MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7",
+              "Re1", "b5", "Bb3", "d6", "c3", "O-O", "h3", "Na5", "Bc2", "c5"]
+
+
+class LegacyChessMove:
+    """ChessMove as it was before: a plain object with a __dict__."""
+
+    def __init__(self, move_id, fen, player, timestamp, algebraic=None, uci=None,
+                 move_obj=None, is_legal=None, piece_moved=None):
+        self.move_id = move_id
+        self.fen = fen
+        self.player = player
+        self.timestamp = timestamp
+        self.algebraic = algebraic
+        self.uci = uci
+        self.move_obj = move_obj
+        self.is_legal = is_legal
+        self.piece_moved = piece_moved
+
+
+def game_plies(ply_count):
+    """(fen, san, move, player, piece) for ply_count plies, replaying GAME_MOVES."""
+    plies = []
+    board = chess.Board()
+    while len(plies) < ply_count:
+        for san in GAME_MOVES:
+            move = board.parse_san(san)
+            player = "White" if board.turn == chess.WHITE else "Black"
+            piece = board.piece_at(move.from_square).symbol().upper()
+            board.push(move)
+            plies.append((board.fen(), san, move, player, piece))
+            if len(plies) == ply_count:
+                break
+        board = chess.Board()
+    return plies
+
+
+def fresh(text):
+    """A new string object with the same value, like the ones _process_fen produces."""
+    return text.encode("utf-8").decode("utf-8")
+
+
+def build_timeline(move_class, plies):
+    timeline = []
+    for fen, san, move, player, piece in plies:
+        timeline.append(move_class(
+            move_id=str(uuid.uuid4()),
+            fen=fresh(fen),
+            player=player,
+            timestamp=datetime.now(),
+            algebraic=fresh(san),
+            uci=move.uci(),
+            move_obj=chess.Move(move.from_square, move.to_square, move.promotion),
+            is_legal=True,
+            piece_moved=piece
+        ))
+    return timeline
+
+
+def measure(move_class, game_count, ply_count):
+    plies = game_plies(ply_count)
+    gc.collect()
+    tracemalloc.start()
+    games = [build_timeline(move_class, plies) for _ in range(game_count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del games
+    return current
+
+
+if __name__ == "__main__":
+    scenarios = [
+        ("one long game", 1, 2000),
+        ("many resident games", 200, 120),
+    ]
+    for name, game_count, ply_count in scenarios:
+        plies = game_count * ply_count
+        legacy = measure(LegacyChessMove, game_count, ply_count)
+        compact = measure(ChessMove, game_count, ply_count)
+        print(f"{name} ({game_count} x {ply_count} plies)")
+        print(f"  legacy  : {legacy / 1024:10.1f} KiB  ({legacy / plies:6.0f} B/ply)")
+        print(f"  compact : {compact / 1024:10.1f} KiB  ({compact / plies:6.0f} B/ply)")
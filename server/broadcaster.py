@@ -0,0 +1,175 @@
+"""
+Broadcaster
+
+Sends Socket.IO broadcasts from a dedicated thread. The serial reading thread
+and the event handlers only queue an event with send(); the broadcaster
+thread serializes and emits them in order, so a slow transport or a large
+payload never delays reading the next frames from the board.
+
+The queue is bounded. When it is full the oldest position event is dropped
+and counted: the board must keep being read, and a viewer that sees a gap in
+the move numbers catches up with `resume`. Other events (game_ended,
+new_game, hardware_status...) cannot be replayed that way, so they are never
+dropped and may take the queue past maxsize. stats() reports the queue
+depth, its high-water mark and the time from send() to the end of the emit.
+
+send_later() holds an event back until a given time, for rate-limited
+updates: sending again under the same key before then replaces the event,
+so only the latest one goes out, when it is due.
+"""
+
+import threading
+import time
+from collections import deque
+
+DROPPABLE_EVENTS = ('position', 'positions')  # Recoverable from the position log with resume
+
+
+class Broadcaster:
+    def __init__(self, emit, maxsize=1024, clock=time.monotonic, autostart=True):
+        """emit(event, payload, to=room) does the actual send, e.g. socketio.emit"""
+        self.emit = emit
+        self.maxsize = maxsize
+        self.clock = clock
+        self.autostart = autostart  # Start the thread on the first send
+
+        self._queue = deque()  # (event, payload, to, queued_at)
+        self._deferred = {}  # key -> (due, event, payload, to), see send_later()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._emit_lock = threading.Lock()  # One emit at a time, in queue order
+        self._thread = None
+        self._stopping = False
+
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.failures = 0
+        self.high_water_mark = 0
+        self.last_latency = None  # Seconds from send() to the end of the emit
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="broadcaster", daemon=True)
+                self._thread.start()
+
+    def send(self, event, payload, to=None):
+        """Queue an event for the broadcaster thread"""
+        with self._lock:
+            if len(self._queue) >= self.maxsize:
+                self._drop_oldest_position()
+            self._queue.append((event, payload, to, self.clock()))
+            self.high_water_mark = max(self.high_water_mark, len(self._queue))
+            self._wakeup.notify()
+        if self.autostart and self._thread is None:
+            self.start()
+
+    def send_later(self, key, delay, event, payload, to=None):
+        """
+        Queue an event once delay seconds have passed. If an event with the same
+        key is already waiting, it is replaced and keeps its due time.
+        """
+        with self._lock:
+            due = self._deferred[key][0] if key in self._deferred else self.clock() + delay
+            self._deferred[key] = (due, event, payload, to)
+            self._wakeup.notify()
+        if self.autostart and self._thread is None:
+            self.start()
+
+    def cancel(self, key):
+        """Forget the event waiting under key, if it has not been queued yet"""
+        with self._lock:
+            self._deferred.pop(key, None)
+
+    def _queue_due(self):
+        """Move the deferred events that are due to the queue. Returns the seconds until the next one, or None."""
+        now = self.clock()
+        for key, (due, event, payload, to) in sorted(self._deferred.items(), key=lambda item: item[1][0]):
+            if due > now:
+                return due - now
+            del self._deferred[key]
+            self._queue.append((event, payload, to, due))
+            self.high_water_mark = max(self.high_water_mark, len(self._queue))
+        return None
+
+    def _drop_oldest_position(self):
+        """Drop the oldest queued position event, if any (called with the lock held)"""
+        for i, queued in enumerate(self._queue):
+            if queued[0] in DROPPABLE_EVENTS:
+                del self._queue[i]
+                self.dropped += 1
+                return
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._stopping:
+                    next_due = self._queue_due()
+                    if self._queue:
+                        break
+                    self._wakeup.wait(next_due)
+                if self._stopping:
+                    return
+            self._emit_next()
+
+    def _emit_next(self):
+        """Emit the oldest queued event. Returns False if the queue was empty."""
+        with self._emit_lock:
+            with self._lock:
+                if not self._queue:
+                    return False
+                event, payload, to, queued_at = self._queue.popleft()
+            try:
+                self.emit(event, payload, to=to)
+                failed = False
+            except Exception as e:
+                print(f"[ERROR] Failed to broadcast {event}: {str(e)}")
+                failed = True
+            latency = self.clock() - queued_at
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.sent += 1
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self._total_latency += latency
+        return True
+
+    def flush(self):
+        """Emit everything queued now, and the deferred events that are due, in the calling thread"""
+        with self._lock:
+            self._queue_due()
+        while self._emit_next():
+            pass
+
+    def stop(self, timeout=5.0):
+        """Stop the thread and emit what is still queued"""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            done = self.sent + self.failures
+            return {
+                'depth': len(self._queue),
+                'deferred': len(self._deferred),
+                'maxsize': self.maxsize,
+                'high_water_mark': self.high_water_mark,
+                'sent': self.sent,
+                'dropped': self.dropped,
+                'failures': self.failures,
+                'last_latency': self.last_latency,
+                'avg_latency': self._total_latency / done if done else None,
+                'max_latency': self.max_latency,
+            }
@@ -1,9 +1,17 @@
+import sys
+import base64
 import chess
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 import threading
 from getMove import determine_move
-from sqlalchemy import create_engine, Column, String, DateTime, Boolean, Integer, ForeignKey, Text
+from fenParser import ParsedPosition, as_position
+from ingestBuffer import IngestBuffer, OVERFLOW_DROP_OLDEST
+from schemaMigrations import migrate
+from storageProfile import create_storage_engine
+from successorTable import submit_successor_table
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, ForeignKey, Text, Index, bindparam, insert, or_, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker, scoped_session
 
@@ -24,6 +32,10 @@ class ChessMoveModel(Base):
     move_index = Column(Integer, nullable=False)
     
     game = relationship("ChessGameModel", back_populates="moves")
+
+    __table_args__ = (
+        Index('ix_chess_moves_game_id_move_index', 'game_id', 'move_index'),
+    )
     
 class ChessGameModel(Base):
     __tablename__ = 'chess_games'
@@ -37,17 +49,84 @@ class ChessGameModel(Base):
     white = Column(String(100))
     black = Column(String(100))
     result = Column(String(10))
-    created_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
     
     moves = relationship("ChessMoveModel", back_populates="game", order_by="ChessMoveModel.move_index")
 
-# Initialize database connection
-engine = create_engine('sqlite:///chess_games.db')
-Base.metadata.create_all(engine)
+# Values of GameSummaryModel.status
+GAME_STATUS_IN_PROGRESS = "in_progress"
+GAME_STATUS_COMPLETED = "completed"
+
+class GameSummaryModel(Base):
+    """Latest position and ply count of a game, kept up to date by save_to_db"""
+    __tablename__ = 'game_summary'
+
+    id = Column(Integer, primary_key=True)
+    game_id = Column(String(36), ForeignKey('chess_games.game_id'), unique=True, nullable=False)
+    last_fen = Column(String(100))
+    ply_count = Column(Integer, nullable=False)  # Plies after the initial position
+    status = Column(String(20), nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+# Initialize database connection (WAL, tuned pragmas and pooling, see storageProfile)
+engine = create_storage_engine('sqlite:///chess_games.db')
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
 
+def init_db():
+    """Create the tables and bring an existing database up to date (see schemaMigrations); run at server startup"""
+    return migrate(engine, Base.metadata)
+
+def encode_game_cursor(created_at, row_id):
+    """Opaque /games cursor for the position just after the game (created_at, row_id)"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_game_cursor(cursor):
+    """(created_at, row_id) from encode_game_cursor; raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError, TypeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def encode_move(move):
+    """Pack a chess.Move into 15 bits: from | to << 6 | promotion << 12"""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+def decode_move(code):
+    return chess.Move(code & 0x3F, code >> 6 & 0x3F, promotion=(code >> 12) or None)
+
+_SQUARE_INDEX = {name: square for square, name in enumerate(chess.SQUARE_NAMES)}
+_PIECE_INDEX = {symbol: piece for piece, symbol in enumerate(chess.PIECE_SYMBOLS) if symbol}
+
+def encode_uci(uci):
+    """encode_move(chess.Move.from_uci(uci)) for regular moves and promotions, else None"""
+    if isinstance(uci, str) and 4 <= len(uci) <= 5:
+        from_square = _SQUARE_INDEX.get(uci[0:2])
+        to_square = _SQUARE_INDEX.get(uci[2:4])
+        promotion = _PIECE_INDEX.get(uci[4]) if len(uci) == 5 else 0
+        if from_square is not None and to_square is not None and promotion is not None and from_square != to_square:
+            return from_square | to_square << 6 | promotion << 12
+    return None
+
 class ChessMove:
+    """
+    One ply of a game's timeline.
+
+    Stored compactly in __slots__: the move ID as 16 UUID bytes, the timestamp
+    as integer microseconds, the move as a 15-bit code and SAN strings interned.
+    move_id, timestamp, move_obj and uci are exposed as properties with the
+    original types.
+    """
+
+    __slots__ = ("_move_id", "fen", "player", "_timestamp", "algebraic", "_move", "_uci",
+                 "is_legal", "piece_moved")
+
     def __init__(
         self,
         move_id,
@@ -62,15 +141,62 @@ class ChessMove:
     ):
         self.move_id = move_id
         self.fen = fen
-        self.player = player
+        self.player = sys.intern(player) if player else player
         self.timestamp = timestamp
 
-        self.algebraic = algebraic
-        self.uci = uci
+        # SAN strings repeat across plies and games, so share one copy of each
+        self.algebraic = sys.intern(algebraic) if algebraic else algebraic
+        self._uci = None
         self.move_obj = move_obj
+        if move_obj is None and uci is not None:
+            self.uci = uci
         self.is_legal = is_legal
         self.piece_moved = piece_moved
 
+    @property
+    def move_id(self):
+        move_id = self._move_id
+        return str(uuid.UUID(bytes=move_id)) if isinstance(move_id, bytes) else move_id
+
+    @move_id.setter
+    def move_id(self, value):
+        try:
+            parsed = uuid.UUID(value)
+            # Only pack IDs that round-trip exactly (canonical lower-case form)
+            self._move_id = parsed.bytes if str(parsed) == value else value
+        except (ValueError, TypeError, AttributeError):
+            self._move_id = value
+
+    @property
+    def timestamp(self):
+        if self._timestamp is None:
+            return None
+        return _EPOCH + self._timestamp * _MICROSECOND
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = None if value is None else (value - _EPOCH) // _MICROSECOND
+
+    @property
+    def move_obj(self):
+        return None if self._move is None else decode_move(self._move)
+
+    @move_obj.setter
+    def move_obj(self, move):
+        self._move = encode_move(move) if move else None
+
+    @property
+    def uci(self):
+        if self._move is not None:
+            return decode_move(self._move).uci()
+        return self._uci
+
+    @uci.setter
+    def uci(self, value):
+        self._move = encode_uci(value)
+        # Null moves, drops and unparseable values are kept verbatim
+        self._uci = value if self._move is None else None
+
     def __repr__(self):
         legality = "✅" if self.is_legal else "❌" if self.is_legal is not None else "?"
         piece = f"({self.piece_moved})" if self.piece_moved else ""
@@ -78,19 +204,23 @@ class ChessMove:
             return f"{self.player}: {self.algebraic}{piece} ({self.uci}) [{legality}]"
         return f"{self.player}: [unparsed move]{piece} [{legality}]"
 
+    def to_row(self, game_id, move_index):
+        """Column values of the chess_moves row for this move"""
+        return {
+            'move_id': self.move_id,
+            'game_id': game_id,
+            'fen': self.fen,
+            'player': self.player,
+            'timestamp': self.timestamp,
+            'algebraic': self.algebraic,
+            'uci': self.uci,
+            'is_legal': self.is_legal,
+            'move_index': move_index
+        }
+
     def to_model(self, game_id, move_index):
         """Convert ChessMove to database model"""
-        return ChessMoveModel(
-            move_id=self.move_id,
-            game_id=game_id,
-            fen=self.fen,
-            player=self.player,
-            timestamp=self.timestamp,
-            algebraic=self.algebraic,
-            uci=self.uci,
-            is_legal=self.is_legal,
-            move_index=move_index
-        )
+        return ChessMoveModel(**self.to_row(game_id, move_index))
     
     @classmethod
     def from_model(cls, model):
@@ -106,11 +236,39 @@ class ChessMove:
         )
 
 class ChessGame:
-    def __init__(self, game_id):
+    # Defaults for the bounded processing queue (see ingestBuffer)
+    QUEUE_SIZE = 256
+    QUEUE_OVERFLOW_POLICY = OVERFLOW_DROP_OLDEST
+    # Precompute the successors of each accepted position (see successorTable)
+    PRECOMPUTE_SUCCESSORS = True
+    # Called with the game whenever its timeline changes (see persistenceWorker)
+    dirty_listener = None
+    # Called with the game, and deleted=True after a delete, once a save or delete has committed (see gameCache)
+    store_listener = None
+
+    def __init__(self, game_id, queue_size=None, overflow_policy=None, master_state=None):
+        """master_state, if given, is the timeline to start from instead of the initial position"""
         self.game_id = game_id
         self.master_state = []  # list of ChessMove
-        self.processing_queue = []  # list of FENs
-        self.lock = threading.Lock()
+        self.processing_queue = IngestBuffer(  # FENs or ParsedPositions
+            queue_size or self.QUEUE_SIZE,
+            overflow_policy or self.QUEUE_OVERFLOW_POLICY
+        )
+        self.lock = threading.RLock()  # Reentrant: edit helpers call each other while holding it
+        self._move_index = {}  # move_id -> index in master_state, see _index_of
+        # Persistence state, see save_to_db
+        self._save_lock = threading.Lock()
+        self._saved_index = None  # move_id -> move_index of the stored rows; None until known
+        self._dirty_from = 0  # Lowest index changed since the last save, or None
+        self._dirty_ids = set()  # Stored plies whose content was recomputed
+        self._deleted_ids = set()  # Plies removed from master_state since the last save
+        self._saved_summary = None  # (last_fen, ply_count, status) of the stored game_summary row
+        self._live_board = None  # Board of _live_board_move, advanced move by move
+        self._live_board_move = None
+        self._successors = None  # Future of the successor table for _successors_move
+        self._successors_move = None
+        self.successor_hits = 0
+        self.successor_misses = 0
 
         self.event = "Casual Game"
         self.site = "?"
@@ -120,6 +278,11 @@ class ChessGame:
         self.black = "Black"
         self.result = "*"
 
+        if master_state is not None:
+            self.master_state = master_state
+            self._reindex_from(0)
+            return
+
         initial_board = chess.Board()
         initial_fen = initial_board.fen()
 
@@ -136,37 +299,91 @@ class ChessGame:
         )
 
         self.master_state = [initial_move]
-
+        self._reindex_from(0)
 
     def add_to_queue(self, fen):
-        self.processing_queue.append(fen)
+        """Queue a FEN string or a ParsedPosition from fenParser.parse_fen. Returns False if it was dropped."""
+        return self.processing_queue.put(fen)
 
     def get_latest_board(self):
+        """Return the live board of the latest move. Callers must not modify it."""
         if not self.master_state:
             return chess.Board()  # start from default position
-        return chess.Board(self.master_state[-1].fen)
+        latest = self.master_state[-1]
+        if self._live_board_move is not latest:
+            # master_state was edited or loaded; resync from the stored FEN
+            self._live_board = chess.Board(latest.fen)
+            self._live_board_move = latest
+        return self._live_board
+
+    def _advance_live_board(self, new_move, position):
+        """Move the live board to the position of new_move, just appended to master_state"""
+        board = self._live_board
+        in_sync = len(self.master_state) > 1 and self._live_board_move is self.master_state[-2]
+        if board is not None and in_sync and new_move.is_legal:
+            board.push(new_move.move_obj)
+        else:
+            # Illegal or unknown transition: take the position as reported
+            board = position.board
+        self._live_board = board
+        self._live_board_move = new_move
+
+    def _lookup_successor(self, placement):
+        """Return (move, san, is_legal) if placement is one legal move from the latest position"""
+        future = self._successors
+        if future is None or self._successors_move is not self.master_state[-1] or not future.done():
+            return None
+        try:
+            return future.result().get(placement)
+        except Exception as e:
+            print(f"[WARN] Successor table failed: {e}")
+            return None
+
+    def _schedule_successors(self, move, board):
+        """Start building the successor table for the move just appended to master_state"""
+        if not self.PRECOMPUTE_SUCCESSORS:
+            return
+        if self._successors is not None:
+            self._successors.cancel()  # No-op if it is already running
+        self._successors = submit_successor_table(board)
+        self._successors_move = move
 
     def process_queue(self):
-        while self.processing_queue:
-            next_fen = self.processing_queue.pop(0)
+        while True:
+            next_fen = self.processing_queue.get()
+            if next_fen is None:
+                break
             self._process_fen(next_fen)
 
     def _process_fen(self, next_fen):
+        position = as_position(next_fen)
+        next_fen = position.fen
         with self.lock:
-            board_before = self.get_latest_board()
             try:
-                board_after = chess.Board(next_fen)
-                board_after_fen_only = board_after.board_fen()
+                board_after_fen_only = position.placement
             except ValueError as e:
                 print(f"[ERROR] Invalid FEN received in _process_fen: {next_fen} - {e}")
                 return
 
             if self.master_state:
-                last_board_fen = chess.Board(self.master_state[-1].fen).board_fen()
+                last_board_fen = self.master_state[-1].fen.split(' ', 1)[0]
                 if last_board_fen == board_after_fen_only:
                     return
 
-            move_obj, algebraic = determine_move(board_before, board_after)
+            board_before = self.get_latest_board()
+            player = "White" if board_before.turn == chess.WHITE else "Black"
+            successor = self._lookup_successor(board_after_fen_only)
+            if successor:
+                self.successor_hits += 1
+                move_obj, algebraic, is_legal = successor
+            else:
+                self.successor_misses += 1
+                try:
+                    move_obj, algebraic = determine_move(board_before, position)
+                except ValueError as e:
+                    print(f"[ERROR] Invalid FEN received in _process_fen: {next_fen} - {e}")
+                    return
+                is_legal = move_obj is not None and move_obj in board_before.legal_moves
             piece_moved_symbol = None
 
             if move_obj is None:
@@ -174,7 +391,7 @@ class ChessGame:
                 new_move = ChessMove(
                 move_id=str(uuid.uuid4()),
                 fen=next_fen,
-                player="White" if board_before.turn == chess.WHITE else "Black",
+                player=player,
                 timestamp=datetime.now(),
                     is_legal=False,
                     piece_moved=None
@@ -189,21 +406,27 @@ class ChessGame:
                     fen=next_fen,
                     algebraic=algebraic,
                     uci=move_obj.uci(),
-                    player="White" if board_before.turn == chess.WHITE else "Black",
+                    player=player,
                     timestamp=datetime.now(),
                     move_obj=move_obj,
-                    is_legal=move_obj in board_before.legal_moves,
+                    is_legal=is_legal,
                     piece_moved=piece_moved_symbol
                 )
 
             self.master_state.append(new_move)
-
-    def _create_move_from_fen(self, new_fen, board_before):
-        board_after = chess.Board(new_fen)
-        move_obj, algebraic = determine_move(board_before, board_after)
-        move_id = str(uuid.uuid4())
+            self._move_index[new_move.move_id] = len(self.master_state) - 1
+            self._mark_dirty(len(self.master_state) - 1)
+            self._advance_live_board(new_move, position)
+            self._schedule_successors(new_move, self._live_board)
+
+    def _create_move_from_fen(self, new_fen, board_before, move_id=None, timestamp=None):
+        """new_fen may be a FEN string or a ParsedPosition whose board is already built"""
+        position = as_position(new_fen)
+        new_fen = position.fen
+        move_obj, algebraic = determine_move(board_before, position)
+        move_id = move_id or str(uuid.uuid4())
         player = "White" if board_before.turn == chess.WHITE else "Black"
-        timestamp = datetime.now()
+        timestamp = timestamp or datetime.now()
         is_legal = move_obj in board_before.legal_moves if move_obj else False
         piece_moved_symbol = None
         if move_obj:
@@ -223,155 +446,322 @@ class ChessGame:
             piece_moved=piece_moved_symbol
         )
 
+    def _reindex_from(self, index):
+        """Refresh the move_id -> index entries of master_state[index:]"""
+        for i in range(index, len(self.master_state)):
+            self._move_index[self.master_state[i].move_id] = i
+
+    def _index_of(self, move_id):
+        """Index of the move with move_id, or None. Rebuilds the map if master_state was changed directly."""
+        index = self._move_index.get(move_id)
+        if index is not None and index < len(self.master_state) and self.master_state[index].move_id == move_id:
+            return index
+        self._move_index = {}
+        self._reindex_from(0)
+        return self._move_index.get(move_id)
+
+    def _mark_dirty(self, index, move_id=None):
+        """Record that master_state[index:] changed; move_id is a stored ply whose content changed"""
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+        if move_id is not None:
+            self._dirty_ids.add(move_id)
+        if self.dirty_listener is not None:
+            self.dirty_listener(self)
+
     def _replace_move(self, index, new_fen, board_before):
         with self.lock:
             new_move = self._create_move_from_fen(new_fen, board_before)
+            old_id = self.master_state[index].move_id
+            self._move_index.pop(old_id, None)
+            self._deleted_ids.add(old_id)
             self.master_state[index] = new_move
+            self._move_index[new_move.move_id] = index
+            self._mark_dirty(index)
 
     def _insert_move(self, index, new_fen, board_before):
         with self.lock:
             new_move = self._create_move_from_fen(new_fen, board_before)
             self.master_state.insert(index, new_move)
+            self._reindex_from(index)
+            self._mark_dirty(index)
+
+    def _delete_move(self, index):
+        with self.lock:
+            old_id = self.master_state[index].move_id
+            self._move_index.pop(old_id, None)
+            self._deleted_ids.add(old_id)
+            del self.master_state[index]
+            self._reindex_from(index)
+            self._mark_dirty(index)
+
+    @staticmethod
+    def _same_derivation(a, b):
+        """True if two plies of the same FEN were derived to the same move"""
+        return (a.uci == b.uci and a.algebraic == b.algebraic
+                and a.is_legal == b.is_legal and a.player == b.player)
 
     def _reprocess_from(self, index):
+        """
+        Recompute the moves of master_state[index:] until one matches what is stored.
+
+        A ply's move only depends on its own FEN and the previous ply's FEN, so
+        once a recomputed ply matches the stored one, every later ply would too.
+        Recomputed plies keep their move_id and timestamp. Returns the number
+        of plies that were changed.
+        """
         with self.lock:
-            for i in range(index, len(self.master_state)):
-                if i == 0:
-                    continue
-                prev_board = chess.Board(self.master_state[i - 1].fen)
-                new_fen = self.master_state[i].fen
-                self._replace_move(i, new_fen, prev_board)
+            changed = 0
+            board_before = None
+            for i in range(max(index, 1), len(self.master_state)):
+                stored = self.master_state[i]
+                if board_before is None:
+                    board_before = chess.Board(self.master_state[i - 1].fen)
+                # Parse each stored FEN once; its board becomes the next ply's board_before
+                position = ParsedPosition(stored.fen)
+                recomputed = self._create_move_from_fen(position, board_before, stored.move_id, stored.timestamp)
+                if self._same_derivation(stored, recomputed):
+                    break
+                self.master_state[i] = recomputed
+                self._mark_dirty(i, stored.move_id)
+                changed += 1
+                board_before = position.board
+            return changed
 
     def manual_edit(self, new_fen, index=None, move_id=None, action="change"):
         if index is None and move_id is None:
             print("[ERROR] Must specify index or move_id.")
             return
 
-        # Resolve target index
-        if index is None:
-            for i, move in enumerate(self.master_state):
-                if move.move_id == move_id:
-                    index = i
-                    break
-            if not index:
-                print(f"[ERROR] Move with ID {move_id} not found.")
+        with self.lock:
+            # Resolve target index
+            if index is None:
+                index = self._index_of(move_id)
+                if index is None:
+                    print(f"[ERROR] Move with ID {move_id} not found.")
+                    return
+
+            if index == 0:
+                print("[ERROR] Cannot modify the initial board state.")
                 return
 
-        if index == 0:
-            print("[ERROR] Cannot modify the initial board state.")
-            return
+            prev_board = chess.Board(self.master_state[index - 1].fen)
 
-        prev_board = chess.Board(self.master_state[index - 1].fen)
+            if action == "delete":
+                print(f"[INFO] Deleting move at index {index}")
+                self._delete_move(index)
+                # Reprocess the move at this index (previously the next move)
+                if index < len(self.master_state):
+                    self._reprocess_from(index)
+                return
 
-        if action == "delete":
-            print(f"[INFO] Deleting move at index {index}")
-            del self.master_state[index]
-            # Reprocess the move at this index (previously the next move)
-            if index < len(self.master_state):
-                self._reprocess_from(index)
-            return
+            elif action == "change":
+                print(f"[INFO] Changing move at index {index}")
+                self._replace_move(index, new_fen, prev_board)
+                if index + 1 < len(self.master_state):
+                    self._reprocess_from(index + 1)
+                return
 
-        elif action == "change":
-            print(f"[INFO] Changing move at index {index}")
-            self._replace_move(index, new_fen, prev_board)
-            if index + 1 < len(self.master_state):
-                self._reprocess_from(index + 1)
-            return
+            elif action == "insert":
+                print(f"[INFO] Inserting move after index {index}")
+                self._insert_move(index + 1, new_fen, chess.Board(self.master_state[index].fen))
+                if index + 2 < len(self.master_state):
+                    self._reprocess_from(index + 2)
+                return
 
-        elif action == "insert":
-            print(f"[INFO] Inserting move after index {index}")
-            self._insert_move(index + 1, new_fen, prev_board)
-            if index + 2 < len(self.master_state):
-                self._reprocess_from(index + 2)
-            return
+            else:
+                print(f"[ERROR] Unknown action '{action}'")
 
-        else:
-            print(f"[ERROR] Unknown action '{action}'")
+    def _take_dirty_plies(self, saved_index):
+        """
+        Collect the rows to write since the last save and reset the dirty state.
+
+        Returns (inserts, updates, deleted_ids, dirty_state, summary); dirty_state
+        is handed back to _restore_dirty_plies if the save fails.
+        """
+        with self.lock:
+            start = self._dirty_from
+            dirty_ids = self._dirty_ids
+            deleted_ids = self._deleted_ids
+            inserts, updates = [], []
+            if start is not None:
+                for i in range(start, len(self.master_state)):
+                    move = self.master_state[i]
+                    move_id = move.move_id
+                    if move_id not in saved_index:
+                        inserts.append(move.to_row(self.game_id, i))
+                    elif move_id in dirty_ids or saved_index[move_id] != i:
+                        row = move.to_row(self.game_id, i)
+                        row['b_move_id'] = row.pop('move_id')
+                        updates.append(row)
+            self._dirty_from = None
+            self._dirty_ids = set()
+            self._deleted_ids = set()
+            return inserts, updates, deleted_ids, (start, dirty_ids, deleted_ids), self._summary()
+
+    def _summary(self):
+        """(last_fen, ply_count, status) for the game_summary row"""
+        last_fen = self.master_state[-1].fen if self.master_state else None
+        status = GAME_STATUS_IN_PROGRESS if self.result in (None, "*") else GAME_STATUS_COMPLETED
+        return last_fen, max(len(self.master_state) - 1, 0), status
+
+    def _restore_dirty_plies(self, dirty_state):
+        """Merge the dirty state taken by _take_dirty_plies back after a failed save"""
+        start, dirty_ids, deleted_ids = dirty_state
+        with self.lock:
+            if start is not None:
+                self._mark_dirty(start)
+            self._dirty_ids |= dirty_ids
+            self._deleted_ids |= deleted_ids
 
     def save_to_db(self):
-        """Save the game and all its moves to the database"""
-        session = Session()
-        try:
-            # Check if game already exists
-            existing_game = session.query(ChessGameModel).filter_by(game_id=self.game_id).first()
-            
-            if existing_game:
-                # Update existing game record with current values
-                print(f"[DEBUG] Updating existing game: {self.game_id}, new result: {self.result}")
-                existing_game.event = self.event
-                existing_game.site = self.site
-                existing_game.date = self.date
-                existing_game.round = self.round
-                existing_game.white = self.white
-                existing_game.black = self.black
-                existing_game.result = self.result  # Update the result
-                
-                # Delete existing moves for the game
-                session.query(ChessMoveModel).filter_by(game_id=self.game_id).delete()
-            else:
-                # Create new game record
-                print(f"[DEBUG] Creating new game: {self.game_id}, result: {self.result}")
-                game_model = ChessGameModel(
-                    game_id=self.game_id,
-                    event=self.event,
-                    site=self.site,
-                    date=self.date,
-                    round=self.round,
-                    white=self.white,
-                    black=self.black,
-                    result=self.result,
-                    created_at=datetime.now()
-                )
-                session.add(game_model)
-            
-            # Save all moves
-            for i, move in enumerate(self.master_state):
-                move_model = move.to_model(self.game_id, i)
-                session.add(move_model)
-                
-            session.commit()
-            print(f"[INFO] Game {self.game_id} saved to database, result: {self.result}")
-            return True
-        except Exception as e:
-            session.rollback()
-            print(f"[ERROR] Failed to save game to database: {str(e)}")
-            return False
-        finally:
-            session.close()
-    
+        """
+        Save the game and the moves changed since the last save to the database.
+
+        New plies are bulk inserted, recomputed or shifted plies are updated and
+        removed plies are deleted, all in one transaction, so a save costs
+        O(changed plies) rather than O(game length).
+        """
+        with self._save_lock:
+            session = Session()
+            dirty_state = None
+            try:
+                saved_index = self._saved_index
+                if saved_index is None:
+                    # First save of this object: find out which rows are already stored
+                    saved_index = dict(session.query(ChessMoveModel.move_id, ChessMoveModel.move_index)
+                                       .filter_by(game_id=self.game_id).all())
+                    with self.lock:
+                        self._dirty_from = 0
+                        current_ids = {move.move_id for move in self.master_state}
+                        self._deleted_ids |= set(saved_index) - current_ids
+                else:
+                    saved_index = dict(saved_index)
+                inserts, updates, deleted_ids, dirty_state, summary = self._take_dirty_plies(saved_index)
+
+                # Check if game already exists
+                existing_game = session.query(ChessGameModel).filter_by(game_id=self.game_id).first()
+
+                if existing_game:
+                    # Update existing game record with current values
+                    print(f"[DEBUG] Updating existing game: {self.game_id}, new result: {self.result}")
+                    existing_game.event = self.event
+                    existing_game.site = self.site
+                    existing_game.date = self.date
+                    existing_game.round = self.round
+                    existing_game.white = self.white
+                    existing_game.black = self.black
+                    existing_game.result = self.result  # Update the result
+                else:
+                    # Create new game record
+                    print(f"[DEBUG] Creating new game: {self.game_id}, result: {self.result}")
+                    game_model = ChessGameModel(
+                        game_id=self.game_id,
+                        event=self.event,
+                        site=self.site,
+                        date=self.date,
+                        round=self.round,
+                        white=self.white,
+                        black=self.black,
+                        result=self.result,
+                        created_at=datetime.now()
+                    )
+                    session.add(game_model)
+
+                # Save the changed moves
+                deleted = [move_id for move_id in deleted_ids if move_id in saved_index]
+                for start in range(0, len(deleted), 500):  # Stay below SQLite's bound parameter limit
+                    chunk = deleted[start:start + 500]
+                    session.query(ChessMoveModel).filter(ChessMoveModel.move_id.in_(chunk)) \
+                        .delete(synchronize_session=False)
+                if inserts:
+                    session.execute(insert(ChessMoveModel.__table__), inserts)
+                if updates:
+                    table = ChessMoveModel.__table__
+                    session.execute(
+                        table.update().where(table.c.move_id == bindparam('b_move_id')),
+                        updates
+                    )
+
+                # Keep the game's summary row in step with the moves
+                if summary != self._saved_summary:
+                    last_fen, ply_count, status = summary
+                    values = {'last_fen': last_fen, 'ply_count': ply_count, 'status': status,
+                              'updated_at': datetime.now()}
+                    session.execute(
+                        sqlite_insert(GameSummaryModel.__table__)
+                        .values(game_id=self.game_id, **values)
+                        .on_conflict_do_update(index_elements=['game_id'], set_=values)
+                    )
+
+                session.commit()
+                self._saved_summary = summary
+                for move_id in deleted:
+                    del saved_index[move_id]
+                for row in inserts:
+                    saved_index[row['move_id']] = row['move_index']
+                for row in updates:
+                    saved_index[row['b_move_id']] = row['move_index']
+                self._saved_index = saved_index
+                print(f"[INFO] Game {self.game_id} saved to database, result: {self.result} "
+                      f"({len(inserts)} inserted, {len(updates)} updated, {len(deleted)} deleted)")
+                if self.store_listener is not None:
+                    self.store_listener(self)
+                return True
+            except Exception as e:
+                session.rollback()
+                if dirty_state is not None:
+                    self._restore_dirty_plies(dirty_state)
+                print(f"[ERROR] Failed to save game to database: {str(e)}")
+                return False
+            finally:
+                session.close()
+
     @classmethod
     def load_from_db(cls, game_id):
-        """Load a game from the database"""
+        """
+        Load a game from the database.
+
+        Reads plain rows with Core selects (no ORM instances or identity map)
+        and builds the ChessMove timeline straight from them.
+        """
+        games = ChessGameModel.__table__
+        moves = ChessMoveModel.__table__
         session = Session()
         try:
-            game_model = session.query(ChessGameModel).filter_by(game_id=game_id).first()
-            
-            if not game_model:
+            game_row = session.execute(
+                select(games.c.event, games.c.site, games.c.date, games.c.round,
+                       games.c.white, games.c.black, games.c.result)
+                .where(games.c.game_id == game_id)
+            ).first()
+
+            if not game_row:
                 print(f"[ERROR] Game with ID {game_id} not found in database")
                 return None
-                
-            game = cls(game_id)
-            
+
+            # Columns in ChessMove's positional order, then is_legal
+            move_rows = session.execute(
+                select(moves.c.move_id, moves.c.fen, moves.c.player, moves.c.timestamp,
+                       moves.c.algebraic, moves.c.uci, moves.c.is_legal)
+                .where(moves.c.game_id == game_id)
+                .order_by(moves.c.move_index)
+            ).all()
+
+            game = cls(game_id, master_state=[])
+            game.master_state = [
+                ChessMove(move_id, fen, player, timestamp, algebraic, uci, None, is_legal)
+                for move_id, fen, player, timestamp, algebraic, uci, is_legal in move_rows
+            ]
+            # The stored IDs are what move.move_id returns; index them without unpacking
+            game._move_index = {row[0]: i for i, row in enumerate(move_rows)}
+
             # Set game metadata
-            game.event = game_model.event
-            game.site = game_model.site
-            game.date = game_model.date
-            game.round = game_model.round
-            game.white = game_model.white
-            game.black = game_model.black
-            game.result = game_model.result
-            
-            # Load moves
-            move_models = session.query(ChessMoveModel).filter_by(game_id=game_id).order_by(ChessMoveModel.move_index).all()
-            
-            # Clear the default initial move
-            game.master_state = []
-            
-            # Add all moves from database
-            for move_model in move_models:
-                chess_move = ChessMove.from_model(move_model)
-                game.master_state.append(chess_move)
-                
+            game.event, game.site, game.date, game.round, game.white, game.black, game.result = game_row
+
+            game._saved_index = dict(game._move_index)
+            game._dirty_from = None
+            game._saved_summary = game._summary()  # Maintained by every save, so it matches
+
             print(f"[INFO] Game {game_id} loaded from database with {len(game.master_state)} moves")
             return game
         except Exception as e:
@@ -379,30 +769,105 @@ class ChessGame:
             return None
         finally:
             session.close()
-            
+
     @classmethod
     def list_games(cls):
         """List all games in the database"""
+        games = ChessGameModel.__table__
         session = Session()
         try:
-            games = session.query(ChessGameModel).order_by(ChessGameModel.created_at.desc()).all()
-            return [(g.game_id, g.white, g.black, g.date, g.result) for g in games]
+            rows = session.execute(
+                select(games.c.game_id, games.c.white, games.c.black, games.c.date, games.c.result)
+                .order_by(games.c.created_at.desc(), games.c.id.desc())
+            ).all()
+            return [tuple(row) for row in rows]
         except Exception as e:
             print(f"[ERROR] Failed to list games: {str(e)}")
             return []
         finally:
             session.close()
+
+    @classmethod
+    def list_games_page(cls, limit=50, after=None, player=None, result=None, created_from=None, created_to=None):
+        """
+        One page of games, newest first, using keyset pagination on (created_at, id).
+
+        after is the cursor returned with the previous page. player matches
+        white or black exactly; created_from is inclusive and created_to
+        exclusive. Returns (rows, next_cursor), rows being (game_id, white,
+        black, date, result, created_at, ply_count, status) tuples (the
+        last two from game_summary) and next_cursor None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+        games = ChessGameModel.__table__
+        summaries = GameSummaryModel.__table__
+        query = select(games.c.game_id, games.c.white, games.c.black, games.c.date, games.c.result,
+                       games.c.created_at, summaries.c.ply_count, summaries.c.status, games.c.id) \
+            .select_from(games.outerjoin(summaries, summaries.c.game_id == games.c.game_id))
+        if after:
+            query = query.where(tuple_(games.c.created_at, games.c.id) < tuple_(*decode_game_cursor(after)))
+        if player:
+            query = query.where(or_(games.c.white == player, games.c.black == player))
+        if result:
+            query = query.where(games.c.result == result)
+        if created_from:
+            query = query.where(games.c.created_at >= created_from)
+        if created_to:
+            query = query.where(games.c.created_at < created_to)
+        # One extra row tells whether there is a next page
+        query = query.order_by(games.c.created_at.desc(), games.c.id.desc()).limit(limit + 1)
+
+        session = Session()
+        try:
+            rows = session.execute(query).all()
+        finally:
+            session.close()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_game_cursor(rows[-1].created_at, rows[-1].id)
+        return [tuple(row)[:8] for row in rows], next_cursor
+
+    @classmethod
+    def load_summary(cls, game_id):
+        """
+        A game's metadata with its latest position and ply count, read from
+        game_summary without touching chess_moves. Returns a dict or None.
+        """
+        games = ChessGameModel.__table__
+        summaries = GameSummaryModel.__table__
+        session = Session()
+        try:
+            row = session.execute(
+                select(games.c.game_id, games.c.event, games.c.white, games.c.black, games.c.result,
+                       summaries.c.last_fen, summaries.c.ply_count, summaries.c.status, summaries.c.updated_at)
+                .select_from(games.outerjoin(summaries, summaries.c.game_id == games.c.game_id))
+                .where(games.c.game_id == game_id)
+            ).first()
+            return dict(row._mapping) if row else None
+        except Exception as e:
+            print(f"[ERROR] Failed to load game summary: {str(e)}")
+            return None
+        finally:
+            session.close()
             
     def delete_from_db(self):
         """Delete the game from the database"""
         session = Session()
         try:
-            # Delete all moves
+            # Delete all moves and the summary
             session.query(ChessMoveModel).filter_by(game_id=self.game_id).delete()
+            session.query(GameSummaryModel).filter_by(game_id=self.game_id).delete()
             # Delete game
             session.query(ChessGameModel).filter_by(game_id=self.game_id).delete()
             session.commit()
+            with self.lock:
+                self._saved_index = {}  # A later save writes the whole game again
+                self._dirty_from = 0
+                self._saved_summary = None
             print(f"[INFO] Game {self.game_id} deleted from database")
+            if self.store_listener is not None:
+                self.store_listener(self, deleted=True)
             return True
         except Exception as e:
             session.rollback()
@@ -9,19 +9,41 @@ by making educated guesses about missing components.
 import os
 import time
 import chess
+from collections import deque
 from threading import Lock
+from fileWatcher import create_file_watcher
+from serialIngest import split_complete_lines
+
+WHITE_KING = chess.Piece(chess.KING, chess.WHITE)
+BLACK_KING = chess.Piece(chess.KING, chess.BLACK)
+WHITE_ROOK = chess.Piece(chess.ROOK, chess.WHITE)
+BLACK_ROOK = chess.Piece(chess.ROOK, chess.BLACK)
+WHITE_PAWN = chess.Piece(chess.PAWN, chess.WHITE)
+BLACK_PAWN = chess.Piece(chess.PAWN, chess.BLACK)
+# Squares a pawn double move starts from, in the order _complete_fen checks them
+DOUBLE_MOVE_SQUARES = list(chess.SquareSet(chess.BB_RANK_2 | chess.BB_RANK_7))
 
 class ChessFileReader:
     """Reads chess positions from a file and completes partial FENs."""
     
-    def __init__(self, file_path="moves.txt"):
+    def __init__(self, file_path="moves.txt", poll_interval=0.02, use_inotify=True):
         self.file_path = file_path
+        self.poll_interval = poll_interval  # Stat interval used by wait_for_data without inotify
+        self.use_inotify = use_inotify
+        self.watcher = None
         self.is_open = False
         self.lock = Lock()
         self.last_position = None
         self.last_processed_line = 0
-        self.last_file_size = 0
+        self.last_file_size = 0  # Byte offset read up to in the current file
         self.board = chess.Board()  # Keep track of board state
+        self._last_board = None  # chess.BaseBoard of last_position, reused as the next previous board
+        
+        # Tail state: a persistent handle and the lines read but not yet returned
+        self._file = None
+        self._file_id = None  # (st_dev, st_ino) of the open handle, to detect rotation
+        self._pending_lines = deque()
+        self._partial_line = b""
         
         # For tracking missing FEN components
         self.active_color = "w"
@@ -37,80 +59,168 @@ class ChessFileReader:
         if not os.path.exists(self.file_path):
             with open(self.file_path, 'w', encoding='utf-8') as f:
                 f.write("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR\n")
+        if self.use_inotify and self.watcher is None:
+            self.watcher = create_file_watcher(self.file_path)
         return True
         
     def close(self):
         """Close the connection."""
         self.is_open = False
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+        with self.lock:
+            self._close_handle()
         return True
     
     def reset_input_buffer(self):
-        """Simulated buffer reset."""
-        pass
+        """Discard lines that have been read from the file but not returned yet."""
+        with self.lock:
+            self._pending_lines.clear()
+            self._partial_line = b""
     
     @property
     def in_waiting(self):
-        """Check if there are new lines to read."""
-        if not self.is_open or not os.path.exists(self.file_path):
+        """Return the number of complete lines ready to be read."""
+        if not self.is_open:
             return 0
             
-        try:
-            current_size = os.path.getsize(self.file_path)
-            
-            # File was recreated or overwritten (size decreased)
-            if current_size < self.last_file_size:
-                print(f"File was overwritten (size decreased from {self.last_file_size} to {current_size})")
-                self.last_file_size = current_size
-                self.last_processed_line = 0  # Reset the line counter to process from beginning
-                return 1
-                
-            # File has new content
-            if current_size > self.last_file_size:
-                self.last_file_size = current_size
-                return 1  # Indicate there's something to read
-                
-            return 0
-        except Exception as e:
-            print(f"Error checking file size: {e}")
-            return 0
-    
+        with self.lock:
+            try:
+                self._read_new_lines()
+            except Exception as e:
+                print(f"Error checking file for new lines: {e}")
+            return len(self._pending_lines)
+
+    def wait_for_data(self, timeout):
+        """
+        Block until the file changes or the timeout expires.
+
+        Uses the inotify watcher when available, otherwise polls the file size
+        every poll_interval seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while self.is_open:
+            if self._pending_lines:
+                return True
+            try:
+                if os.path.getsize(self.file_path) != self.last_file_size:
+                    return True
+            except OSError:
+                pass  # File may be briefly missing while being recreated
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            watcher = self.watcher
+            if watcher:
+                if watcher.wait(remaining):
+                    return True
+            else:
+                time.sleep(min(self.poll_interval, remaining))
+        return False
+
     def readline(self):
-        """Read the latest position from the file."""
-        if not self.is_open or not os.path.exists(self.file_path):
+        """Read the next position from the file."""
+        if not self.is_open:
             return b""
             
         with self.lock:
             try:
-                # Use a safe reading approach to avoid conflicts with file being written
-                lines = []
-                try:
-                    with open(self.file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                except Exception as e:
-                    print(f"Error reading file: {e}")
-                    return b""
-                
-                if not lines:
+                if not self._pending_lines:
+                    self._read_new_lines()
+                if not self._pending_lines:
                     return b""
                 
-                # If the file has been recreated, reset line counter
-                if self.last_processed_line >= len(lines):
-                    print(f"WARNING: Line counter ({self.last_processed_line}) exceeds file length ({len(lines)}). Resetting to 0.")
-                    self.last_processed_line = 0
+                latest_line = self._pending_lines.popleft()
+                self.last_processed_line += 1
                 
-                # Get the latest line
-                if len(lines) > self.last_processed_line:
-                    latest_line = lines[self.last_processed_line].strip()
-                    print(f"Processing line {self.last_processed_line}: {latest_line}")
-                    self.last_processed_line += 1  # Move to next line for next read
-                    
-                    # Complete the partial FEN
-                    full_fen = self._complete_fen(latest_line)
-                    return full_fen.encode('utf-8')
-                return b""
+                # Complete the partial FEN
+                full_fen = self._complete_fen(latest_line)
+                return full_fen.encode('utf-8')
             except Exception as e:
                 print(f"Error in readline: {e}")
                 return b""
+
+    def read_available(self):
+        """Read every complete position appended to the file since the last read."""
+        if not self.is_open:
+            return []
+            
+        with self.lock:
+            try:
+                self._read_new_lines()
+            except Exception as e:
+                print(f"Error reading file: {e}")
+            
+            positions = []
+            first_line = self.last_processed_line
+            while self._pending_lines:
+                line = self._pending_lines.popleft()
+                self.last_processed_line += 1
+                try:
+                    positions.append(self._complete_fen(line).encode('utf-8'))
+                except Exception as e:
+                    print(f"Error completing line {self.last_processed_line - 1}: {e}")
+            if positions:
+                print(f"Processing lines {first_line}-{self.last_processed_line - 1}")
+            return positions
+
+    def _close_handle(self):
+        if self._file:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self._file_id = None
+
+    def _reset_tail(self):
+        """Start reading the file again from the beginning, dropping what was read from the old one."""
+        self.last_file_size = 0
+        self.last_processed_line = 0
+        self._pending_lines.clear()
+        self._partial_line = b""
+
+    def _read_new_lines(self):
+        """
+        Read the bytes appended since the last call and queue every complete line.
+
+        A trailing line without a newline is kept until the rest of it is written.
+        Truncation (file shrank) and rotation (path now points at a different file)
+        both restart reading from the beginning of the current file.
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return
+
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file is None or (stat.st_ino and file_id != self._file_id):
+            if self._file is not None:
+                print(f"File {self.file_path} was replaced, reading from the beginning")
+                self._reset_tail()
+            self._close_handle()
+            self._file = open(self.file_path, 'rb')
+            self._file_id = file_id
+
+        if stat.st_size < self.last_file_size:
+            print(f"File was overwritten (size decreased from {self.last_file_size} to {stat.st_size})")
+            self._reset_tail()
+
+        if stat.st_size == self.last_file_size:
+            return
+
+        self._file.seek(self.last_file_size)
+        data = self._file.read()
+        self.last_file_size += len(data)
+        if not data:
+            return
+
+        chunks, self._partial_line = split_complete_lines(self._partial_line, data)
+        for chunk in chunks:
+            line = chunk.decode('utf-8', errors='replace').strip()
+            if line:
+                self._pending_lines.append(line)
     
     def _complete_fen(self, partial_fen):
         """
@@ -129,16 +239,19 @@ class ChessFileReader:
         
         # Remember the last position for comparison
         last_position = self.last_position
+        prev_board = self._last_board
         self.last_position = partial_fen
+        self._last_board = None
         
         # If this is the first position, assume standard starting values
         if not last_position:
             # Return standard initial values for a new game
             return f"{partial_fen} w KQkq - 0 1"
         
-        # Analyze the change to determine which side moved
-        prev_board = chess.Board(f"{last_position} {self.active_color} {self.castling_rights} {self.en_passant_target} {self.halfmove_clock} {self.fullmove_number}")
-        new_position = f"{partial_fen} {self.active_color} {self.castling_rights} {self.en_passant_target} {self.halfmove_clock} {self.fullmove_number}"
+        # Analyze the change to determine which side moved. Only piece placements are
+        # compared, so the previous call's board is reused instead of parsing it again.
+        if prev_board is None:
+            prev_board = chess.BaseBoard(last_position)
         
         try:
             # Toggle active color based on whose turn it was in the previous position
@@ -149,31 +262,32 @@ class ChessFileReader:
                 self.fullmove_number += 1
 
             # Analyze castling rights
-            new_board = chess.Board(new_position)
+            new_board = chess.BaseBoard(partial_fen)
+            self._last_board = new_board
             
             # Check for king moves to update castling rights
             # White king should be at e1 (chess.E1) for castling rights
             if 'K' in self.castling_rights or 'Q' in self.castling_rights:
                 white_king_square = chess.E1
-                if new_board.piece_at(white_king_square) != chess.Piece.from_symbol('K'):
+                if new_board.piece_at(white_king_square) != WHITE_KING:
                     # King has moved, remove white castling rights
                     self.castling_rights = self.castling_rights.replace('K', '').replace('Q', '')
             
             # Black king should be at e8 (chess.E8) for castling rights
             if 'k' in self.castling_rights or 'q' in self.castling_rights:
                 black_king_square = chess.E8
-                if new_board.piece_at(black_king_square) != chess.Piece.from_symbol('k'):
+                if new_board.piece_at(black_king_square) != BLACK_KING:
                     # King has moved, remove black castling rights
                     self.castling_rights = self.castling_rights.replace('k', '').replace('q', '')
                 
             # Check for rook moves
-            if 'Q' in self.castling_rights and not new_board.piece_at(chess.A1) == chess.Piece.from_symbol('R'):
+            if 'Q' in self.castling_rights and not new_board.piece_at(chess.A1) == WHITE_ROOK:
                 self.castling_rights = self.castling_rights.replace('Q', '')
-            if 'K' in self.castling_rights and not new_board.piece_at(chess.H1) == chess.Piece.from_symbol('R'):
+            if 'K' in self.castling_rights and not new_board.piece_at(chess.H1) == WHITE_ROOK:
                 self.castling_rights = self.castling_rights.replace('K', '')
-            if 'q' in self.castling_rights and not new_board.piece_at(chess.A8) == chess.Piece.from_symbol('r'):
+            if 'q' in self.castling_rights and not new_board.piece_at(chess.A8) == BLACK_ROOK:
                 self.castling_rights = self.castling_rights.replace('q', '')
-            if 'k' in self.castling_rights and not new_board.piece_at(chess.H8) == chess.Piece.from_symbol('r'):
+            if 'k' in self.castling_rights and not new_board.piece_at(chess.H8) == BLACK_ROOK:
                 self.castling_rights = self.castling_rights.replace('k', '')
                 
             if self.castling_rights == "":
@@ -182,31 +296,30 @@ class ChessFileReader:
             # Detect pawn double moves for en passant
             self.en_passant_target = "-"  # Reset by default
             
-            # Preliminary guess at move - look for missing pieces
-            for i in range(64):
-                square = chess.Square(i)
+            # Preliminary guess at move - look for pawns missing from their starting rows
+            for square in DOUBLE_MOVE_SQUARES:
                 piece_before = prev_board.piece_at(square)
                 piece_after = new_board.piece_at(square)
                 
                 # Check if a pawn disappeared from its starting row
-                if (piece_before == chess.Piece.from_symbol('P') and 
+                if (piece_before == WHITE_PAWN and 
                     (chess.square_rank(square) == 1) and 
                     piece_after is None):
                     # Look two squares ahead for the pawn
                     two_ahead = chess.square(chess.square_file(square), 3)
-                    if new_board.piece_at(two_ahead) == chess.Piece.from_symbol('P'):
+                    if new_board.piece_at(two_ahead) == WHITE_PAWN:
                         # Set en passant target to the square in between
                         self.en_passant_target = chess.square_name(
                             chess.square(chess.square_file(square), 2)
                         )
                         break
                         
-                if (piece_before == chess.Piece.from_symbol('p') and 
+                if (piece_before == BLACK_PAWN and 
                     (chess.square_rank(square) == 6) and 
                     piece_after is None):
                     # Look two squares ahead for the pawn
                     two_ahead = chess.square(chess.square_file(square), 4)
-                    if new_board.piece_at(two_ahead) == chess.Piece.from_symbol('p'):
+                    if new_board.piece_at(two_ahead) == BLACK_PAWN:
                         # Set en passant target to the square in between
                         self.en_passant_target = chess.square_name(
                             chess.square(chess.square_file(square), 5)
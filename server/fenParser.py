@@ -0,0 +1,124 @@
+"""
+FEN Parser
+
+Single-pass validation of FEN lines from the hardware. A valid line yields a
+ParsedPosition that carries the piece placement and builds its chess.Board at
+most once, so the ingest loop, ChessGame and determine_move can all share it
+instead of re-parsing the FEN string.
+"""
+
+import chess
+
+CASTLING_CHARS = "KQkq"
+
+# Squares covered by each placement character; empty-square digits are negative to tell them apart
+_SQUARES = {char: 1 for char in "pnbrqkPNBRQK"}
+_SQUARES.update({str(n): -n for n in range(1, 9)})
+
+class ParsedPosition:
+    """A FEN string together with its piece placement and (lazily) its board."""
+
+    __slots__ = ("fen", "_placement", "_board")
+
+    def __init__(self, fen, placement=None, board=None):
+        self.fen = fen
+        self._placement = placement  # Canonical placement, if already validated
+        self._board = board
+
+    @property
+    def board(self):
+        """The chess.Board for this position. Raises ValueError if the FEN is invalid."""
+        if self._board is None:
+            self._board = chess.Board(self.fen)
+        return self._board
+
+    @property
+    def placement(self):
+        """The piece placement field, equal to board.board_fen()."""
+        if self._placement is None:
+            self._placement = self.board.board_fen()
+        return self._placement
+
+    def __repr__(self):
+        return f"ParsedPosition({self.fen!r})"
+
+
+def as_position(fen):
+    """Wrap a FEN string in a ParsedPosition (without validating it); positions pass through."""
+    if isinstance(fen, ParsedPosition):
+        return fen
+    return ParsedPosition(fen)
+
+
+def _check_placement(placement):
+    """Return None if the placement has 8 ranks of 8 squares each, or the reason it does not."""
+    squares_of = _SQUARES.get
+    ranks = 1
+    squares = 0
+    after_digit = False
+    for char in placement:
+        count = squares_of(char)
+        if count is None:
+            if char != "/":
+                return "unexpected character in piece placement"
+            if squares != 8:
+                return f"rank {ranks} has {squares} squares"
+            ranks += 1
+            squares = 0
+            after_digit = False
+        elif count > 0:
+            squares += 1
+            after_digit = False
+        elif after_digit:
+            return "consecutive empty-square counts"
+        else:
+            squares -= count
+            after_digit = True
+    if ranks != 8:
+        return f"wrong number of rows ({ranks})"
+    if squares != 8:
+        return f"rank {ranks} has {squares} squares"
+    return None
+
+
+def _check_castling(castling):
+    if castling == "-":
+        return None
+    position = -1
+    for char in castling:
+        index = CASTLING_CHARS.find(char)
+        if index <= position:  # Unknown, repeated or out of order
+            return f"invalid castling rights {castling!r}"
+        position = index
+    return None
+
+
+def parse_fen(line):
+    """
+    Validate a full six-field FEN line in a single pass.
+
+    Returns (ParsedPosition, None) if the line is valid, or (None, reason).
+    """
+    fields = line.split(" ")
+    if len(fields) != 6:
+        return None, f"expected 6 fields, got {len(fields)}"
+
+    placement, turn, castling, en_passant, halfmove, fullmove = fields
+
+    error = _check_placement(placement)
+    if error:
+        return None, error
+    if turn != "w" and turn != "b":
+        return None, f"invalid side to move {turn!r}"
+    error = _check_castling(castling)
+    if error:
+        return None, error
+    if en_passant != "-" and not (
+        len(en_passant) == 2 and "a" <= en_passant[0] <= "h" and en_passant[1] in "36"
+    ):
+        return None, f"invalid en passant square {en_passant!r}"
+    counters = halfmove + fullmove
+    if not (counters.isascii() and halfmove.isdigit() and fullmove.isdigit()):
+        return None, "move counters must be numbers"
+
+    return ParsedPosition(line, placement), None
@@ -0,0 +1,119 @@
+"""
+File Change Watcher
+
+Wakes file-based board readers when their moves file is written. On Linux this
+uses inotify (through ctypes, no extra dependency). Elsewhere, or if inotify is
+unavailable, create_file_watcher() returns None and callers fall back to
+polling the file with os.stat.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc = libc
+    return _libc
+
+
+class InotifyWatcher:
+    """Watches the directory containing a file and reports changes to that file."""
+
+    def __init__(self, file_path):
+        libc = _load_libc()
+        path = os.path.abspath(file_path)
+        self.directory = os.path.dirname(path)
+        self.file_name = os.fsencode(os.path.basename(path))
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch the directory rather than the file so that recreation and
+        # rotation (a new file moved over the old path) are seen too
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(self.directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {self.directory}")
+
+    def wait(self, timeout):
+        """Block until the watched file changes. Returns False on timeout."""
+        if self.fd is None:
+            return False
+        try:
+            ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        except (OSError, ValueError):
+            return False
+        return bool(ready) and self._drain()
+
+    def _drain(self):
+        """Read all queued events, returning True if any concern the watched file."""
+        relevant = False
+        while True:
+            fd = self.fd
+            if fd is None:
+                break  # close() ran while wait() was in progress
+            try:
+                buffer = os.read(fd, 4096)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EBADF):
+                    break  # No more events, or the descriptor was closed under us
+                raise
+            if not buffer:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+                start = offset + _EVENT_HEADER.size
+                name = buffer[start:start + name_len].rstrip(b"\0")
+                if name == self.file_name:
+                    relevant = True
+                offset = start + name_len
+        return relevant
+
+    def close(self):
+        if self.fd is not None:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = None
+
+
+def create_file_watcher(file_path):
+    """Return an InotifyWatcher for file_path, or None if inotify is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher(file_path)
+    except (OSError, AttributeError) as e:
+        print(f"inotify unavailable, falling back to polling {file_path}: {e}")
+        return None
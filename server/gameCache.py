@@ -0,0 +1,121 @@
+"""
+Game Cache
+
+Process-wide LRU cache of loaded ChessGame instances, so the Socket.IO and
+REST handlers that look a game up by ID (simulated input, game state, GET
+/games/<id>) work on one instance in memory instead of reloading the whole
+game from SQLite on every request.
+
+The cache is bounded by a number of games and a total number of plies (a
+stand-in for memory, since a game's size is dominated by its timeline); the
+least recently used games are evicted first. It is kept in step with the
+database write-through: ChessGame calls its store_listener after every
+successful save or delete, and the cache then holds the saved instance or
+drops the deleted one, so it never serves a copy older than the database.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class GameCache:
+    def __init__(self, loader, max_games=64, max_plies=50000):
+        """loader(game_id) returns the game loaded from the database, or None (ChessGame.load_from_db)"""
+        self.max_games = max_games
+        self.max_plies = max_plies
+        self.loader = loader
+        self._games = OrderedDict()  # game_id -> game, least recently used first
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, game_id):
+        """The cached game, loading it on a miss. Returns None if it does not exist."""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is not None:
+                self._games.move_to_end(game_id)
+                self.hits += 1
+                return game
+            self.misses += 1
+
+        game = self.loader(game_id)  # Outside the lock: other lookups need not wait on SQLite
+        if game is None:
+            return None
+        with self._lock:
+            # Another thread may have cached it meanwhile; keep one instance per game
+            cached = self._games.get(game_id)
+            if cached is not None:
+                self._games.move_to_end(game_id)
+                return cached
+            self._games[game_id] = game
+            self._evict()
+        return game
+
+    def peek(self, game_id):
+        """The cached game or None, without loading it"""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                self.misses += 1
+                return None
+            self._games.move_to_end(game_id)
+            self.hits += 1
+            return game
+
+    def put(self, game):
+        """Cache game as the most recently used instance of its ID"""
+        with self._lock:
+            self._games[game.game_id] = game
+            self._games.move_to_end(game.game_id)
+            self._evict()
+
+    def invalidate(self, game_id):
+        with self._lock:
+            if self._games.pop(game_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._games.clear()
+
+    def on_stored(self, game, deleted=False):
+        """ChessGame.store_listener: game was just saved to, or deleted from, the database"""
+        if deleted:
+            self.invalidate(game.game_id)
+            return
+        with self._lock:
+            cached = self._games.get(game.game_id)
+            if cached is not None and cached is not game:
+                self.invalidations += 1  # A stale copy is replaced by the instance just saved
+            self._games[game.game_id] = game
+            self._games.move_to_end(game.game_id)
+            self._evict()
+
+    def _plies(self):
+        return sum(len(game.master_state) for game in self._games.values())
+
+    def _evict(self):
+        """Drop least recently used games until both budgets are met, keeping at least the newest"""
+        while len(self._games) > 1 and (len(self._games) > self.max_games or self._plies() > self.max_plies):
+            self._games.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'games': len(self._games),
+                'plies': self._plies(),
+                'max_games': self.max_games,
+                'max_plies': self.max_plies,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
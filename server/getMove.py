@@ -1,17 +1,42 @@
 import chess
+from fenParser import ParsedPosition
 
-def determine_move(board_before: chess.Board, board_after: chess.Board):
-    changed = [sq for sq in range(64) if board_before.piece_at(sq) != board_after.piece_at(sq)]
+def _piece_masks(board: chess.Board):
+    """The bitboards that together fully describe a board's piece placement"""
+    return (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+            board.occupied_co[chess.WHITE])
+
+def changed_squares_mask(board_before: chess.Board, board_after: chess.Board):
+    """Bitmask of the squares whose piece (type or colour) differs between the boards"""
+    mask = 0
+    for before, after in zip(_piece_masks(board_before), _piece_masks(board_after)):
+        mask |= before ^ after
+    return mask
+
+def determine_move(board_before: chess.Board, board_after):
+    """board_after may be a chess.Board or a fenParser.ParsedPosition (reusing its parsed board)"""
+    if isinstance(board_after, ParsedPosition):
+        board_after = board_after.board
+
+    changed_mask = changed_squares_mask(board_before, board_after)
+    changed = list(chess.SquareSet(changed_mask))
 
     # Disallow ambiguous changes
     if len(changed) < 2 or len(changed) > 4:
         return None, "(ambiguous or unsupported change)"
 
-    # Check legal moves first, including e.p. and castling
-    for move in board_before.legal_moves:
-        temp_board = board_before.copy()
+    # Check legal moves first, including e.p. and castling. A move can only
+    # produce board_after if both its from and to squares changed, so only
+    # those candidates are played out and compared bitboard by bitboard.
+    target = _piece_masks(board_after)
+    temp_board = None
+    for move in board_before.generate_legal_moves(changed_mask, changed_mask):
+        if temp_board is None:
+            temp_board = board_before.copy(stack=False)
         temp_board.push(move)
-        if temp_board.board_fen() == board_after.board_fen():
+        matches = _piece_masks(temp_board) == target
+        temp_board.pop()
+        if matches:
             try:
                 san = board_before.san(move)
             except:
@@ -0,0 +1,104 @@
+"""
+Ingest Buffer
+
+A bounded, thread-safe FIFO between the hardware reader and game processing.
+When the buffer is full, the overflow policy decides what happens:
+
+- block:       put() waits for room (up to block_timeout), then drops the new item
+- drop_oldest: the oldest queued item is discarded to make room
+- latest_only: everything queued is discarded, only the newest item is kept
+
+The buffer keeps its current depth, high-water mark and drop counts so that a
+misbehaving board shows up in the metrics instead of in memory use.
+"""
+
+import threading
+from collections import deque
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_LATEST_ONLY = "latest_only"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_LATEST_ONLY)
+
+
+class IngestBuffer:
+    def __init__(self, maxsize=256, policy=OVERFLOW_DROP_OLDEST, block_timeout=1.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+
+        # Metrics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.high_water_mark = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def full(self):
+        return len(self._items) >= self.maxsize
+
+    def put(self, item, timeout=None):
+        """
+        Add an item, applying the overflow policy if the buffer is full.
+
+        Returns False if the item itself was dropped (block policy timed out).
+        """
+        with self._lock:
+            if len(self._items) >= self.maxsize:
+                if self.policy == OVERFLOW_BLOCK:
+                    timeout = self.block_timeout if timeout is None else timeout
+                    if not self._not_full.wait_for(lambda: len(self._items) < self.maxsize, timeout):
+                        self.dropped += 1
+                        return False
+                elif self.policy == OVERFLOW_DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:  # OVERFLOW_LATEST_ONLY
+                    self.dropped += len(self._items)
+                    self._items.clear()
+
+            self._items.append(item)
+            self.enqueued += 1
+            if len(self._items) > self.high_water_mark:
+                self.high_water_mark = len(self._items)
+            return True
+
+    def get(self):
+        """Remove and return the oldest item, or None if the buffer is empty."""
+        with self._lock:
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self.dequeued += 1
+            self._not_full.notify()
+            return item
+
+    def drain(self):
+        """Remove and return every queued item, oldest first."""
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+            self.dequeued += len(items)
+            self._not_full.notify_all()
+            return items
+
+    def stats(self):
+        return {
+            'depth': len(self._items),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            'high_water_mark': self.high_water_mark,
+            'enqueued': self.enqueued,
+            'dequeued': self.dequeued,
+            'dropped': self.dropped,
+        }
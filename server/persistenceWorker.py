@@ -0,0 +1,139 @@
+"""
+Persistence Worker
+
+Write-behind saving for games that change while they are being played.
+ChessGame calls its dirty_listener whenever its timeline changes; the worker
+records the game and saves it from a background thread, so the ingest and
+emit paths never wait on SQLite.
+
+Bursts of changes are coalesced: a game is saved once it has been quiet for
+`flush_interval` seconds, but never later than `max_lag` seconds after its
+first unsaved change, which bounds how much a crash can lose. stop() saves
+whatever is still pending.
+"""
+
+import threading
+import time
+
+
+class PersistenceWorker:
+    def __init__(self, flush_interval=1.0, max_lag=5.0, clock=time.monotonic, autostart=True):
+        self.flush_interval = flush_interval
+        self.max_lag = max(max_lag, flush_interval)
+        self.clock = clock
+
+        self._pending = {}  # game_id -> [game, first_change, last_change, retry_at]
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._stopping = False
+        self.autostart = autostart  # Start the thread on the first notification
+
+        # Metrics
+        self.notifications = 0
+        self.saves = 0
+        self.failures = 0
+        self.last_lag = None  # Seconds from the first unsaved change to the save that wrote it
+        self.max_lag_seen = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+                self._thread.start()
+
+    def notify(self, game, immediate=False):
+        """Record that game has unsaved changes. immediate saves it without waiting out the interval."""
+        now = self.clock()
+        with self._lock:
+            entry = self._pending.get(game.game_id)
+            if entry is None:
+                entry = self._pending[game.game_id] = [game, now, now, None]
+            else:
+                entry[0] = game
+                entry[2] = now
+            if immediate:
+                entry[2] = now - self.flush_interval  # Due now
+                entry[3] = None
+            self.notifications += 1
+            self._wakeup.notify()
+        if self.autostart and self._thread is None:
+            self.start()
+
+    def _next_due(self, now):
+        """(due game_ids, seconds until the next entry is due or None)"""
+        due = []
+        wait = None
+        for game_id, (_, first_change, last_change, retry_at) in self._pending.items():
+            ready_at = min(last_change + self.flush_interval, first_change + self.max_lag)
+            if retry_at is not None:
+                ready_at = max(ready_at, retry_at)
+            if ready_at <= now:
+                due.append(game_id)
+            elif wait is None or ready_at - now < wait:
+                wait = ready_at - now
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while True:
+                    if self._stopping:
+                        return
+                    due, wait = self._next_due(self.clock())
+                    if due:
+                        break
+                    self._wakeup.wait(wait)
+                entries = [self._pending.pop(game_id) for game_id in due]
+            for entry in entries:
+                self._save(entry)
+
+    def _save(self, entry):
+        game, first_change = entry[0], entry[1]
+        if game.save_to_db():
+            lag = self.clock() - first_change
+            with self._lock:
+                self.saves += 1
+                self.last_lag = lag
+                self.max_lag_seen = max(self.max_lag_seen, lag)
+            return True
+
+        # Retry after another interval, keeping the original first change
+        with self._lock:
+            self.failures += 1
+            pending = self._pending.setdefault(game.game_id, [game, first_change, first_change, None])
+            pending[1] = min(pending[1], first_change)
+            pending[3] = self.clock() + self.flush_interval
+        return False
+
+    def flush(self):
+        """Save every pending game now, in the calling thread. Returns False if a save failed."""
+        with self._lock:
+            entries = list(self._pending.values())
+            self._pending.clear()
+        return all([self._save(entry) for entry in entries])
+
+    def stop(self, timeout=5.0):
+        """Stop the worker thread and save what is still pending."""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        return self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'flush_interval': self.flush_interval,
+                'max_lag': self.max_lag,
+                'notifications': self.notifications,
+                'saves': self.saves,
+                'failures': self.failures,
+                'last_lag': self.last_lag,
+                'max_lag_seen': self.max_lag_seen,
+            }
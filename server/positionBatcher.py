@@ -0,0 +1,80 @@
+"""
+Position Batcher
+
+Coalesces the plies produced by the ingest loop into batches, so a burst (a
+backlog after a reconnect, a file replay) goes out as a few `positions`
+events instead of one `position` event per ply.
+
+Plies are grouped per game. A batch is released as soon as it holds
+`max_size` plies, or once its oldest ply has waited `max_delay` seconds;
+with a max_delay of 0 everything added in one processing pass is released
+by the poll() at the end of that pass.
+"""
+
+import time
+
+
+class PositionBatcher:
+    def __init__(self, max_size=32, max_delay=0.0, clock=time.monotonic):
+        self.max_size = max(1, max_size)
+        self.max_delay = max_delay  # Seconds; 0 releases the plies of each pass together
+        self.clock = clock
+
+        self._pending = {}  # game_id -> (time of the oldest ply, [(index, move)])
+
+        # Counters
+        self.plies = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def add(self, game_id, plies, now=None):
+        """
+        Queue (index, move) plies of a game.
+
+        Returns the batches that reached max_size, as (game_id, plies) pairs.
+        """
+        now = self.clock() if now is None else now
+        ready = []
+        for ply in plies:
+            entry = self._pending.get(game_id)
+            if entry is None:
+                entry = self._pending[game_id] = (now, [])
+            entry[1].append(ply)
+            self.plies += 1
+            if len(entry[1]) >= self.max_size:
+                ready.append(self._release(game_id))
+        return ready
+
+    def poll(self, now=None):
+        """Release the batches whose oldest ply has waited max_delay seconds."""
+        now = self.clock() if now is None else now
+        due = [game_id for game_id, (since, _) in self._pending.items() if now - since >= self.max_delay]
+        return [self._release(game_id) for game_id in due]
+
+    def flush(self):
+        """Release every pending batch."""
+        return [self._release(game_id) for game_id in list(self._pending)]
+
+    def time_until_due(self, now=None):
+        """Seconds until poll() could release a batch, or None if nothing is pending."""
+        if not self._pending:
+            return None
+        now = self.clock() if now is None else now
+        oldest = min(since for since, _ in self._pending.values())
+        return max(0.0, oldest + self.max_delay - now)
+
+    def _release(self, game_id):
+        _, plies = self._pending.pop(game_id)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(plies))
+        return game_id, plies
+
+    def stats(self):
+        return {
+            'pending': sum(len(plies) for _, plies in self._pending.values()),
+            'max_size': self.max_size,
+            'max_delay': self.max_delay,
+            'plies': self.plies,
+            'batches': self.batches,
+            'largest_batch': self.largest_batch,
+        }
@@ -0,0 +1,106 @@
+"""
+Position Encoder
+
+Builds the payload of `position` events in one place, in the format each
+client negotiated on connect:
+
+- "full" (the default): the verbose JSON object with the FEN, SAN, player,
+  piece and squares of the ply.
+- "compact": a delta for clients that track the board themselves. It carries
+  the game `g` (the short alias the server acknowledged in `joined_game`
+  rather than the 36-character ID), the ply index `n`, the move `m` packed by
+  chessClass.encode_uci (from | to << 6 | promotion << 12, at most 15 bits)
+  and a bit mask of flags `f`. The FEN is only sent on keyframes, which are
+  every KEYFRAME_INTERVAL plies, plies without a move (the client cannot
+  apply them) and replies to an explicit request.
+
+Position events sent to a game's room also carry the game's change counter
+(`seq`, compact `s`, see positionLog) so a viewer can tell it missed one.
+`positions` batches carry the seq of their last ply and the seq they follow
+(`prevSeq`, compact `ps`), since the plies of a catch-up need not be
+consecutive changes.
+"""
+
+from chessClass import encode_uci
+
+FORMAT_FULL = "full"
+FORMAT_COMPACT = "compact"
+FORMATS = (FORMAT_FULL, FORMAT_COMPACT)
+
+KEYFRAME_INTERVAL = 20  # Plies between FENs in the compact format
+
+# Compact flags
+FLAG_ILLEGAL = 1  # The ply is not a legal move from the previous position
+FLAG_BLACK = 2  # Black made the move
+
+
+def full_position(game_id, move, index, seq=None):
+    """The verbose payload of ply `index` (a ChessMove) of a game"""
+    uci = move.uci
+    payload = {
+        'type': 'position',
+        'gameId': game_id,
+        'fen': move.fen,
+        'moveNumber': index,
+        'player': move.player,
+        'algebraic': move.algebraic,
+        'isLegal': move.is_legal,
+        'piece_moved': move.piece_moved,
+        'from_square': uci[0:2] if uci else None,
+        'to_square': uci[2:4] if uci else None
+    }
+    if seq is not None:
+        payload['seq'] = seq
+    return payload
+
+
+def compact_position(game_ref, move, index, keyframe=False, seq=None):
+    """The compact payload of ply `index`, game_ref being the game's alias; keyframe forces the FEN"""
+    code = encode_uci(move.uci)
+    flags = 0
+    if move.is_legal is False:
+        flags |= FLAG_ILLEGAL
+    if move.player == "Black":
+        flags |= FLAG_BLACK
+    payload = {'g': game_ref, 'n': index, 'm': code, 'f': flags}
+    if keyframe or code is None or index % KEYFRAME_INTERVAL == 0:
+        payload['fen'] = move.fen
+    if seq is not None:
+        payload['s'] = seq
+    return payload
+
+
+def encode_position(game_id, move, index, fmt=FORMAT_FULL, keyframe=False, alias=None, seq=None):
+    """The payload of ply `index` in format fmt; the compact format refers to the game by alias if given"""
+    if fmt == FORMAT_COMPACT:
+        return compact_position(game_id if alias is None else alias, move, index, keyframe, seq)
+    return full_position(game_id, move, index, seq)
+
+
+def encode_batch(game_id, plies, fmt=FORMAT_FULL, alias=None, seq=None, prev_seq=None):
+    """
+    The payload of a `positions` event for (index, move) plies of one game.
+
+    The full format wraps the full payloads; the compact one names the game
+    once in `g` and lists the compact payloads without it in `p`. seq and
+    prev_seq, if given, are the seq of the last ply and the one before the first.
+    """
+    if fmt == FORMAT_COMPACT:
+        game_ref = game_id if alias is None else alias
+        items = []
+        for index, move in plies:
+            payload = compact_position(game_ref, move, index)
+            del payload['g']
+            items.append(payload)
+        batch = {'g': game_ref, 'p': items}
+        if seq is not None:
+            batch.update({'s': seq, 'ps': prev_seq})
+        return batch
+    batch = {
+        'type': 'positions',
+        'gameId': game_id,
+        'positions': [full_position(game_id, move, index) for index, move in plies]
+    }
+    if seq is not None:
+        batch.update({'seq': seq, 'prevSeq': prev_seq})
+    return batch
@@ -0,0 +1,103 @@
+"""
+Position Log
+
+Keeps the last `capacity` plies sent for each game in a ring buffer, so a
+viewer that reconnects or joins late can be sent just the changes it missed
+instead of fetching the whole game.
+
+The sequence number (`seq`) of a position event is a per-game counter bumped
+for every ply sent, whether it extends the game or rewrites an earlier ply
+(a manual edit sends a ply that already exists, so its index alone would not
+tell a viewer it changed). The counters start again when the server
+restarts, so they are only comparable within one `epoch`, a token drawn when
+the log is created; a resume from another epoch gets a snapshot. since()
+answers a `resume` from the buffer when it still holds every change after the
+client's last one, and returns None otherwise so the caller falls back to a
+snapshot of the whole game. Only the most recently active `max_games` games
+keep a buffer.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict, deque
+
+
+class _GameBuffer:
+    __slots__ = ('plies', 'floor')
+
+    def __init__(self, capacity, floor):
+        self.plies = deque(maxlen=capacity)  # (seq, index, move), oldest first
+        self.floor = floor  # Seq of the last change the buffer no longer holds
+
+
+class PositionLog:
+    def __init__(self, capacity=256, max_games=64):
+        self.capacity = capacity
+        self.max_games = max_games
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seqs = {}  # game_id -> seq of its last change, kept after its buffer is dropped
+        self._games = OrderedDict()  # game_id -> _GameBuffer, least recently active first
+        self._lock = threading.Lock()
+
+        # Counters
+        self.recorded = 0
+        self.resumes = 0  # Answered from the buffer
+        self.snapshots = 0  # Gap larger than the buffer
+
+    def record(self, game_id, plies):
+        """
+        Append (index, move) plies sent for a game and return the seq of the last.
+
+        A ply at or before the last one rewinds the buffer: the plies after it
+        are superseded, and a viewer catching up gets the new ply instead.
+        """
+        with self._lock:
+            seq = self._seqs.get(game_id, 0)
+            buffer = self._games.get(game_id)
+            if buffer is None:
+                buffer = self._games[game_id] = _GameBuffer(self.capacity, seq)
+                if len(self._games) > self.max_games:
+                    self._games.popitem(last=False)
+            else:
+                self._games.move_to_end(game_id)
+            for index, move in plies:
+                while buffer.plies and buffer.plies[-1][1] >= index:
+                    buffer.plies.pop()  # The timeline was edited back to this ply
+                if len(buffer.plies) == self.capacity:
+                    buffer.floor = buffer.plies[0][0]  # About to fall out of the ring
+                seq += 1
+                buffer.plies.append((seq, index, move))
+                self.recorded += 1
+            self._seqs[game_id] = seq
+            return seq
+
+    def current_seq(self, game_id):
+        """The seq of the last change sent for a game, 0 if none was"""
+        with self._lock:
+            return self._seqs.get(game_id, 0)
+
+    def since(self, game_id, last_seq, latest_seq):
+        """
+        The (index, move) plies changed after last_seq up to latest_seq, in the
+        order they were sent, or None if the buffer no longer holds them all.
+        """
+        with self._lock:
+            if last_seq == latest_seq:
+                self.resumes += 1
+                return []
+            buffer = self._games.get(game_id)
+            if buffer is None or not buffer.floor <= last_seq < latest_seq:
+                self.snapshots += 1
+                return None
+            self.resumes += 1
+            return [(index, move) for seq, index, move in buffer.plies if last_seq < seq <= latest_seq]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'games': len(self._games),
+                'capacity': self.capacity,
+                'recorded': self.recorded,
+                'resumes': self.resumes,
+                'snapshots': self.snapshots,
+            }
@@ -0,0 +1,137 @@
+"""
+Position Stabilizer
+
+Debounces positions coming from the board before they reach ChessGame. While a
+piece is being lifted or slid the sensors report transient positions, and the
+file reader often repeats the same frame. A position is only forwarded once it
+has been seen in `min_frames` consecutive frames, or has stayed unchanged for
+`window` seconds; everything else is counted and dropped.
+
+Every line of a moves file is a position that was recorded, not a sensor
+frame, but a file replay reads many of them at once. For such reads
+feed_batch(buffered=True) forwards a position that a different one follows
+in the same read instead of taking it for flicker, and only the last
+position waits to become stable. Serial frames that piled up while the
+reader was busy are still debounced frame by frame.
+"""
+
+import time
+
+
+class PositionStabilizer:
+    def __init__(self, min_frames=2, window=0.15, clock=time.monotonic):
+        self.min_frames = min_frames  # 1 (or less) forwards every change immediately
+        self.window = window          # Seconds; 0 disables the time criterion
+        self.clock = clock
+
+        self._last_forwarded = None   # Placement of the last forwarded position
+        self._candidate = None        # Latest position that differs from it
+        self._candidate_frames = 0
+        self._candidate_since = None
+
+        # Counters
+        self.frames_in = 0
+        self.forwarded = 0
+        self.suppressed_duplicates = 0  # Repeats of the last forwarded position
+        self.suppressed_transients = 0  # Positions replaced before becoming stable
+
+    @property
+    def enabled(self):
+        return self.min_frames > 1
+
+    def feed(self, position, now=None, superseded=False):
+        """
+        Take one validated frame (a fenParser.ParsedPosition).
+
+        superseded: a different position follows this one in a read of recorded
+        positions, so it is forwarded without waiting to become stable.
+
+        Returns the list of positions to forward, which is empty or holds one position.
+        """
+        now = self.clock() if now is None else now
+        self.frames_in += 1
+        placement = position.placement
+
+        if self._candidate is not None and placement == self._candidate.placement:
+            self._candidate = position  # Keep the newest full FEN for this placement
+            self._candidate_frames += 1
+            return self._forward_if_stable(now, superseded)
+
+        if self._candidate is not None:
+            # The pending position changed before it was stable
+            self.suppressed_transients += 1
+            self._candidate = None
+
+        if placement == self._last_forwarded:
+            self.suppressed_duplicates += 1
+            return []
+
+        self._candidate = position
+        self._candidate_frames = 1
+        self._candidate_since = now
+        return self._forward_if_stable(now, superseded)
+
+    def feed_batch(self, positions, now=None, buffered=False):
+        """
+        Take the frames of one read, in order. Returns the positions to forward.
+
+        buffered: the frames are recorded positions (a moves file), so one that a
+        different position follows in the same read is not flicker.
+        """
+        now = self.clock() if now is None else now
+        # A frame is superseded if a different position comes after it in this read
+        superseded = [False] * len(positions)
+        if buffered:
+            for i in range(len(positions) - 2, -1, -1):
+                superseded[i] = superseded[i + 1] or positions[i + 1].placement != positions[i].placement
+        forwarded = []
+        for position, replaced in zip(positions, superseded):
+            forwarded.extend(self.feed(position, now, replaced))
+        return forwarded
+
+    def poll(self, now=None):
+        """Forward the pending position if it has been stable for the time window."""
+        if self._candidate is None:
+            return []
+        return self._forward_if_stable(self.clock() if now is None else now)
+
+    def time_until_ready(self, now=None):
+        """Seconds until poll() could forward the pending position, or None if nothing is pending."""
+        if self._candidate is None or not self.window:
+            return None
+        now = self.clock() if now is None else now
+        return max(0.0, self._candidate_since + self.window - now)
+
+    def reset(self):
+        """Forget the pending and last forwarded positions (e.g. when a new game starts)."""
+        self._last_forwarded = None
+        self._candidate = None
+        self._candidate_frames = 0
+        self._candidate_since = None
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'min_frames': self.min_frames,
+            'window': self.window,
+            'frames_in': self.frames_in,
+            'forwarded': self.forwarded,
+            'suppressed_duplicates': self.suppressed_duplicates,
+            'suppressed_transients': self.suppressed_transients,
+            'pending': self._candidate is not None,
+        }
+
+    def _forward_if_stable(self, now, superseded=False):
+        stable = (
+            superseded
+            or not self.enabled
+            or self._candidate_frames >= self.min_frames
+            or (self.window and now - self._candidate_since >= self.window)
+        )
+        if not stable:
+            return []
+        position = self._candidate
+        self._candidate = None
+        self._last_forwarded = position.placement
+        self.forwarded += 1
+        return [position]
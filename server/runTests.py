@@ -1,6 +1,20 @@
 #!/usr/bin/env python3
 import unittest
 from testGetMove import TestDetermineMove
+from testChessFileReader import TestChessFileReader
+from testSerialIngest import TestSplitCompleteLines, TestChessSerialReadAvailable
+from testFenParser import TestParseFen
+from testPositionStabilizer import TestPositionStabilizer, TestStabilizedFileReplay
+from testIngestBuffer import TestIngestBuffer
+from testPersistenceWorker import TestPersistenceWorker
+from testStorageProfile import TestStorageProfile
+from testSchemaMigrations import TestSchemaMigrations
+from testBroadcaster import TestBroadcaster
+from testPositionLog import TestPositionLog
+from testPositionBatcher import TestPositionBatcher
+from testPositionEncoder import TestPositionEncoder
+from testGameCache import TestGameCache, TestGameCacheStore
+from testChessGame import TestChessMove, TestSuccessorTable, TestLiveBoard, TestManualEdit, TestIncrementalSave, TestGameSummary, TestGameListing
 
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main() 
@@ -0,0 +1,104 @@
+"""
+Schema Migrations
+
+Brings an existing game database up to the current schema in place.
+Base.metadata.create_all only creates missing tables; it never changes a
+table or adds an index to a database that already has it, so deployed
+chess_games.db files need explicit steps.
+
+The schema version is kept in SQLite's `PRAGMA user_version`. migrate()
+creates any missing tables, then runs every migration newer than the stored
+version in order, each in its own transaction together with the version
+bump. pysqlite runs DDL such as CREATE TABLE outside its own transactions,
+so migrate() puts the driver in autocommit mode and issues BEGIN and COMMIT
+itself: a migration that fails partway leaves neither its schema changes
+nor the version bump behind. Migrations must also work on a database just
+created by create_all (use IF NOT EXISTS), since a new database starts at
+version 0 too. They must not rely on create_all for the tables they use either: it creates them
+from the current models, which may have changed since the migration shipped.
+
+To change the schema, update the models in chessClass and append a
+migration to MIGRATIONS; never edit one that has shipped.
+"""
+
+from sqlalchemy import text
+
+
+def _add_lookup_indexes(connection):
+    # load_from_db: WHERE game_id = ? ORDER BY move_index
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_chess_moves_game_id_move_index "
+        "ON chess_moves (game_id, move_index)"
+    ))
+    # list_games: ORDER BY created_at DESC
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_chess_games_created_at ON chess_games (created_at)"
+    ))
+
+
+def _backfill_game_summary(connection):
+    # game_summary as of version 2; create_all has usually made it already
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS game_summary (
+            id INTEGER NOT NULL,
+            game_id VARCHAR(36) NOT NULL,
+            last_fen VARCHAR(100),
+            ply_count INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            updated_at DATETIME NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (game_id),
+            FOREIGN KEY(game_id) REFERENCES chess_games (game_id)
+        )
+    """))
+    # Fill it for games saved before it existed
+    connection.execute(text("""
+        INSERT OR IGNORE INTO game_summary (game_id, last_fen, ply_count, status, updated_at)
+        SELECT g.game_id, m.fen, COALESCE(m.move_index, 0),
+               CASE WHEN g.result IS NULL OR g.result = '*' THEN 'in_progress' ELSE 'completed' END,
+               COALESCE(m.timestamp, g.created_at)
+        FROM chess_games g
+        LEFT JOIN chess_moves m ON m.game_id = g.game_id AND m.move_index = (
+            SELECT MAX(move_index) FROM chess_moves WHERE game_id = g.game_id)
+    """))
+
+
+# (version, description, function(connection)), in order
+MIGRATIONS = [
+    (1, "Index chess_moves(game_id, move_index) and chess_games(created_at)", _add_lookup_indexes),
+    (2, "Backfill game_summary from chess_moves", _backfill_game_summary),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(connection):
+    return connection.execute(text("PRAGMA user_version")).scalar()
+
+
+def migrate(engine, metadata):
+    """Create missing tables and apply pending migrations. Returns the resulting schema version."""
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        version = get_version(connection)
+    if version > LATEST_VERSION:
+        print(f"[WARN] Database schema version {version} is newer than this server ({LATEST_VERSION})")
+        return version
+
+    for migration_version, description, apply in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        with engine.connect() as connection:
+            # Let SQLite see the BEGIN/COMMIT, so the DDL is inside the transaction too
+            connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.exec_driver_sql("BEGIN")
+            try:
+                apply(connection)
+                connection.execute(text(f"PRAGMA user_version = {int(migration_version)}"))
+                connection.exec_driver_sql("COMMIT")
+            except Exception:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+        print(f"[INFO] Applied schema migration {migration_version}: {description}")
+        version = migration_version
+    return version
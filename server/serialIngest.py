@@ -0,0 +1,121 @@
+"""
+Serial Ingest Helpers
+
+Helpers used by the serial reading thread in app.py to wait for hardware
+input without busy polling and to read it in batches.
+"""
+
+import selectors
+import time
+import serial
+
+# Ingest modes for read_serial_data
+INGEST_MODE_EVENT = "event"  # Block until bytes arrive (or the read timeout expires)
+INGEST_MODE_POLL = "poll"    # Legacy behaviour: check in_waiting, then sleep
+
+# Interval used when a connection cannot be waited on directly
+FALLBACK_POLL_INTERVAL = 0.01
+
+
+def _pending(connection):
+    """Return the number of bytes (or lines) already buffered on the connection."""
+    try:
+        return connection.in_waiting
+    except Exception:
+        return 0
+
+
+def wait_for_input(connection, timeout):
+    """
+    Block until the connection has data to read or the timeout expires.
+
+    Connections that know how to wait on their own (e.g. ChessFileReader) expose
+    a wait_for_data(timeout) method. Real serial ports are waited on with a
+    selector over their file descriptor. Anything else falls back to a short
+    polling loop on in_waiting.
+
+    Returns True if data is (probably) available, False on timeout.
+    """
+    if _pending(connection) > 0:
+        return True
+
+    wait = getattr(connection, "wait_for_data", None)
+    if callable(wait):
+        return wait(timeout)
+
+    fileno = None
+    try:
+        fileno = connection.fileno()
+    except Exception:
+        fileno = None
+
+    if fileno is not None:
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(fileno, selectors.EVENT_READ)
+                return bool(selector.select(timeout))
+        except (OSError, ValueError):
+            pass  # Not selectable on this platform, poll instead
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _pending(connection) > 0:
+            return True
+        time.sleep(FALLBACK_POLL_INTERVAL)
+    return False
+
+
+def split_complete_lines(partial_line, data):
+    """
+    Split newly read bytes into complete lines.
+
+    Returns (lines, partial_line) where lines excludes the newline characters
+    and partial_line is the unterminated remainder to prepend to the next read.
+    """
+    chunks = (partial_line + data).split(b"\n")
+    partial_line = chunks.pop()
+    return [chunk.rstrip(b"\r") for chunk in chunks], partial_line
+
+
+class ChessSerial(serial.Serial):
+    """pyserial port with a bulk line reader for the ingest loop."""
+
+    def __init__(self, *args, **kwargs):
+        self._partial_line = b""
+        super().__init__(*args, **kwargs)
+
+    def read_available(self):
+        """
+        Return every complete line currently buffered by the port in one read.
+
+        A trailing partial line is kept for the next call.
+        """
+        waiting = self.in_waiting
+        if not waiting:
+            return []
+        lines, self._partial_line = split_complete_lines(self._partial_line, self.read(waiting))
+        return lines
+
+    def reset_input_buffer(self):
+        self._partial_line = b""
+        super().reset_input_buffer()
+
+
+def read_available(connection):
+    """
+    Read every complete line available on the connection.
+
+    Uses the connection's own read_available() when it has one (ChessSerial,
+    ChessFileReader), otherwise falls back to one readline() per line.
+    """
+    bulk_read = getattr(connection, "read_available", None)
+    if callable(bulk_read):
+        return bulk_read()
+
+    lines = []
+    while connection.in_waiting > 0:
+        line = connection.readline()
+        if not line:  # readline timed out
+            break
+        lines.append(line)
+    return lines
@@ -0,0 +1,132 @@
+"""
+Storage Profile
+
+SQLite settings for the game database. Every pooled connection is configured
+on connect:
+
+- journal_mode=WAL:  readers (REST /games) no longer block the writer (saves)
+- synchronous=NORMAL: with WAL, commits only fsync at checkpoints; a power cut
+  can lose the last transactions but never corrupts the database
+- cache_size, mmap_size: keep the hot pages of chess_moves in memory
+- busy_timeout: wait for a competing writer instead of failing with
+  "database is locked"
+
+The WAL is checkpointed by WalCheckpointer on a background thread so that
+commits on the ingest path do not pay for it.
+"""
+
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+DEFAULT_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # Negative values are KiB: 16 MB per connection
+    'mmap_size': 64 * 1024 * 1024,
+    'busy_timeout': 5000,  # Milliseconds
+}
+
+# Connections for the reading thread, the persistence worker, the checkpointer
+# and a few concurrent REST requests; more wait for one to be returned
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+
+
+def _is_memory_database(url):
+    return url.database in (None, '', ':memory:')
+
+
+def apply_pragmas(dbapi_connection, profile):
+    """Run the PRAGMA statements of profile on a new DB-API connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in profile.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_storage_engine(url, profile=None, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW):
+    """Create a SQLAlchemy engine for a SQLite url with the storage profile applied"""
+    profile = dict(DEFAULT_PROFILE if profile is None else profile)
+    url = make_url(url)
+
+    if _is_memory_database(url):
+        # One shared connection; WAL and mmap do not apply to in-memory databases
+        profile.pop('journal_mode', None)
+        profile.pop('mmap_size', None)
+        engine = create_engine(url, poolclass=StaticPool, connect_args={'check_same_thread': False})
+    else:
+        engine = create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            connect_args={'check_same_thread': False},  # Connections move between threads through the pool
+        )
+
+    @event.listens_for(engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, profile)
+
+    return engine
+
+
+class WalCheckpointer:
+    """Checkpoints the WAL of an engine's database every `interval` seconds on a background thread"""
+
+    def __init__(self, engine, interval=30.0, mode='PASSIVE'):
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode  # PASSIVE never blocks readers or the writer
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.checkpoints = 0
+        self.failures = 0
+        self.last_result = None  # (busy, wal pages, pages checkpointed)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.checkpoint()
+
+    def checkpoint(self, mode=None):
+        """Run one checkpoint now. Returns (busy, wal pages, pages checkpointed) or None on failure"""
+        try:
+            with self.engine.connect() as connection:
+                row = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode or self.mode})").fetchone()
+            self.checkpoints += 1
+            self.last_result = tuple(row) if row else None
+            return self.last_result
+        except Exception as e:
+            self.failures += 1
+            print(f"[WARN] WAL checkpoint failed: {e}")
+            return None
+
+    def stop(self, timeout=5.0):
+        """Stop the thread and truncate the WAL with a final checkpoint; does nothing if it was never started"""
+        self._stop.set()
+        if self._thread is None:
+            return None  # e.g. at exit of a process that only imported app, which must not open the database
+        self._thread.join(timeout)
+        self._thread = None
+        return self.checkpoint('TRUNCATE')
+
+    def stats(self):
+        return {
+            'interval': self.interval,
+            'mode': self.mode,
+            'checkpoints': self.checkpoints,
+            'failures': self.failures,
+            'last_result': list(self.last_result) if self.last_result else None,
+        }
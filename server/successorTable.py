@@ -0,0 +1,38 @@
+"""
+Successor Table
+
+Precomputes, for a position, the piece placement reached by every legal move.
+The next frame from the board is almost always one legal move away, so
+ChessGame can resolve it with a single dictionary lookup instead of running
+determine_move. Tables are built on a background worker right after a
+position is accepted, while the players are thinking.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+
+def build_successor_table(board):
+    """
+    Map the board_fen() after each legal move to (move, san, is_legal).
+
+    The values match what determine_move and the legality check in
+    ChessGame._process_fen produce for a legal move.
+    """
+    table = {}
+    board = board.copy(stack=False)
+    for move in board.legal_moves:
+        san = board.san(move)
+        board.push(move)
+        table[board.board_fen()] = (move, san, True)
+        board.pop()
+    return table
+
+
+def submit_successor_table(board):
+    """Build the successor table of a copy of board on the shared worker. Returns a Future."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="successors")
+    return _executor.submit(build_successor_table, board.copy(stack=False))
@@ -0,0 +1,110 @@
+import threading
+import unittest
+from broadcaster import Broadcaster
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class RecordingEmit:
+    def __init__(self, clock=None, fail_on=None):
+        self.clock = clock
+        self.fail_on = fail_on
+        self.events = []
+        self.received = threading.Event()
+
+    def __call__(self, event, payload, to=None):
+        if event == self.fail_on:
+            raise RuntimeError("transport closed")
+        if self.clock is not None:
+            self.clock.now += 0.25  # Each emit takes a quarter of a second
+        self.events.append((event, payload, to))
+        self.received.set()
+
+class TestBroadcaster(unittest.TestCase):
+    def test_events_emitted_in_order(self):
+        emit = RecordingEmit()
+        broadcaster = Broadcaster(emit, autostart=False)
+        broadcaster.send('position', {'n': 1}, to='game:a')
+        broadcaster.send('position', {'n': 2}, to='game:a')
+        broadcaster.send('hardware_status', {'status': 'connected'})
+        self.assertEqual(emit.events, [])  # Nothing is emitted by send() itself
+        broadcaster.flush()
+        self.assertEqual(emit.events, [('position', {'n': 1}, 'game:a'), ('position', {'n': 2}, 'game:a'),
+                                       ('hardware_status', {'status': 'connected'}, None)])
+        self.assertEqual(broadcaster.stats()['sent'], 3)
+
+    def test_full_queue_drops_oldest(self):
+        """send() never blocks: past maxsize the oldest event goes"""
+        emit = RecordingEmit()
+        broadcaster = Broadcaster(emit, maxsize=2, autostart=False)
+        for n in range(4):
+            broadcaster.send('position', {'n': n})
+        stats = broadcaster.stats()
+        self.assertEqual((stats['depth'], stats['high_water_mark'], stats['dropped']), (2, 2, 2))
+        broadcaster.flush()
+        self.assertEqual([payload['n'] for _, payload, _ in emit.events], [2, 3])
+
+    def test_full_queue_keeps_control_events(self):
+        """Only position events are dropped; game_ended and the like always go out"""
+        emit = RecordingEmit()
+        broadcaster = Broadcaster(emit, maxsize=2, autostart=False)
+        broadcaster.send('hardware_status', {'status': 'connected'})
+        for n in range(3):
+            broadcaster.send('position', {'n': n})
+        broadcaster.send('game_ended', {'gameId': 'a'})
+        broadcaster.send('positions', {'n': 3})
+        self.assertEqual(broadcaster.stats()['dropped'], 3)
+        broadcaster.flush()
+        self.assertEqual([event for event, _, _ in emit.events], ['hardware_status', 'game_ended', 'positions'])
+
+    def test_send_later_keeps_latest(self):
+        """A deferred event goes out when due, replaced by later ones under its key"""
+        clock = FakeClock()
+        emit = RecordingEmit()
+        broadcaster = Broadcaster(emit, clock=clock, autostart=False)
+        broadcaster.send_later('a', 2.0, 'game_update', {'moves': 1})
+        clock.now = 1.0
+        broadcaster.send_later('a', 2.0, 'game_update', {'moves': 2})  # Still due at 2.0
+        broadcaster.send_later('b', 0.5, 'game_update', {'moves': 7})
+        broadcaster.cancel('b')
+        broadcaster.flush()
+        self.assertEqual(emit.events, [])
+        clock.now = 2.0
+        broadcaster.flush()
+        self.assertEqual(emit.events, [('game_update', {'moves': 2}, None)])
+        self.assertEqual(broadcaster.stats()['deferred'], 0)
+
+    def test_latency_includes_queue_time(self):
+        clock = FakeClock()
+        broadcaster = Broadcaster(RecordingEmit(clock), clock=clock, autostart=False)
+        broadcaster.send('position', {'n': 1})
+        broadcaster.send('position', {'n': 2})
+        broadcaster.flush()
+        stats = broadcaster.stats()
+        self.assertEqual((stats['last_latency'], stats['max_latency'], stats['avg_latency']), (0.5, 0.5, 0.375))
+
+    def test_failed_emit_counted(self):
+        broadcaster = Broadcaster(RecordingEmit(fail_on='position'), autostart=False)
+        broadcaster.send('position', {'n': 1})
+        broadcaster.send('game_ended', {})
+        broadcaster.flush()
+        stats = broadcaster.stats()
+        self.assertEqual((stats['failures'], stats['sent']), (1, 1))
+
+    def test_thread_emits_and_stop_drains(self):
+        emit = RecordingEmit()
+        broadcaster = Broadcaster(emit)
+        broadcaster.send('position', {'n': 1})
+        self.assertTrue(emit.received.wait(5))
+        broadcaster.stop()
+        broadcaster.send('position', {'n': 2})  # Restarts the thread
+        broadcaster.stop()
+        self.assertEqual([payload['n'] for _, payload, _ in emit.events], [1, 2])
+        self.assertEqual(broadcaster.stats()['depth'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
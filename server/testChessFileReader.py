@@ -0,0 +1,139 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from chessFileReader import ChessFileReader
+from fileWatcher import InotifyWatcher
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR"
+E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR"
+E5 = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR"
+
+class TestChessFileReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "moves.txt")
+        self.reader = ChessFileReader(self.path)
+        self.reader.open()
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, text, mode='a'):
+        with open(self.path, mode, encoding='utf-8') as f:
+            f.write(text)
+
+    def drain(self):
+        """Read every position currently available, returning just the board part"""
+        positions = []
+        while self.reader.in_waiting > 0:
+            positions.append(self.reader.readline().decode('utf-8').split(' ')[0])
+        return positions
+
+    def test_reads_only_appended_lines(self):
+        """Each line is returned once, in order, as lines are appended"""
+        self.assertEqual(self.drain(), [START])
+        self.write(E4 + "\n")
+        self.write(E5 + "\n")
+        self.assertEqual(self.drain(), [E4, E5])
+        self.assertEqual(self.drain(), [])
+
+    def test_completes_fen(self):
+        """Returned lines are completed into full FENs"""
+        self.write(E4 + "\n")
+        self.drain()
+        self.assertEqual(self.reader.last_position, E4)
+        self.assertEqual(self.reader.active_color, "b")
+
+    def test_partial_line_is_held_back(self):
+        """A line without its newline is not returned until it is complete"""
+        self.drain()
+        self.write(E4[:10])
+        self.assertEqual(self.drain(), [])
+        self.write(E4[10:] + "\n")
+        self.assertEqual(self.drain(), [E4])
+
+    def test_truncation_restarts_from_beginning(self):
+        """Overwriting the file with shorter content restarts at line 0"""
+        self.write(E4 + "\n" + E5 + "\n")
+        self.drain()
+        self.write(START + "\n", mode='w')
+        self.assertEqual(self.drain(), [START])
+
+    def test_truncation_drops_pending_lines(self):
+        """Lines buffered from the old content are not returned after a truncation"""
+        self.write(E4 + "\n" + E5 + "\n")
+        self.assertEqual(self.reader.in_waiting, 3)  # START, E4 and E5 read, none returned yet
+        self.reader.readline()
+        self.write(START + "\n", mode='w')
+        self.assertEqual(self.drain(), [START])
+
+    def test_rotation_restarts_from_beginning(self):
+        """Replacing the file (new inode) is detected even if it is larger"""
+        self.drain()
+        rotated = self.path + ".new"
+        with open(rotated, 'w', encoding='utf-8') as f:
+            f.write(START + "\n" + E4 + "\n" + E5 + "\n")
+        os.replace(rotated, self.path)
+        self.assertEqual(self.drain(), [START, E4, E5])
+
+    def test_read_available_returns_batch(self):
+        """read_available returns every complete line at once, holding back a partial one"""
+        self.write(E4 + "\n" + E5 + "\n" + START[:5])
+        positions = [fen.decode('utf-8').split(' ')[0] for fen in self.reader.read_available()]
+        self.assertEqual(positions, [START, E4, E5])
+        self.assertEqual(self.reader.read_available(), [])
+        self.write(START[5:] + "\n")
+        self.assertEqual(len(self.reader.read_available()), 1)
+
+    def test_wait_for_data_wakes_on_write(self):
+        """wait_for_data returns as soon as the file is appended to"""
+        if sys.platform.startswith("linux"):
+            self.assertIsInstance(self.reader.watcher, InotifyWatcher)
+        self.reader.poll_interval = 1.0  # Polling would only notice the write up to a second later
+        self.drain()
+        written_at = []
+        def write():
+            written_at.append(time.monotonic())
+            self.write(E4 + "\n")
+        writer = threading.Timer(0.1, write)
+        writer.start()
+        self.assertTrue(self.reader.wait_for_data(5.0))
+        woke_at = time.monotonic()
+        writer.join()
+        if self.reader.watcher:
+            self.assertLess(woke_at - written_at[0], self.reader.poll_interval / 4)
+        self.assertEqual(self.drain(), [E4])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_watcher_closed_during_wait(self):
+        """A descriptor closed while events are being read means no events, not an error"""
+        watcher = InotifyWatcher(self.path)
+        self.write(E4 + "\n")
+        os.close(watcher.fd)  # As if close() ran on another thread between select() and read()
+        self.assertFalse(watcher._drain())
+        watcher.fd = None
+        self.assertFalse(watcher._drain())
+
+    def test_wait_for_data_times_out(self):
+        """wait_for_data returns False when nothing is written"""
+        self.drain()
+        self.assertFalse(self.reader.wait_for_data(0.1))
+
+    def test_polling_fallback(self):
+        """Without inotify the reader still notices writes by polling"""
+        reader = ChessFileReader(self.path, use_inotify=False)
+        reader.open()
+        self.assertIsNone(reader.watcher)
+        while reader.in_waiting > 0:
+            reader.readline()
+        threading.Timer(0.1, self.write, args=(E4 + "\n",)).start()
+        self.assertTrue(reader.wait_for_data(5.0))
+        reader.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,376 @@
+import os
+import tempfile
+import unittest
+import uuid
+from datetime import datetime, timedelta
+import chess
+from sqlalchemy import create_engine, event
+import chessClass
+from chessClass import ChessGame, ChessGameModel, ChessMove, ChessMoveModel
+from schemaMigrations import migrate
+from persistenceWorker import PersistenceWorker
+from fenParser import parse_fen
+
+GAME = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "O-O", "Nf6", "d4", "exd4", "e5"]
+
+def game_fens(moves):
+    board = chess.Board()
+    fens = []
+    for san in moves:
+        board.push_san(san)
+        fens.append(board.fen())
+    return fens
+
+class TestChessMove(unittest.TestCase):
+    def test_compact_fields_round_trip(self):
+        """The compact representation returns the original values"""
+        move_id = str(uuid.uuid4())
+        timestamp = datetime(2025, 5, 17, 14, 3, 59, 123456)
+        move = ChessMove(move_id, chess.STARTING_FEN, "White", timestamp, algebraic="e8=N",
+                         uci="e7e8n", move_obj=chess.Move.from_uci("e7e8n"), is_legal=True, piece_moved="P")
+        self.assertFalse(hasattr(move, "__dict__"))
+        self.assertEqual(move.move_id, move_id)
+        self.assertEqual(move.timestamp, timestamp)
+        self.assertEqual(move.move_obj, chess.Move.from_uci("e7e8n"))
+        self.assertEqual(move.uci, "e7e8n")
+        self.assertEqual(move.algebraic, "e8=N")
+
+    def test_loaded_move_without_move_obj(self):
+        """A move built from stored columns (uci only) exposes the same uci"""
+        move = ChessMove("not-a-uuid", chess.STARTING_FEN, "Black", None, uci="e1g1")
+        self.assertEqual(move.move_id, "not-a-uuid")
+        self.assertIsNone(move.timestamp)
+        self.assertEqual(move.uci, "e1g1")
+        self.assertEqual(ChessMove("id", chess.STARTING_FEN, None, None, uci="0000").uci, "0000")
+        self.assertIsNone(ChessMove("id", chess.STARTING_FEN, None, None).uci)
+
+class TestSuccessorTable(unittest.TestCase):
+    def play(self, precompute):
+        game = ChessGame("test-successors")
+        game.PRECOMPUTE_SUCCESSORS = precompute
+        for fen in game_fens(GAME):
+            if game._successors is not None:
+                game._successors.result()  # The table is normally ready long before the next move
+            game.add_to_queue(fen)
+            game.process_queue()
+        return game
+
+    def test_successor_hits_match_determine_move(self):
+        """Moves resolved from the successor table are identical to determine_move's"""
+        with_table = self.play(True)
+        without_table = self.play(False)
+        self.assertEqual(with_table.successor_hits, len(GAME) - 1)
+        self.assertEqual(without_table.successor_hits, 0)
+        for a, b in zip(with_table.master_state, without_table.master_state):
+            self.assertEqual((a.fen, a.algebraic, a.uci, a.is_legal, a.piece_moved, a.player),
+                             (b.fen, b.algebraic, b.uci, b.is_legal, b.piece_moved, b.player))
+
+    def test_illegal_transition_falls_back(self):
+        """A frame that is not one legal move away is still handled by determine_move"""
+        game = ChessGame("test-successors-miss")
+        fens = game_fens(["e4", "e5", "Nf3"])
+        game.add_to_queue(fens[0])
+        game.process_queue()
+        game._successors.result()
+        game.add_to_queue(fens[2])  # Two moves ahead
+        game.process_queue()
+        self.assertEqual(len(game.master_state), 3)
+        self.assertEqual(game.successor_hits, 0)
+        self.assertEqual(game.successor_misses, 2)
+        self.assertFalse(game.master_state[-1].is_legal)
+
+class TestLiveBoard(unittest.TestCase):
+    def test_live_board_follows_legal_moves(self):
+        """Legal moves are pushed onto one live board instead of re-parsing FENs"""
+        game = ChessGame("test-live-board")
+        game.PRECOMPUTE_SUCCESSORS = False
+        fens = game_fens(GAME)
+        for fen in fens:
+            game.add_to_queue(fen)
+        game.process_queue()
+        board = game.get_latest_board()
+        self.assertEqual(board.board_fen(), chess.Board(fens[-1]).board_fen())
+        self.assertEqual(len(board.move_stack), len(GAME))
+
+    def test_successor_hit_does_not_parse_frame(self):
+        """A frame resolved from the successor table never builds its own board"""
+        game = ChessGame("test-live-board-hit")
+        fens = game_fens(["e4", "e5"])
+        game.add_to_queue(fens[0])
+        game.process_queue()
+        game._successors.result()
+        position, _ = parse_fen(fens[1])
+        game.add_to_queue(position)
+        game.process_queue()
+        self.assertIsNone(position._board)
+        self.assertEqual(game.master_state[-1].algebraic, "e5")
+
+    def test_illegal_transition_resyncs_live_board(self):
+        """After an illegal frame the live board matches the reported position"""
+        game = ChessGame("test-live-board-illegal")
+        game.PRECOMPUTE_SUCCESSORS = False
+        fens = game_fens(["e4", "e5", "Nf3"])
+        game.add_to_queue(fens[2])
+        game.process_queue()
+        self.assertFalse(game.master_state[-1].is_legal)
+        self.assertEqual(game.get_latest_board().fen(), chess.Board(fens[2]).fen())
+
+class TestManualEdit(unittest.TestCase):
+    def play(self, fens):
+        game = ChessGame("test-manual-edit")
+        game.PRECOMPUTE_SUCCESSORS = False
+        for fen in fens:
+            game.add_to_queue(fen)
+        game.process_queue()
+        return game
+
+    def test_insert_missed_frame(self):
+        """Inserting a frame the sensors missed makes the next ply legal again"""
+        fens = game_fens(GAME)
+        game = self.play(fens[:2] + fens[3:])
+        self.assertFalse(game.master_state[3].is_legal)
+        later_ids = [move.move_id for move in game.master_state[3:]]
+
+        game.manual_edit(fens[2], move_id=game.master_state[2].move_id, action="insert")
+        self.assertEqual([move.algebraic for move in game.master_state[1:]], GAME)
+        self.assertTrue(all(move.is_legal for move in game.master_state[1:]))
+        # Recomputed plies keep their identity and the index map follows the shift
+        self.assertEqual([move.move_id for move in game.master_state[4:]], later_ids)
+        for i, move in enumerate(game.master_state):
+            self.assertEqual(game._index_of(move.move_id), i)
+
+    def test_change_stops_when_recomputation_converges(self):
+        """Only the ply after the edited one is recomputed"""
+        fens = game_fens(GAME)
+        game = self.play(fens)
+        bishop = game_fens(["e4", "e5", "Bc4"])[2]
+        game.manual_edit(bishop, move_id=game.master_state[3].move_id, action="change")
+        self.assertEqual(game.master_state[3].algebraic, "Bc4")
+        self.assertFalse(game.master_state[4].is_legal)
+        self.assertEqual(game._reprocess_from(4), 0)
+
+        # Changing it back restores the original moves
+        game.manual_edit(fens[2], index=3, action="change")
+        self.assertEqual([move.algebraic for move in game.master_state[1:]], GAME)
+        self.assertEqual(game.get_latest_board().board_fen(), chess.Board(fens[-1]).board_fen())
+
+    def test_delete_updates_index_map(self):
+        """Deleting a ply shifts the index of every later move_id"""
+        game = self.play(game_fens(GAME))
+        last_id = game.master_state[-1].move_id
+        deleted_id = game.master_state[5].move_id
+        game.manual_edit(None, move_id=deleted_id, action="delete")
+        self.assertIsNone(game._index_of(deleted_id))
+        self.assertEqual(game._index_of(last_id), len(game.master_state) - 1)
+        self.assertFalse(game.master_state[5].is_legal)
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """Binds chessClass.Session to a temporary database, keeping the tests away from chess_games.db"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        chessClass.Base.metadata.create_all(self.engine)
+        chessClass.Session.remove()
+        chessClass.Session.configure(bind=self.engine)
+
+    def tearDown(self):
+        chessClass.Session.remove()
+        chessClass.Session.configure(bind=chessClass.engine)
+        self.engine.dispose()
+        os.remove(self.db_path)
+
+class TestIncrementalSave(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self.record)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        rows = len(parameters) if executemany else 1
+        self.statements.append((statement.split()[0].upper(), rows, statement))
+
+    def writes(self):
+        """(verb, rows) of the chess_moves writes recorded since the last call"""
+        statements, self.statements = self.statements, []
+        return [(verb, rows) for verb, rows, statement in statements
+                if verb in ("INSERT", "UPDATE", "DELETE") and "chess_moves" in statement]
+
+    def stored(self, game_id):
+        with self.engine.connect() as conn:
+            table = ChessMoveModel.__table__
+            rows = conn.execute(table.select().where(table.c.game_id == game_id).order_by(table.c.move_index))
+            return [(row.move_index, row.move_id, row.algebraic, row.is_legal) for row in rows]
+
+    def expected(self, game):
+        return [(i, move.move_id, move.algebraic, move.is_legal) for i, move in enumerate(game.master_state)]
+
+    def play(self, game, fens):
+        for fen in fens:
+            game.add_to_queue(fen)
+        game.process_queue()
+
+    def test_appends_insert_only_new_plies(self):
+        """Saving after a move inserts that move and nothing else"""
+        fens = game_fens(GAME)
+        game = ChessGame("test-save-append")
+        game.PRECOMPUTE_SUCCESSORS = False
+        self.play(game, fens[:4])
+        self.assertTrue(game.save_to_db())
+        self.writes()
+        for fen in fens[4:]:
+            self.play(game, [fen])
+            self.assertTrue(game.save_to_db())
+            self.assertEqual(self.writes(), [("INSERT", 1)])
+        self.assertTrue(game.save_to_db())
+        self.assertEqual(self.writes(), [])
+        self.assertEqual(self.stored(game.game_id), self.expected(game))
+
+    def test_edits_write_only_affected_plies(self):
+        """Inserted, deleted and recomputed plies are written, the rest is left alone"""
+        fens = game_fens(GAME)
+        game = ChessGame("test-save-edit")
+        game.PRECOMPUTE_SUCCESSORS = False
+        self.play(game, fens[:2] + fens[3:])
+        game.save_to_db()
+
+        game.manual_edit(fens[2], index=2, action="insert")
+        self.assertTrue(game.save_to_db())
+        self.assertEqual(self.stored(game.game_id), self.expected(game))
+
+        game.manual_edit(None, index=len(game.master_state) - 1, action="delete")
+        game.manual_edit(game_fens(["e4", "e5", "Bc4"])[2], index=3, action="change")
+        self.writes()
+        self.assertTrue(game.save_to_db())
+        self.assertEqual(self.stored(game.game_id), self.expected(game))
+        # Both removed plies in one delete, the new ply and the recomputed next ply
+        self.assertEqual(sorted(self.writes()), [("DELETE", 1), ("INSERT", 1), ("UPDATE", 1)])
+
+    def test_reload_and_resave(self):
+        """A loaded game knows its rows are stored; a fresh object reconciles with the table"""
+        fens = game_fens(GAME)
+        game = ChessGame("test-save-reload")
+        self.play(game, fens[:6])
+        game.save_to_db()
+
+        loaded = ChessGame.load_from_db(game.game_id)
+        self.assertEqual(self.expected(loaded), self.expected(game))
+        self.writes()
+        loaded.save_to_db()
+        self.assertEqual(self.writes(), [])
+
+        # A new object for the same game id replaces the stored timeline
+        replacement = ChessGame(game.game_id)
+        replacement.PRECOMPUTE_SUCCESSORS = False
+        self.play(replacement, fens[:3])
+        self.assertTrue(replacement.save_to_db())
+        self.assertEqual(self.stored(game.game_id), self.expected(replacement))
+
+    def test_dirty_listener_feeds_persistence_worker(self):
+        """Changes are reported to the worker, which saves the game once"""
+        worker = PersistenceWorker(autostart=False)
+        game = ChessGame("test-save-worker")
+        game.PRECOMPUTE_SUCCESSORS = False
+        game.dirty_listener = worker.notify
+        self.play(game, game_fens(GAME))
+        self.assertEqual(worker.stats()['pending'], 1)
+        self.assertEqual(worker.notifications, len(GAME))
+        self.assertTrue(worker.flush())
+        self.assertEqual(self.stored(game.game_id), self.expected(game))
+
+class TestGameSummary(TempDatabaseTestCase):
+    def test_summary_follows_saves(self):
+        """game_summary tracks the last position, ply count and status of every save"""
+        fens = game_fens(GAME)
+        game = ChessGame("test-summary")
+        game.PRECOMPUTE_SUCCESSORS = False
+        for fen in fens[:5]:
+            game.add_to_queue(fen)
+        game.process_queue()
+        game.save_to_db()
+        summary = ChessGame.load_summary(game.game_id)
+        self.assertEqual((summary['last_fen'], summary['ply_count'], summary['status']),
+                         (fens[4], 5, chessClass.GAME_STATUS_IN_PROGRESS))
+
+        game.manual_edit(None, index=5, action="delete")
+        game.result = "1-0"
+        game.save_to_db()
+        summary = ChessGame.load_summary(game.game_id)
+        self.assertEqual((summary['last_fen'], summary['ply_count'], summary['status']),
+                         (fens[3], 4, chessClass.GAME_STATUS_COMPLETED))
+        rows, _ = ChessGame.list_games_page()
+        self.assertEqual(rows[0][6:], (4, chessClass.GAME_STATUS_COMPLETED))
+
+    def test_summary_query_skips_moves(self):
+        """Reading a summary never touches chess_moves; an unchanged game does not rewrite it"""
+        game = ChessGame("test-summary-read")
+        game.save_to_db()
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+        game.save_to_db()
+        self.assertFalse([statement for statement in statements if "game_summary" in statement])
+        summary = ChessGame.load_summary(game.game_id)
+        self.assertEqual(summary['ply_count'], 0)
+        self.assertFalse([statement for statement in statements if "chess_moves" in statement])
+        self.assertIsNone(ChessGame.load_summary("missing"))
+
+class TestGameListing(TempDatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        # Seven games, two of them created at the same instant
+        start = datetime(2025, 3, 1, 12, 0)
+        self.created = [start, start + timedelta(days=1), start + timedelta(days=1), start + timedelta(days=2),
+                        start + timedelta(days=3), start + timedelta(days=4), start + timedelta(days=5)]
+        players = ["Alice", "Bob", "Carol"]
+        rows = [{'game_id': f"g{i}", 'white': players[i % 3], 'black': players[(i + 1) % 3],
+                 'date': created.strftime("%Y.%m.%d"), 'round': "1", 'result': "1-0" if i % 2 else "*",
+                 'created_at': created} for i, created in enumerate(self.created)]
+        with self.engine.begin() as connection:
+            connection.execute(ChessGameModel.__table__.insert(), rows)
+
+    def all_pages(self, **filters):
+        ids, after, pages = [], None, 0
+        while True:
+            rows, after = ChessGame.list_games_page(limit=3, after=after, **filters)
+            ids.extend(row[0] for row in rows)
+            pages += 1
+            if after is None:
+                return ids, pages
+
+    def test_pages_cover_every_game_once(self):
+        """Pages are newest first, ties broken by id, without gaps or repeats"""
+        ids, pages = self.all_pages()
+        self.assertEqual(ids, ["g6", "g5", "g4", "g3", "g2", "g1", "g0"])
+        self.assertEqual(pages, 3)
+        self.assertEqual([row[0] for row in ChessGame.list_games()], ids)
+
+    def test_filters(self):
+        """player matches either colour; result and created_at range narrow the listing"""
+        self.assertEqual(self.all_pages(player="Alice")[0], ["g6", "g5", "g3", "g2", "g0"])
+        self.assertEqual(self.all_pages(result="1-0")[0], ["g5", "g3", "g1"])
+        ids, _ = self.all_pages(created_from=self.created[1], created_to=self.created[4])
+        self.assertEqual(ids, ["g3", "g2", "g1"])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            ChessGame.list_games_page(after="not-a-cursor")
+
+    def test_page_query_uses_created_at_index(self):
+        """The keyset query walks ix_chess_games_created_at instead of sorting"""
+        migrate(self.engine, chessClass.Base.metadata)
+        rows, after = ChessGame.list_games_page(limit=2)
+        statements = []
+        event.listen(self.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, parameters, context, executemany:
+                     statements.append((statement, parameters)))
+        ChessGame.list_games_page(limit=2, after=after)
+        statement, parameters = statements[-1]
+        with self.engine.connect() as connection:
+            plan = " ".join(row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+        self.assertIn("ix_chess_games_created_at", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+if __name__ == "__main__":
+    unittest.main()
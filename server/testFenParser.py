@@ -0,0 +1,60 @@
+import unittest
+import chess
+from fenParser import parse_fen, as_position, ParsedPosition
+from getMove import determine_move
+
+class TestParseFen(unittest.TestCase):
+    def test_valid_fen(self):
+        """A valid FEN yields a position whose placement matches python-chess"""
+        fen = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        position, error = parse_fen(fen)
+        self.assertIsNone(error)
+        self.assertEqual(position.fen, fen)
+        self.assertEqual(position.placement, chess.Board(fen).board_fen())
+        self.assertEqual(position.board.turn, chess.BLACK)
+
+    def test_board_is_built_once(self):
+        """The parsed board is cached on the position"""
+        position, _ = parse_fen(chess.STARTING_FEN)
+        self.assertIs(position.board, position.board)
+
+    def test_wrong_number_of_ranks(self):
+        """Seven ranks are rejected"""
+        position, error = parse_fen("rnbqkbnr/pppppppp/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.assertIsNone(position)
+        self.assertIn("rows", error)
+
+    def test_rank_square_totals(self):
+        """Ranks that do not add up to 8 squares are rejected (the old regex accepted these)"""
+        for placement in ("rnbqkbnr/ppppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+                          "rnbqkbnr/ppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+                          "rnbqkbnr/pppppppp/7/8/8/8/PPPPPPPP/RNBQKBNR",
+                          "rnbqkbnr/pppppppp/44/8/8/8/PPPPPPPP/RNBQKBNR"):
+            position, error = parse_fen(f"{placement} w KQkq - 0 1")
+            self.assertIsNone(position, placement)
+            self.assertIsNotNone(error)
+
+    def test_invalid_fields(self):
+        """Bad side to move, castling, en passant and counters are rejected"""
+        board = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR"
+        for suffix in ("x KQkq - 0 1", "w KKq - 0 1", "w KQkq e4 0 1", "w KQkq - a 1", "w KQkq - 0"):
+            position, error = parse_fen(f"{board} {suffix}")
+            self.assertIsNone(position, suffix)
+
+    def test_as_position(self):
+        """Strings are wrapped, positions are passed through"""
+        position, _ = parse_fen(chess.STARTING_FEN)
+        self.assertIs(as_position(position), position)
+        wrapped = as_position(chess.STARTING_FEN)
+        self.assertIsInstance(wrapped, ParsedPosition)
+        self.assertEqual(wrapped.placement, chess.Board().board_fen())
+
+    def test_determine_move_accepts_position(self):
+        """determine_move gives the same result for a ParsedPosition and a Board"""
+        board_before = chess.Board()
+        fen = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        position, _ = parse_fen(fen)
+        self.assertEqual(determine_move(board_before, position), determine_move(board_before, chess.Board(fen)))
+
+if __name__ == "__main__":
+    unittest.main()
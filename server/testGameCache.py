@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+import chessClass
+from chessClass import ChessGame
+from gameCache import GameCache
+
+class FakeGame:
+    def __init__(self, game_id, plies=1):
+        self.game_id = game_id
+        self.master_state = [None] * plies
+
+class FakeLoader:
+    def __init__(self, plies=None):
+        self.plies = plies or {}
+        self.loads = []
+
+    def __call__(self, game_id):
+        self.loads.append(game_id)
+        if game_id == "missing":
+            return None
+        return FakeGame(game_id, self.plies.get(game_id, 1))
+
+class TestGameCache(unittest.TestCase):
+    def test_hit_after_miss(self):
+        """The first lookup loads the game, later ones return the same instance"""
+        loader = FakeLoader()
+        cache = GameCache(loader)
+        game = cache.get("a")
+        self.assertIs(cache.get("a"), game)
+        self.assertEqual(loader.loads, ["a"])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+    def test_missing_game_not_cached(self):
+        loader = FakeLoader()
+        cache = GameCache(loader)
+        self.assertIsNone(cache.get("missing"))
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(loader.loads, ["missing", "missing"])
+        self.assertEqual(cache.stats()['games'], 0)
+
+    def test_least_recently_used_evicted(self):
+        """Past max_games the game used longest ago goes first"""
+        loader = FakeLoader()
+        cache = GameCache(loader, max_games=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")  # b is now the least recently used
+        cache.get("c")
+        self.assertIsNone(cache.peek("b"))
+        self.assertIsNotNone(cache.peek("a"))
+        self.assertIsNotNone(cache.peek("c"))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ply_budget(self):
+        """Games are evicted until the cached plies fit, but the newest game is always kept"""
+        cache = GameCache(FakeLoader({"a": 60, "b": 30, "c": 50, "d": 500}), max_games=10, max_plies=100)
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(cache.stats()['plies'], 90)
+        cache.get("c")  # 140 plies: a goes
+        self.assertEqual(cache.stats()['plies'], 80)
+        cache.get("d")  # Over budget on its own
+        stats = cache.stats()
+        self.assertEqual((stats['games'], stats['plies'], stats['evictions']), (1, 500, 3))
+
+    def test_save_writes_through(self):
+        """A saved instance replaces a stale cached copy; a deleted game is dropped"""
+        cache = GameCache(FakeLoader())
+        stale = cache.get("a")
+        fresh = FakeGame("a")
+        cache.on_stored(fresh)
+        self.assertIs(cache.peek("a"), fresh)
+        cache.on_stored(fresh)  # Saving the cached instance again is not an invalidation
+        self.assertEqual(cache.stats()['invalidations'], 1)
+        self.assertIsNot(cache.peek("a"), stale)
+        cache.on_stored(fresh, deleted=True)
+        self.assertIsNone(cache.peek("a"))
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+class TestGameCacheStore(unittest.TestCase):
+    """The cache attached to ChessGame.store_listener, against a temporary database"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        chessClass.Base.metadata.create_all(self.engine)
+        chessClass.Session.remove()
+        chessClass.Session.configure(bind=self.engine)
+        self.cache = GameCache(ChessGame.load_from_db)
+        ChessGame.store_listener = self.cache.on_stored
+
+    def tearDown(self):
+        ChessGame.store_listener = None
+        chessClass.Session.remove()
+        chessClass.Session.configure(bind=chessClass.engine)
+        self.engine.dispose()
+        os.remove(self.db_path)
+
+    def test_cache_follows_saves_and_deletes(self):
+        game = ChessGame("g1")
+        game.save_to_db()
+        self.assertIs(self.cache.get("g1"), game)  # Cached by its first save
+
+        other = ChessGame.load_from_db("g1")
+        other.result = "1-0"
+        other.save_to_db()
+        self.assertEqual(self.cache.get("g1").result, "1-0")
+
+        other.delete_from_db()
+        self.assertIsNone(self.cache.get("g1"))
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
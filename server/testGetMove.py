@@ -1,6 +1,7 @@
+import random
 import unittest
 import chess
-from getMove import determine_move
+from getMove import determine_move, changed_squares_mask
 
 class TestDetermineMove(unittest.TestCase):
     def test_normal_move(self):
@@ -116,5 +117,36 @@ class TestDetermineMove(unittest.TestCase):
         move, san = determine_move(board_before, board_after)
         self.assertEqual(move, chess.Move.from_uci("e1g1"))  # Move would be detected
 
+    def test_changed_squares_mask(self):
+        """The bitboard diff matches a square-by-square comparison"""
+        board_before = chess.Board("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2")
+        board_after = chess.Board("rnbqkbnr/ppp1pppp/8/3P4/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 2")
+        mask = changed_squares_mask(board_before, board_after)
+        self.assertEqual(list(chess.SquareSet(mask)), [chess.E4, chess.D5])
+
+    def test_matches_full_legal_move_scan(self):
+        """The filtered matcher finds the same move as playing out every legal move"""
+        rng = random.Random(1234)
+        for _ in range(20):
+            board = chess.Board()
+            while not board.is_game_over() and board.ply() < 120:
+                moves = list(board.legal_moves)
+                played = rng.choice(moves)
+                board_after = board.copy()
+                board_after.push(played)
+
+                expected = None
+                for move in moves:
+                    temp_board = board.copy()
+                    temp_board.push(move)
+                    if temp_board.board_fen() == board_after.board_fen():
+                        expected = move
+                        break
+
+                move, san = determine_move(board, board_after)
+                self.assertEqual(move, expected, board.fen())
+                self.assertEqual(san, board.san(expected))
+                board = board_after
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,61 @@
+import threading
+import unittest
+from ingestBuffer import IngestBuffer, OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_LATEST_ONLY
+
+class TestIngestBuffer(unittest.TestCase):
+    def test_fifo_and_metrics(self):
+        """Items come out in order and the counters track them"""
+        buffer = IngestBuffer(maxsize=4)
+        for i in range(3):
+            buffer.put(i)
+        self.assertEqual(buffer.get(), 0)
+        self.assertEqual(buffer.drain(), [1, 2])
+        self.assertIsNone(buffer.get())
+        stats = buffer.stats()
+        self.assertEqual(stats['depth'], 0)
+        self.assertEqual(stats['high_water_mark'], 3)
+        self.assertEqual(stats['enqueued'], 3)
+        self.assertEqual(stats['dequeued'], 3)
+
+    def test_drop_oldest(self):
+        """A full buffer discards its oldest item"""
+        buffer = IngestBuffer(maxsize=2, policy=OVERFLOW_DROP_OLDEST)
+        for i in range(5):
+            self.assertTrue(buffer.put(i))
+        self.assertEqual(buffer.drain(), [3, 4])
+        self.assertEqual(buffer.dropped, 3)
+        self.assertEqual(buffer.high_water_mark, 2)
+
+    def test_latest_only(self):
+        """A full buffer is cleared and keeps only the newest item"""
+        buffer = IngestBuffer(maxsize=3, policy=OVERFLOW_LATEST_ONLY)
+        for i in range(4):
+            buffer.put(i)
+        self.assertEqual(buffer.drain(), [3])
+        self.assertEqual(buffer.dropped, 3)
+
+    def test_block_times_out(self):
+        """With the block policy a put into a full buffer gives up after the timeout"""
+        buffer = IngestBuffer(maxsize=1, policy=OVERFLOW_BLOCK)
+        buffer.put("a")
+        self.assertFalse(buffer.put("b", timeout=0.05))
+        self.assertEqual(buffer.dropped, 1)
+        self.assertEqual(buffer.drain(), ["a"])
+
+    def test_block_waits_for_consumer(self):
+        """With the block policy a put succeeds once a consumer makes room"""
+        buffer = IngestBuffer(maxsize=1, policy=OVERFLOW_BLOCK)
+        buffer.put("a")
+        consumer = threading.Timer(0.05, buffer.get)
+        consumer.start()
+        self.assertTrue(buffer.put("b", timeout=5))
+        consumer.join()
+        self.assertEqual(buffer.drain(), ["b"])
+        self.assertEqual(buffer.dropped, 0)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            IngestBuffer(policy="unknown")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import unittest
+from persistenceWorker import PersistenceWorker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeGame:
+    def __init__(self, game_id, fail=False):
+        self.game_id = game_id
+        self.fail = fail
+        self.saves = 0
+        self.saved = threading.Event()
+
+    def save_to_db(self):
+        if self.fail:
+            return False
+        self.saves += 1
+        self.saved.set()
+        return True
+
+class TestPersistenceWorker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        # No thread; the tests drive the schedule by hand
+        self.worker = PersistenceWorker(flush_interval=1.0, max_lag=5.0, clock=self.clock, autostart=False)
+
+    def due(self):
+        return self.worker._next_due(self.clock())
+
+    def test_burst_is_coalesced(self):
+        """Notifications closer than the flush interval are saved together"""
+        game = FakeGame("a")
+        for step in range(3):
+            self.clock.now = step * 0.5
+            self.worker.notify(game)
+        self.assertEqual(self.due(), ([], 1.0))
+        self.clock.now = 2.0
+        self.assertEqual(self.due()[0], ["a"])
+
+    def test_max_lag_bounds_a_busy_game(self):
+        """A game that keeps changing is still saved max_lag after its first change"""
+        game = FakeGame("a")
+        for step in range(10):
+            self.clock.now = step * 0.6
+            self.worker.notify(game)
+            if self.clock.now >= 5.0:
+                break
+        self.assertEqual(self.due()[0], ["a"])
+
+    def test_immediate_and_flush(self):
+        """immediate skips the interval; flush saves everything pending"""
+        urgent, quiet = FakeGame("urgent"), FakeGame("quiet")
+        self.worker.notify(urgent, immediate=True)
+        self.worker.notify(quiet)
+        self.assertEqual(self.due()[0], ["urgent"])
+        self.assertTrue(self.worker.flush())
+        self.assertEqual((urgent.saves, quiet.saves), (1, 1))
+        self.assertEqual(self.worker.stats()['pending'], 0)
+
+    def test_failed_save_is_retried(self):
+        """A game whose save fails stays pending with its original first change"""
+        game = FakeGame("a", fail=True)
+        self.worker.notify(game)
+        self.clock.now = 3.0
+        self.assertFalse(self.worker.flush())
+        self.assertEqual(self.worker.failures, 1)
+        self.assertEqual(self.due(), ([], 1.0))  # Not retried in a tight loop
+        self.clock.now = 4.0
+        self.assertEqual(self.due()[0], ["a"])
+
+    def test_background_thread_saves_and_stops(self):
+        """The worker thread saves a due game and stop() flushes the rest"""
+        worker = PersistenceWorker(flush_interval=0.01, max_lag=0.05)
+        first, second = FakeGame("first"), FakeGame("second")
+        worker.notify(first)
+        self.assertTrue(first.saved.wait(2.0))
+        worker.flush_interval = worker.max_lag = 60.0
+        worker.notify(second)
+        self.assertTrue(worker.stop())
+        self.assertEqual(second.saves, 1)
+        self.assertEqual(worker.saves, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from positionBatcher import PositionBatcher
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestPositionBatcher(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_one_batch_per_pass(self):
+        """Without a delay, the plies of one pass are released together by poll()"""
+        batcher = PositionBatcher(max_size=32, max_delay=0.0, clock=self.clock)
+        self.assertEqual(batcher.add("g", [(1, "a"), (2, "b"), (3, "c")]), [])
+        self.assertEqual(batcher.poll(), [("g", [(1, "a"), (2, "b"), (3, "c")])])
+        self.assertEqual(batcher.poll(), [])
+        self.assertIsNone(batcher.time_until_due())
+
+    def test_max_size_splits_bursts(self):
+        batcher = PositionBatcher(max_size=2, clock=self.clock)
+        ready = batcher.add("g", [(i, str(i)) for i in range(1, 6)])
+        self.assertEqual([[index for index, _ in plies] for _, plies in ready], [[1, 2], [3, 4]])
+        self.assertEqual(batcher.flush(), [("g", [(5, "5")])])
+        self.assertEqual(batcher.stats()['batches'], 3)
+
+    def test_max_delay_coalesces_passes(self):
+        """Plies from consecutive passes share a batch until the oldest has waited max_delay"""
+        batcher = PositionBatcher(max_size=32, max_delay=0.1, clock=self.clock)
+        batcher.add("g", [(1, "a")])
+        self.clock.now = 0.05
+        batcher.add("g", [(2, "b")])
+        self.assertEqual(batcher.poll(), [])
+        self.assertAlmostEqual(batcher.time_until_due(), 0.05)
+        self.clock.now = 0.1
+        self.assertEqual(batcher.poll(), [("g", [(1, "a"), (2, "b")])])
+        self.assertEqual(batcher.stats()['largest_batch'], 2)
+
+    def test_games_batched_separately(self):
+        batcher = PositionBatcher(clock=self.clock)
+        batcher.add("g1", [(1, "a")])
+        batcher.add("g2", [(1, "b")])
+        self.assertEqual(sorted(batcher.poll()), [("g1", [(1, "a")]), ("g2", [(1, "b")])])
+
+if __name__ == "__main__":
+    unittest.main()
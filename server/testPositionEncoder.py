@@ -0,0 +1,83 @@
+import json
+import unittest
+import uuid
+import chess
+from chessClass import ChessGame, decode_move
+from positionEncoder import (FLAG_BLACK, FLAG_ILLEGAL, FORMAT_COMPACT, FORMAT_FULL, KEYFRAME_INTERVAL,
+                             compact_position, encode_batch, encode_position, full_position)
+
+class TestPositionEncoder(unittest.TestCase):
+    def setUp(self):
+        self.game_id = str(uuid.uuid4())
+        self.game = ChessGame(self.game_id)
+        self.game.PRECOMPUTE_SUCCESSORS = False
+        board = chess.Board()
+        for san in ["e4", "e5", "Nf3", "Nc6", "Bb5"]:
+            board.push_san(san)
+            self.game.add_to_queue(board.fen())
+        self.game.process_queue()
+
+    def test_full_payload(self):
+        move = self.game.master_state[1]
+        payload = full_position(self.game_id, move, 1)
+        self.assertEqual(payload['fen'], move.fen)
+        self.assertEqual((payload['moveNumber'], payload['player'], payload['algebraic']), (1, "White", "e4"))
+        self.assertEqual((payload['from_square'], payload['to_square']), ("e2", "e4"))
+        self.assertIs(encode_position(self.game_id, move, 1, FORMAT_FULL)['fen'], move.fen)
+
+    def test_compact_delta_replays_the_game(self):
+        """A client applying the compact moves reaches the same positions"""
+        board = chess.Board()
+        for index in range(1, len(self.game.master_state)):
+            move = self.game.master_state[index]
+            payload = compact_position(self.game_id, move, index)
+            self.assertNotIn('fen', payload)
+            self.assertEqual(bool(payload['f'] & FLAG_BLACK), move.player == "Black")
+            board.push(decode_move(payload['m']))
+            self.assertEqual(board.fen(), move.fen)
+
+    def test_keyframes(self):
+        """The FEN is sent every KEYFRAME_INTERVAL plies, for plies without a move and on request"""
+        move = self.game.master_state[3]
+        self.assertIn('fen', compact_position(self.game_id, move, KEYFRAME_INTERVAL))
+        self.assertIn('fen', compact_position(self.game_id, move, 3, keyframe=True))
+        self.game.master_state[3].uci = None
+        self.game.master_state[3].is_legal = False
+        payload = compact_position(self.game_id, move, 3)
+        self.assertIsNone(payload['m'])
+        self.assertEqual(payload['fen'], move.fen)
+        self.assertTrue(payload['f'] & FLAG_ILLEGAL)
+
+    def test_compact_is_smaller(self):
+        """With the game's alias in place of its ID the compact payload is a fraction of the full one"""
+        move = self.game.master_state[2]
+        full = len(json.dumps(encode_position(self.game_id, move, 2, FORMAT_FULL)))
+        compact = len(json.dumps(encode_position(self.game_id, move, 2, FORMAT_COMPACT, alias=7)))
+        self.assertLess(compact * 7, full)
+
+    def test_batch(self):
+        """A batch lists the plies in order; the compact one names the game once"""
+        plies = [(i, self.game.master_state[i]) for i in range(1, 4)]
+        full = encode_batch(self.game_id, plies, FORMAT_FULL)
+        self.assertEqual((full['type'], full['gameId']), ('positions', self.game_id))
+        self.assertEqual([p['algebraic'] for p in full['positions']], ["e4", "e5", "Nf3"])
+        compact = encode_batch(self.game_id, plies, FORMAT_COMPACT, alias=7)
+        self.assertEqual(compact['g'], 7)
+        self.assertEqual([p['n'] for p in compact['p']], [1, 2, 3])
+        self.assertNotIn('g', compact['p'][0])
+
+    def test_seq(self):
+        """Room events carry the game's change counter; a batch also the seq it follows"""
+        move = self.game.master_state[1]
+        self.assertEqual(encode_position(self.game_id, move, 1, FORMAT_FULL, seq=9)['seq'], 9)
+        self.assertEqual(encode_position(self.game_id, move, 1, FORMAT_COMPACT, seq=9)['s'], 9)
+        self.assertNotIn('seq', encode_position(self.game_id, move, 1, FORMAT_FULL))
+        plies = [(i, self.game.master_state[i]) for i in range(1, 3)]
+        full = encode_batch(self.game_id, plies, FORMAT_FULL, seq=9, prev_seq=7)
+        self.assertEqual((full['seq'], full['prevSeq']), (9, 7))
+        compact = encode_batch(self.game_id, plies, FORMAT_COMPACT, seq=9, prev_seq=7)
+        self.assertEqual((compact['s'], compact['ps']), (9, 7))
+        self.assertNotIn('s', compact['p'][0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from positionLog import PositionLog
+
+def plies(first, last):
+    return [(i, f"move{i}") for i in range(first, last + 1)]
+
+class TestPositionLog(unittest.TestCase):
+    def test_missing_plies_from_buffer(self):
+        log = PositionLog(capacity=10)
+        self.assertEqual(log.record("g", plies(1, 3)), 3)
+        self.assertEqual(log.record("g", plies(4, 6)), 6)
+        self.assertEqual(log.since("g", 3, 6), plies(4, 6))
+        self.assertEqual(log.since("g", 6, 6), [])
+        self.assertEqual(log.stats()['resumes'], 2)
+
+    def test_gap_beyond_buffer_needs_snapshot(self):
+        """Plies that fell out of the ring buffer cannot be replayed"""
+        log = PositionLog(capacity=4)
+        log.record("g", plies(1, 10))
+        self.assertEqual(log.since("g", 6, 10), plies(7, 10))
+        self.assertIsNone(log.since("g", 5, 10))
+        self.assertIsNone(log.since("unknown", 1, 3))
+        self.assertIsNone(log.since("g", 12, 10))  # Client ahead of the game
+        self.assertEqual(log.stats()['snapshots'], 3)
+
+    def test_rewind(self):
+        """A ply at or before the last one replaces the plies after it"""
+        log = PositionLog()
+        log.record("g", plies(1, 5))
+        log.record("g", [(4, "edited")])
+        self.assertEqual(log.since("g", 2, 6), [(3, "move3"), (4, "edited")])
+
+    def test_edit_gets_a_new_seq(self):
+        """Rewriting the last ply keeps the ply count but is still a change to resume from"""
+        log = PositionLog()
+        self.assertEqual(log.record("g", plies(1, 5)), 5)
+        self.assertEqual(log.record("g", [(5, "edited")]), 6)
+        self.assertEqual(log.current_seq("g"), 6)
+        self.assertEqual(log.since("g", 5, 6), [(5, "edited")])
+        self.assertEqual(log.since("g", 3, 6), [(4, "move4"), (5, "edited")])
+
+    def test_least_recently_active_game_dropped(self):
+        log = PositionLog(max_games=2)
+        log.record("a", plies(1, 1))
+        log.record("b", plies(1, 1))
+        log.record("a", plies(2, 2))
+        log.record("c", plies(1, 1))
+        self.assertIsNone(log.since("b", 0, 1))
+        self.assertEqual(log.since("a", 0, 2), plies(1, 2))
+
+    def test_dropped_game_keeps_counting(self):
+        """A game whose buffer was dropped continues its seq, and older seqs need a snapshot"""
+        log = PositionLog(max_games=1)
+        log.record("a", plies(1, 3))
+        log.record("b", plies(1, 1))
+        self.assertEqual(log.record("a", plies(4, 4)), 4)
+        self.assertIsNone(log.since("a", 2, 4))
+        self.assertEqual(log.since("a", 3, 4), plies(4, 4))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+import chess
+from chessClass import ChessGame
+from chessFileReader import ChessFileReader
+from fenParser import as_position, parse_fen
+from positionStabilizer import PositionStabilizer
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+LIFTED = "rnbqkbnr/pppppppp/8/8/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+
+class TestPositionStabilizer(unittest.TestCase):
+    def feed(self, stabilizer, fen, now):
+        return [p.fen for p in stabilizer.feed(as_position(fen), now=now)]
+
+    def test_forwards_after_consecutive_frames(self):
+        """A position is forwarded once seen min_frames times in a row"""
+        stabilizer = PositionStabilizer(min_frames=3, window=0)
+        self.assertEqual(self.feed(stabilizer, E4, 0), [])
+        self.assertEqual(self.feed(stabilizer, E4, 0), [])
+        self.assertEqual(self.feed(stabilizer, E4, 0), [E4])
+        self.assertEqual(stabilizer.forwarded, 1)
+
+    def test_transient_is_suppressed(self):
+        """A position replaced before it becomes stable is never forwarded"""
+        stabilizer = PositionStabilizer(min_frames=2, window=0)
+        self.feed(stabilizer, START, 0)
+        self.feed(stabilizer, START, 0)
+        self.assertEqual(self.feed(stabilizer, LIFTED, 0), [])
+        self.assertEqual(self.feed(stabilizer, E4, 0), [])
+        self.assertEqual(self.feed(stabilizer, E4, 0), [E4])
+        self.assertEqual(stabilizer.suppressed_transients, 1)
+
+    def test_duplicates_are_coalesced(self):
+        """Repeats of the last forwarded position are dropped and counted"""
+        stabilizer = PositionStabilizer(min_frames=1)
+        self.assertEqual(self.feed(stabilizer, START, 0), [START])
+        self.assertEqual(self.feed(stabilizer, START, 0), [])
+        self.assertEqual(self.feed(stabilizer, START, 0), [])
+        self.assertEqual(stabilizer.suppressed_duplicates, 2)
+
+    def test_forwards_after_time_window(self):
+        """A single frame is released by poll() once it has been stable for the window"""
+        stabilizer = PositionStabilizer(min_frames=3, window=0.2)
+        self.assertEqual(self.feed(stabilizer, E4, 10.0), [])
+        self.assertAlmostEqual(stabilizer.time_until_ready(now=10.05), 0.15)
+        self.assertEqual(stabilizer.poll(now=10.1), [])
+        self.assertEqual([p.fen for p in stabilizer.poll(now=10.25)], [E4])
+        self.assertIsNone(stabilizer.time_until_ready())
+
+    def test_flicker_back_to_forwarded_position(self):
+        """Returning to the forwarded position cancels the pending one"""
+        stabilizer = PositionStabilizer(min_frames=2, window=0)
+        self.feed(stabilizer, START, 0)
+        self.feed(stabilizer, START, 0)
+        self.feed(stabilizer, LIFTED, 0)
+        self.assertEqual(self.feed(stabilizer, START, 0), [])
+        self.assertEqual(stabilizer.poll(now=100), [])
+        self.assertEqual(stabilizer.suppressed_transients, 1)
+
+    def test_serial_backlog_is_debounced(self):
+        """Frames that piled up in one read still need min_frames identical frames each"""
+        stabilizer = PositionStabilizer(min_frames=2, window=0.15)
+        batch = [as_position(fen) for fen in (START, START, LIFTED, E4, E4)]
+        self.assertEqual([p.fen for p in stabilizer.feed_batch(batch, now=0)], [START, E4])
+        self.assertEqual(stabilizer.suppressed_transients, 1)
+
+    def test_recorded_positions_replaced_within_a_read_are_forwarded(self):
+        """In a read of recorded positions only the last one waits to become stable"""
+        stabilizer = PositionStabilizer(min_frames=2, window=0.15)
+        batch = [as_position(START), as_position(START), as_position(E4)]
+        self.assertEqual([p.fen for p in stabilizer.feed_batch(batch, now=0, buffered=True)], [START])
+        self.assertEqual(stabilizer.suppressed_duplicates, 1)
+        self.assertEqual(stabilizer.poll(now=0.1), [])
+        self.assertEqual([p.fen for p in stabilizer.poll(now=0.2)], [E4])
+        self.assertEqual(stabilizer.suppressed_transients, 0)
+
+class TestStabilizedFileReplay(unittest.TestCase):
+    """A replayed moves file is read in one batch; debouncing must not eat its moves"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "moves.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_every_ply_reaches_the_game(self):
+        sans = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]
+        board = chess.Board()
+        placements = [board.board_fen()]
+        for san in sans:
+            board.push_san(san)
+            placements.append(board.board_fen())
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(placements) + "\n")
+
+        reader = ChessFileReader(self.path, use_inotify=False)
+        reader.open()
+        try:
+            lines = reader.read_available()
+        finally:
+            reader.close()
+        self.assertEqual(len(lines), len(placements))
+
+        stabilizer = PositionStabilizer(min_frames=2, window=0.15)
+        game = ChessGame("replay")
+        game.PRECOMPUTE_SUCCESSORS = False
+        positions = [parse_fen(line.decode('utf-8').strip())[0] for line in lines]
+        for position in stabilizer.feed_batch(positions, now=0, buffered=True):
+            game.add_to_queue(position)
+        for position in stabilizer.poll(now=1):  # The last move, once stable
+            game.add_to_queue(position)
+        game.process_queue()
+
+        self.assertEqual([move.algebraic for move in game.master_state[1:]], sans)
+        self.assertTrue(all(move.is_legal for move in game.master_state[1:]))
+        self.assertEqual(stabilizer.suppressed_transients, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sqlalchemy import MetaData, create_engine, text
+import chessClass
+import schemaMigrations
+from schemaMigrations import LATEST_VERSION, get_version, migrate
+
+# chess_games.db as created before the schema was versioned
+LEGACY_SCHEMA = [
+    """CREATE TABLE chess_games (
+        id INTEGER NOT NULL PRIMARY KEY, game_id VARCHAR(36) NOT NULL UNIQUE, event VARCHAR(100),
+        site VARCHAR(100), date VARCHAR(20), round VARCHAR(10), white VARCHAR(100),
+        black VARCHAR(100), result VARCHAR(10), created_at DATETIME NOT NULL)""",
+    """CREATE TABLE chess_moves (
+        id INTEGER NOT NULL PRIMARY KEY, move_id VARCHAR(36) NOT NULL UNIQUE,
+        game_id VARCHAR(36) NOT NULL REFERENCES chess_games (game_id), fen VARCHAR(100) NOT NULL,
+        player VARCHAR(10), timestamp DATETIME NOT NULL, algebraic VARCHAR(10), uci VARCHAR(10),
+        is_legal BOOLEAN, move_index INTEGER NOT NULL)""",
+    "INSERT INTO chess_games (game_id, result, created_at) VALUES ('legacy', '*', '2025-01-01 00:00:00')",
+    """INSERT INTO chess_moves (move_id, game_id, fen, timestamp, move_index)
+       VALUES ('m0', 'legacy', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', '2025-01-01 00:00:00', 0)""",
+]
+
+class TestSchemaMigrations(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'games.db')}")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def indexes(self):
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+            return {row[0] for row in rows}
+
+    def query_plan(self, sql):
+        with self.engine.connect() as connection:
+            return " ".join(row[-1] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+    def test_legacy_database_is_upgraded_in_place(self):
+        """Indexes are added to an existing database and its rows are kept"""
+        with self.engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.execute(text(statement))
+
+        self.assertEqual(migrate(self.engine, chessClass.Base.metadata), LATEST_VERSION)
+        self.assertLessEqual({"ix_chess_moves_game_id_move_index", "ix_chess_games_created_at"}, self.indexes())
+        with self.engine.connect() as connection:
+            self.assertEqual(get_version(connection), LATEST_VERSION)
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM chess_moves")).scalar(), 1)
+            summary = connection.execute(text("SELECT last_fen, ply_count, status FROM game_summary")).all()
+        self.assertEqual(summary, [('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 0, 'in_progress')])
+
+        plan = self.query_plan("SELECT * FROM chess_moves WHERE game_id = 'legacy' ORDER BY move_index")
+        self.assertIn("ix_chess_moves_game_id_move_index", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        plan = self.query_plan("SELECT * FROM chess_games ORDER BY created_at DESC")
+        self.assertIn("ix_chess_games_created_at", plan)
+
+    def test_migrations_do_not_need_current_models(self):
+        """The migrations create the tables they use, whatever the models look like now"""
+        with self.engine.begin() as connection:
+            for statement in LEGACY_SCHEMA:
+                connection.execute(text(statement))
+
+        self.assertEqual(migrate(self.engine, MetaData()), LATEST_VERSION)
+        with self.engine.connect() as connection:
+            summary = connection.execute(text("SELECT game_id, ply_count, status FROM game_summary")).all()
+        self.assertEqual(summary, [('legacy', 0, 'in_progress')])
+
+    def test_failed_migration_is_rolled_back(self):
+        """DDL of a migration that fails is undone and the version is not bumped"""
+        def create_then_fail(connection):
+            connection.execute(text("CREATE TABLE half_done (x INTEGER)"))
+            raise RuntimeError("migration failed")
+
+        failing = schemaMigrations.MIGRATIONS + [(LATEST_VERSION + 1, "Fails after DDL", create_then_fail)]
+        with patch.object(schemaMigrations, 'MIGRATIONS', failing), \
+                patch.object(schemaMigrations, 'LATEST_VERSION', LATEST_VERSION + 1):
+            with self.assertRaises(RuntimeError):
+                migrate(self.engine, chessClass.Base.metadata)
+        with self.engine.connect() as connection:
+            self.assertEqual(get_version(connection), LATEST_VERSION)
+            tables = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+        self.assertNotIn("half_done", tables)
+
+    def test_new_database_and_rerun(self):
+        """A new database gets the current schema; running again changes nothing"""
+        self.assertEqual(migrate(self.engine, chessClass.Base.metadata), LATEST_VERSION)
+        before = self.indexes()
+        self.assertEqual(migrate(self.engine, chessClass.Base.metadata), LATEST_VERSION)
+        self.assertEqual(self.indexes(), before)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import select
+import unittest
+from serialIngest import ChessSerial, read_available, split_complete_lines
+
+class TestSplitCompleteLines(unittest.TestCase):
+    def test_keeps_partial_line(self):
+        """The unterminated tail is returned separately"""
+        lines, partial = split_complete_lines(b"", b"abc\r\ndef\ngh")
+        self.assertEqual(lines, [b"abc", b"def"])
+        self.assertEqual(partial, b"gh")
+
+    def test_joins_partial_line(self):
+        """A previous partial line is prepended to new data"""
+        lines, partial = split_complete_lines(b"gh", b"ij\n")
+        self.assertEqual(lines, [b"ghij"])
+        self.assertEqual(partial, b"")
+
+@unittest.skipUnless(hasattr(os, "openpty"), "requires a pseudo-terminal")
+class TestChessSerialReadAvailable(unittest.TestCase):
+    def setUp(self):
+        self.master_fd, self.slave_fd = os.openpty()
+        self.port = ChessSerial(os.ttyname(self.slave_fd), timeout=1)
+
+    def tearDown(self):
+        self.port.close()
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+    def wait_for_bytes(self):
+        select.select([self.port.fileno()], [], [], 1.0)
+
+    def test_reads_all_lines_in_one_call(self):
+        """Every buffered line is returned by a single read_available()"""
+        os.write(self.master_fd, b"line1\nline2\nline3\n")
+        self.wait_for_bytes()
+        self.assertEqual(read_available(self.port), [b"line1", b"line2", b"line3"])
+        self.assertEqual(read_available(self.port), [])
+
+    def test_partial_line_kept_for_next_call(self):
+        """A line split across writes is returned once it is complete"""
+        os.write(self.master_fd, b"line1\nli")
+        self.wait_for_bytes()
+        self.assertEqual(read_available(self.port), [b"line1"])
+        os.write(self.master_fd, b"ne2\n")
+        self.wait_for_bytes()
+        self.assertEqual(read_available(self.port), [b"line2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from sqlalchemy import text
+from storageProfile import DEFAULT_PROFILE, WalCheckpointer, create_storage_engine
+
+class TestStorageProfile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "games.db")
+        self.engine = create_storage_engine(f"sqlite:///{self.db_path}")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def pragma(self, engine, name):
+        with engine.connect() as connection:
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+    def test_pragmas_applied_on_connect(self):
+        """Every pooled connection gets the profile"""
+        self.assertEqual(self.pragma(self.engine, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(self.engine, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(self.engine, "cache_size"), DEFAULT_PROFILE['cache_size'])
+        self.assertEqual(self.pragma(self.engine, "busy_timeout"), DEFAULT_PROFILE['busy_timeout'])
+
+    def test_reader_not_blocked_by_open_write(self):
+        """With WAL a reader sees the last commit while a write transaction is open"""
+        with self.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+        writer = self.engine.connect()
+        try:
+            writer.execute(text("INSERT INTO t VALUES (2)"))  # Uncommitted
+            with self.engine.connect() as reader:
+                self.assertEqual(reader.execute(text("SELECT COUNT(*) FROM t")).scalar(), 1)
+            writer.commit()
+        finally:
+            writer.close()
+
+    def test_checkpoint_truncates_wal(self):
+        """stop() checkpoints and empties the WAL file"""
+        with self.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+        self.assertGreater(os.path.getsize(self.db_path + "-wal"), 0)
+        checkpointer = WalCheckpointer(self.engine, interval=0.01)
+        checkpointer.start()
+        result = checkpointer.stop()
+        self.assertEqual(result[0], 0)  # Not busy
+        self.assertGreaterEqual(checkpointer.checkpoints, 1)
+        self.assertEqual(os.path.getsize(self.db_path + "-wal"), 0)
+
+    def test_stop_without_start_leaves_database_alone(self):
+        """A checkpointer that never ran does not connect to the database on stop()"""
+        checkpointer = WalCheckpointer(self.engine)
+        self.assertIsNone(checkpointer.stop())
+        self.assertEqual(checkpointer.checkpoints, 0)
+        self.assertFalse(os.path.exists(self.db_path))  # Never opened
+
+    def test_memory_database_shared_between_threads(self):
+        """An in-memory database keeps one connection usable from any thread"""
+        engine = create_storage_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+
+        def insert():
+            with engine.begin() as connection:
+                connection.execute(text("INSERT INTO t VALUES (1)"))
+
+        thread = threading.Thread(target=insert)
+        thread.start()
+        thread.join()
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM t")).scalar(), 1)
+        engine.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
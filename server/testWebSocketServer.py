@@ -9,7 +9,10 @@ properly integrate with the existing ChessGame and serial communication logic.
 import unittest
 import json
 from unittest.mock import MagicMock, patch
-from app import app, socketio
+from app import app, socketio, game_cache, emit_positions
+from positionEncoder import FORMAT_COMPACT, FORMAT_FULL, encode_batch, encode_position
+from positionLog import PositionLog
+from broadcaster import Broadcaster
 from flask_socketio import SocketIOTestClient
 from chessClass import ChessGame
 import time
@@ -24,7 +27,7 @@ class ChessLinkWebSocketTests(unittest.TestCase):
         self.client = SocketIOTestClient(self.app, socketio)
         
         # Create a patch for the serial connection
-        self.serial_patcher = patch('app.serial.Serial')
+        self.serial_patcher = patch('app.ChessSerial')
         self.mock_serial = self.serial_patcher.start()
         
         # Create a mock serial instance
@@ -56,12 +59,23 @@ class ChessLinkWebSocketTests(unittest.TestCase):
         self.mock_game_instance.master_state[0].fen = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
         self.mock_chess_game.return_value = self.mock_game_instance
         self.mock_chess_game.load_from_db.return_value = None  # Default to no existing game
+        # Start without a game left active or cached by earlier tests
+        self.active_game_patcher = patch('app.active_game', None)
+        self.active_game_patcher.start()
+        game_cache.clear()
+        game_cache.loader = self.mock_chess_game.load_from_db
+        # Broadcasts are queued until the test flushes them
+        self.broadcaster = Broadcaster(socketio.emit, autostart=False)
+        self.broadcaster_patcher = patch('app.broadcaster', self.broadcaster)
+        self.broadcaster_patcher.start()
     
     def tearDown(self):
         """Clean up after each test."""
         self.serial_patcher.stop()
         self.thread_patcher.stop()
         self.chess_game_patcher.stop()
+        self.active_game_patcher.stop()
+        self.broadcaster_patcher.stop()
 
     def test_client_connect(self):
         """Test client connection event."""
@@ -159,17 +173,14 @@ class ChessLinkWebSocketTests(unittest.TestCase):
         
         # Then end the game
         self.client.emit('end_game', {'gameId': 'test-game-123'})
+        self.broadcaster.flush()
         response = self.client.get_received()
-        
-        # Find game_ended event
-        game_ended = None
-        for event in response:
-            if event['name'] == 'game_ended':
-                game_ended = event
-                break
-                
-        self.assertIsNotNone(game_ended)
-        self.assertTrue('message' in game_ended['args'][0])
+
+        # Find game_ended events: the reply to the sender and the broadcast to the game's room
+        game_ended = [event['args'][0] for event in response if event['name'] == 'game_ended']
+
+        self.assertTrue(any('message' in args for args in game_ended))
+        self.assertIn({'type': 'game_ended', 'gameId': 'test-game-123'}, game_ended)
         
         # Verify game was saved
         self.mock_game_instance.save_to_db.assert_called()
@@ -238,5 +249,152 @@ class ChessLinkWebSocketTests(unittest.TestCase):
         self.assertTrue('message' in error_event['args'][0])
         self.assertTrue('Port is required' in error_event['args'][0]['message'])
 
+    def test_join_and_leave_game(self):
+        """join_game and leave_game are acknowledged with the game's viewer count"""
+        self.client.get_received()
+        self.client.emit('join_game', {'gameId': 'joined-game'})
+        joined = [e for e in self.client.get_received() if e['name'] == 'joined_game']
+        self.assertEqual(joined[0]['args'][0]['gameId'], 'joined-game')
+        self.assertEqual(joined[0]['args'][0]['viewerCount'], 1)
+
+        self.client.emit('leave_game', {'gameId': 'joined-game'})
+        left = [e for e in self.client.get_received() if e['name'] == 'left_game']
+        self.assertEqual(left[0]['args'][0], {'gameId': 'joined-game'})
+
+    def test_position_sent_to_game_room_only(self):
+        """Only clients that joined the game get its positions; the lobby gets a game_update"""
+        viewer = SocketIOTestClient(self.app, socketio)
+        viewer.emit('join_game', {'gameId': 'test-game-123'})
+        viewer.get_received()
+        self.client.get_received()
+
+        game = self.mock_game_instance
+        move = MagicMock(fen='rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1',
+                         player='White', algebraic='e4', uci='e2e4', is_legal=True, piece_moved='P')
+        game.process_queue.side_effect = lambda: game.master_state.append(move)
+        self.mock_chess_game.load_from_db.return_value = game
+        with patch('app.current_game_id', 'test-game-123'), patch.dict('app.lobby_updates', clear=True):
+            self.client.emit('simulate_hardware_input', {'gameId': 'test-game-123', 'fen': move.fen})
+        self.broadcaster.flush()
+
+        viewer_events = [e['name'] for e in viewer.get_received()]
+        lobby_events = [e['name'] for e in self.client.get_received()]
+        self.assertIn('position', viewer_events)
+        self.assertNotIn('position', lobby_events)
+        self.assertIn('game_update', lobby_events)
+        viewer.disconnect()
+
+    def test_lobby_gets_latest_state_of_a_burst(self):
+        """A game_update held back by the rate limit is sent when the interval ends"""
+        game = self.mock_game_instance
+        fens = ['rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1',
+                'rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2']
+        moves = [MagicMock(fen=fen, player='White', algebraic='e4', uci='e2e4', is_legal=True, piece_moved='P')
+                 for fen in fens]
+        game.process_queue.side_effect = lambda: game.master_state.append(moves.pop(0))
+        self.mock_chess_game.load_from_db.return_value = game
+        with patch('app.current_game_id', 'test-game-123'), patch('app.LOBBY_UPDATE_INTERVAL', 0.05), \
+                patch.dict('app.lobby_updates', clear=True):
+            for fen in fens:
+                self.client.emit('simulate_hardware_input', {'gameId': 'test-game-123', 'fen': fen})
+            self.broadcaster.flush()
+            updates = [e['args'][0]['game'] for e in self.client.get_received() if e['name'] == 'game_update']
+            self.assertEqual([u['moveCount'] for u in updates], [1])
+            time.sleep(0.1)
+            self.broadcaster.flush()
+        updates = [e['args'][0]['game'] for e in self.client.get_received() if e['name'] == 'game_update']
+        self.assertEqual([u['moveCount'] for u in updates], [2])
+        self.assertEqual(updates[0]['currentPosition'], fens[1])
+
+    def test_compact_format_negotiated_on_connect(self):
+        """A client connecting with format=compact gets compact positions naming the game by its alias"""
+        viewer = SocketIOTestClient(self.app, socketio, auth={'format': 'compact'})
+        formats = [e['args'][0] for e in viewer.get_received() if e['name'] == 'position_format']
+        self.assertEqual(formats, [{'format': 'compact'}])
+        viewer.emit('join_game', {'gameId': 'test-game-123'})
+        alias = [e for e in viewer.get_received() if e['name'] == 'joined_game'][0]['args'][0]['alias']
+
+        game = self.mock_game_instance
+        move = MagicMock(fen='rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1',
+                         player='White', algebraic='e4', uci='e2e4', is_legal=True, piece_moved='P')
+        game.process_queue.side_effect = lambda: game.master_state.append(move)
+        self.mock_chess_game.load_from_db.return_value = game
+        with patch('app.current_game_id', 'test-game-123'), patch('app.position_log', PositionLog()):
+            self.client.emit('simulate_hardware_input', {'gameId': 'test-game-123', 'fen': move.fen})
+        self.broadcaster.flush()
+
+        positions = [e['args'][0] for e in viewer.get_received() if e['name'] == 'position']
+        self.assertEqual(positions, [{'g': alias, 'n': 1, 'm': 12 | 28 << 6, 'f': 0, 's': 1}])
+        viewer.disconnect()
+
+    def test_positions_encoded_only_for_followed_formats(self):
+        """A position format nobody in the game's room uses is not encoded"""
+        move = MagicMock(fen='rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1',
+                         player='White', algebraic='e4', uci='e2e4', is_legal=True, piece_moved='P')
+        viewer = SocketIOTestClient(self.app, socketio, auth={'format': 'compact'})
+        with patch('app.position_log', PositionLog()), \
+                patch('app.encode_position', wraps=encode_position) as position, \
+                patch('app.encode_batch', wraps=encode_batch) as batch:
+            emit_positions('formats-game', [(1, move)])
+            self.assertEqual(position.call_count, 0)
+
+            self.client.emit('join_game', {'gameId': 'formats-game'})
+            emit_positions('formats-game', [(1, move)])
+            self.assertEqual([c.args[3] for c in position.call_args_list], [FORMAT_FULL])
+
+            viewer.emit('join_game', {'gameId': 'formats-game'})
+            emit_positions('formats-game', [(1, move), (2, move)])
+            self.assertEqual([c.args[2] for c in batch.call_args_list], [FORMAT_FULL, FORMAT_COMPACT])
+        self.broadcaster.flush()
+        viewer.disconnect()
+
+    def test_resume(self):
+        """resume sends only the changes missed since lastSeq from the log, or a snapshot of the whole game"""
+        game = self.mock_game_instance
+        fens = ['rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1',
+                'rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2']
+        moves = [MagicMock(fen=fens[0], player='White', algebraic='e4', uci='e2e4', is_legal=True, piece_moved='P'),
+                 MagicMock(fen=fens[1], player='Black', algebraic='e5', uci='e7e5', is_legal=True, piece_moved='p')]
+        pending = list(moves)
+        game.process_queue.side_effect = lambda: game.master_state.append(pending.pop(0))
+        self.mock_chess_game.load_from_db.return_value = game
+        log = PositionLog()
+        with patch('app.current_game_id', 'test-game-123'), patch('app.position_log', log):
+            self.client.emit('join_game', {'gameId': 'test-game-123'})
+            for fen in fens:
+                self.client.emit('simulate_hardware_input', {'gameId': 'test-game-123', 'fen': fen})
+            self.broadcaster.flush()
+            positions = [e['args'][0] for e in self.client.get_received() if e['name'] == 'position']
+            self.assertEqual([(p['moveNumber'], p['seq']) for p in positions], [(1, 1), (2, 2)])
+
+            # Missed the second ply only
+            self.client.emit('resume', {'gameId': 'test-game-123', 'lastSeq': 1, 'epoch': log.epoch})
+            events = self.client.get_received()
+            batch = [e['args'][0] for e in events if e['name'] == 'positions'][0]
+            self.assertEqual([p['moveNumber'] for p in batch['positions']], [2])
+            self.assertEqual((batch['seq'], batch['prevSeq']), (2, 1))
+            resumed = [e['args'][0] for e in events if e['name'] == 'resumed'][0]
+            self.assertEqual(resumed, {'gameId': 'test-game-123', 'seq': 2, 'epoch': log.epoch, 'snapshot': False})
+
+            # An edit rewrites the last ply without adding one; it is still a change to catch up on
+            edited = MagicMock(fen=fens[1], player='Black', algebraic='e6', uci='e7e6', is_legal=True, piece_moved='p')
+            game.master_state[2] = edited
+            emit_positions('test-game-123', [(2, edited)])
+            self.broadcaster.flush()
+            self.client.get_received()
+            self.client.emit('resume', {'gameId': 'test-game-123', 'lastSeq': 2, 'epoch': log.epoch})
+            events = self.client.get_received()
+            batch = [e['args'][0] for e in events if e['name'] == 'positions'][0]
+            self.assertEqual([(p['moveNumber'], p['algebraic']) for p in batch['positions']], [(2, 'e6')])
+            self.assertEqual([e['args'][0]['seq'] for e in events if e['name'] == 'resumed'], [3])
+
+            # A new viewer, or one resuming from before a restart, gets the whole game
+            for resume in ({'lastSeq': 0}, {'lastSeq': 2, 'epoch': 'previous'}):
+                self.client.emit('resume', dict(resume, gameId='test-game-123'))
+                events = self.client.get_received()
+                snapshot = [e['args'][0] for e in events if e['name'] == 'snapshot'][0]
+                self.assertEqual([p['algebraic'] for p in snapshot['positions']], ['e4', 'e6'])
+                self.assertEqual((snapshot['seq'], snapshot['fen']), (3, fens[1]))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
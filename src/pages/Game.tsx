@@ -142,6 +142,8 @@ interface MoveData {
   piece_moved: string | null;
   from_square: string | null;
   to_square: string | null;
+  moveNumber?: number;
+  seq?: number;
 }
 
 // Interface for game state data from backend
@@ -393,6 +395,12 @@ const GamePage: React.FC = () => {
   const boardContainerRef = useRef<HTMLDivElement>(null); // Keep ref definition
   // Ref to store the piece count of the previous position
   const previousPieceCountRef = useRef<number | null>(null);
+  // seq (the game's change counter) of the last position received, so a reconnect only fetches what was missed
+  const lastSeqRef = useRef(0);
+  // The server's epoch that lastSeq belongs to; seqs start again when the server restarts
+  const epochRef = useRef<string | null>(null);
+  // Set while a resume is in flight, so a gap in the seqs asks for the missed changes once
+  const resumePendingRef = useRef(false);
 
   // Function to fetch raw board state
   const fetchRawBoardState = () => {
@@ -425,13 +433,38 @@ const GamePage: React.FC = () => {
     toast.info(`Connecting to game ${gameId}...`);
     setStatusText("Connecting...");
 
+    // Follow this game's positions, catching up on the changes after the last one received
+    const resume = () => {
+      resumePendingRef.current = true;
+      socket.emit('resume', { gameId, lastSeq: lastSeqRef.current, epoch: epochRef.current });
+    };
+
+    // Whether changes prevSeq+1..seq are new and follow on from the last one received
+    const acceptChanges = (prevSeq: number, seq: number) => {
+      if (seq <= lastSeqRef.current) return false; // Already received before a resume
+      if (lastSeqRef.current > 0 && prevSeq > lastSeqRef.current) {
+        // Changes were missed (e.g. dropped by a backed-up server): the resume sends them and these
+        if (!resumePendingRef.current) {
+          console.warn(`Missed changes ${lastSeqRef.current + 1}-${prevSeq}, resuming`);
+          resume();
+        }
+        return false;
+      }
+      lastSeqRef.current = seq;
+      return true;
+    };
+
     socket.on('connect', () => {
       console.log('Connected to WebSocket server.');
       setIsConnected(true);
       setStatusText("Fetching game state...");
       toast.success("Connected! Requesting game state...");
+      // This page doesn't need the lobby updates
+      socket.emit('leave_lobby');
       // Request the specific game state
       socket.emit('get_game_state', { gameId });
+      // Catch up on the changes missed while disconnected
+      resume();
       // Initial fetch of raw board state
       fetchRawBoardState();
       // Reset piece count on new connection/state fetch
@@ -478,17 +511,17 @@ const GamePage: React.FC = () => {
         // Assuming backend might send full history with game_state
         if (data.moves && data.moves.length > 0) {
           setMoveHistory(data.moves);
-        } else {
-           setMoveHistory([]); // Reset history if none provided
-        }
+        } // Otherwise the history comes from the resume snapshot or catch-up
         toast.success("Game state loaded!");
       } else {
          console.warn('Received game_state for wrong gameId', data.gameId);
       }
     });
 
-    socket.on('position', (data: MoveData & { gameId: string }) => {
+    const handlePosition = (data: MoveData & { gameId: string }) => {
       if (data.gameId === gameId) {
+        // Plies of a batch carry no seq; the batch was checked as a whole
+        if (data.seq !== undefined && !acceptChanges(data.seq - 1, data.seq)) return;
         console.log('Received position update:', data);
         // let wasCapture = false; // Declared inside the commented block now
         // let distance: number | null = null;
@@ -517,7 +550,8 @@ const GamePage: React.FC = () => {
             // --- End Distance Calculation ---
 
             setGame(updatedGame);
-            setMoveHistory(prev => [...prev, data]);
+            // An edited ply replaces the one with its moveNumber and the plies after it
+            setMoveHistory(prev => data.moveNumber ? [...prev.slice(0, data.moveNumber - 1), data] : [...prev, data]);
             setStatusText(getGameStatus(updatedGame));
             
             // --- Sound Logic --- 
@@ -541,6 +575,36 @@ const GamePage: React.FC = () => {
             toast.error("Received invalid board position update.");
         }
       } else { /* ignore */ }
+    };
+
+    socket.on('position', handlePosition);
+    // Sent by resume when the missed plies are no longer buffered: the whole game
+    socket.on('snapshot', (data: { gameId: string, seq: number, fen: string, positions: MoveData[] }) => {
+      if (data.gameId === gameId) {
+        lastSeqRef.current = data.seq;
+        setMoveHistory(data.positions);
+        try {
+          const loadedGame = new Chess(data.fen);
+          setGame(loadedGame);
+          setStatusText(getGameStatus(loadedGame));
+        } catch (e) {
+          console.error("Error loading FEN from snapshot:", data.fen, e);
+        }
+      }
+    });
+    // Ends a resume, after its catch-up 'positions' or 'snapshot'
+    socket.on('resumed', (data: { gameId: string, seq: number, epoch: string }) => {
+      if (data.gameId === gameId) {
+        epochRef.current = data.epoch;
+        resumePendingRef.current = false;
+      }
+    });
+    // Several plies from one ingest pass arrive as one batch
+    socket.on('positions', (data: { gameId: string, seq?: number, prevSeq?: number,
+                                    positions: (MoveData & { gameId: string })[] }) => {
+      if (data.gameId !== gameId) return;
+      if (data.seq !== undefined && !acceptChanges(data.prevSeq ?? data.seq - 1, data.seq)) return;
+      data.positions.forEach(handlePosition);
     });
     
     socket.on('game_ended', (data: { gameId: string }) => {
@@ -128,11 +128,6 @@ const LiveGamesPage: React.FC = () => {
         addLogEntry(`Game ended: ${data.gameId}`);
       });
       
-      socket.on('position', (data) => {
-        updateGamePosition(data.gameId, data.fen);
-        addLogEntry(`New position for game ${data.gameId}`);
-      });
-      
       socket.on('connect_error', (err) => {
         setIsConnected(false);
         socketRef.current = null;
@@ -163,6 +158,11 @@ const LiveGamesPage: React.FC = () => {
     setLiveGames(prev => prev.map(game => 
       game.id === updatedGame.id ? updatedGame : game
     ));
+    
+    // The lobby gets no position events, so the hosted board follows the game updates
+    if (updatedGame.id === currentGameId) {
+      setHostGame(prev => ({ ...prev, fen: updatedGame.currentPosition }));
+    }
   };
   
   // Add a new game to the list
@@ -184,22 +184,6 @@ const LiveGamesPage: React.FC = () => {
     }
   };
   
-  // Update a game's position
-  const updateGamePosition = (gameId: string, fen: string) => {
-    setLiveGames(prev => prev.map(game => 
-      game.id === gameId ? { 
-        ...game, 
-        currentPosition: fen,
-        moveCount: game.moveCount + 1,
-        lastUpdate: new Date()
-      } : game
-    ));
-    
-    if (gameId === currentGameId) {
-      setHostGame(prev => ({ ...prev, fen }));
-    }
-  };
-
   // Start hosting a new game
   const startHostingGame = () => {
     if (!isConnected) {